@@ -0,0 +1,93 @@
+"""Generador de inventarios sintéticos para los benchmarks.
+
+Crea productos con descripciones buscables y reparte los movimientos entre
+ellos con una popularidad sesgada (pocos productos concentran muchos
+movimientos, como en un inventario real). Al final aplica las migraciones y
+recalcula los totales, así la base queda igual que una creada por la
+aplicación.
+
+Uso: python -m benchmarks.datos bench.db --productos 10000 --movimientos 1000000
+"""
+import argparse
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from database.connection import DatabaseConnection
+from database.migraciones import aplicar_migraciones
+from database.movimientos import reconstruir_totales
+
+CATEGORIAS = ("Tornillo", "Tuerca", "Arandela", "Cable", "Tubo", "Codo", "Llave", "Bombillo",
+              "Cinta", "Pintura", "Brocha", "Lija", "Martillo", "Taladro", "Broca", "Manguera")
+MATERIALES = ("acero", "bronce", "PVC", "cobre", "aluminio", "galvanizado", "plástico", "inoxidable")
+MEDIDAS = ("1/4", "3/8", "1/2", "3/4", "1", "2", "10 mm", "20 mm", "5 m", "10 m")
+DESDE = datetime(2023, 1, 1)
+
+
+def codigo_producto(i):
+    return f"P{i:06d}"
+
+
+def generar(db_file, productos, movimientos, dias=730, semilla=1, desde=DESDE):
+    """Llena db_file (vacía) con productos y movimientos; devuelve los segundos empleados"""
+    comienzo = time.perf_counter()
+    DatabaseConnection(db_file).create_tables(migrar=False)
+    aleatorio = random.Random(semilla)
+    segundos = dias * 24 * 3600
+
+    descripciones = [f"{aleatorio.choice(CATEGORIAS)} {aleatorio.choice(MATERIALES)} "
+                     f"{aleatorio.choice(MEDIDAS)} ref {i}" for i in range(productos)]
+
+    def filas_productos():
+        for i, descripcion in enumerate(descripciones):
+            compra = round(aleatorio.uniform(500, 50000), -1)
+            yield codigo_producto(i), descripcion, compra, round(compra * aleatorio.uniform(1.1, 1.6), -1)
+
+    def filas_movimientos(n):
+        for _ in range(n):
+            # random() ** 3 concentra los movimientos en los primeros códigos
+            i = int(productos * aleatorio.random() ** 3)
+            fecha = desde + timedelta(seconds=aleatorio.randrange(segundos))
+            yield codigo_producto(i), descripciones[i], aleatorio.randint(1, 20), fecha.strftime("%Y-%m-%d %H:%M:%S")
+
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA synchronous = OFF")  # Base desechable: no hace falta durabilidad
+    with conn:
+        conn.executemany(
+            "INSERT INTO productos (codigo, descripcion, precio_compra, precio_venta) VALUES (?, ?, ?, ?)",
+            filas_productos(),
+        )
+        # Más entradas que salidas para que el stock no quede tan negativo
+        entradas = movimientos * 55 // 100
+        conn.executemany(
+            "INSERT INTO entradas (codigo, descripcion, cantidad, fecha) VALUES (?, ?, ?, ?)",
+            filas_movimientos(entradas),
+        )
+        conn.executemany(
+            "INSERT INTO salidas (codigo, descripcion, cantidad, fecha) VALUES (?, ?, ?, ?)",
+            filas_movimientos(movimientos - entradas),
+        )
+
+    # Índices, FTS y resúmenes se construyen una sola vez sobre los datos ya cargados
+    aplicar_migraciones(conn)
+    with conn:
+        reconstruir_totales(conn.cursor(), incluir_resumenes=False)
+    conn.close()
+    return time.perf_counter() - comienzo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="archivo de base a crear")
+    parser.add_argument("--productos", type=int, default=10000)
+    parser.add_argument("--movimientos", type=int, default=1000000)
+    parser.add_argument("--dias", type=int, default=730, help="días cubiertos desde 2023-01-01")
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+    segundos = generar(args.db, args.productos, args.movimientos, args.dias, args.semilla)
+    print(f"{args.productos} productos y {args.movimientos} movimientos en {segundos:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
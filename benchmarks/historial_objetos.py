@@ -0,0 +1,98 @@
+"""Objetos vivos de HistorialView al cambiar muchas veces de producto.
+
+Abre la vista sin ventana (plataforma offscreen), muestra la gráfica de
+--cambios productos al azar y cada --intervalo cambios cuenta los QObject
+hijos de la vista, los widgets de toda la aplicación, los objetos de Python
+y la memoria asignada. La página de gráficas se crea con el primer
+producto; después ninguna de las cuentas debería crecer. Termina con
+código 1 si crecen los QObject o los widgets.
+
+Uso: python -m benchmarks.historial_objetos --cambios 500
+"""
+import argparse
+import gc
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication, QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.datos import codigo_producto, generar
+from database.connection import DatabaseConnection
+
+
+def contar(vista):
+    # Los objetos liberados con deleteLater se destruyen antes de contar
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    QCoreApplication.processEvents()
+    gc.collect()
+    return {
+        "qobjects": len(vista.findChildren(QObject)),
+        "widgets": len(QApplication.allWidgets()),  # Incluye los widgets desprendidos de la vista
+        "objetos_python": len(gc.get_objects()),
+        "memoria_kb": tracemalloc.get_traced_memory()[0] // 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cambios", type=int, default=500)
+    parser.add_argument("--intervalo", type=int, default=50)
+    parser.add_argument("--productos", type=int, default=200)
+    parser.add_argument("--movimientos", type=int, default=20000)
+    parser.add_argument("--db", help="base a reutilizar; si no existe se genera ahí")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    from ui.views.historial_view import HistorialView
+    from database import analisis_producto
+
+    with tempfile.TemporaryDirectory() as directorio:
+        db_file = args.db or os.path.join(directorio, "bench.db")
+        if not os.path.exists(db_file):
+            generar(db_file, args.productos, args.movimientos)
+        with sqlite3.connect(db_file) as conn:
+            productos = conn.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+
+        vista = HistorialView()
+        vista.db = DatabaseConnection(db_file)
+        vista.db.create_tables()  # Una base reutilizada puede venir de un esquema anterior
+        vista.search_input.blockSignals(True)  # Solo se mide la página de gráficas
+        vista.resize(1200, 900)
+        vista.show()
+
+        # Con más productos que la memoria del análisis, cada cambio también recalcula
+        analisis_producto.MAX_PRODUCTOS = min(analisis_producto.MAX_PRODUCTOS, productos // 2)
+        aleatorio = random.Random(1)
+        tracemalloc.start()
+        cuentas = []
+        inicio = time.perf_counter()
+        for cambio in range(1, args.cambios + 1):
+            vista.search_input.setText(codigo_producto(aleatorio.randrange(productos)))
+            vista.mostrar_grafica()
+            app.processEvents()
+            if cambio == 1 or cambio % args.intervalo == 0:
+                cuentas.append((cambio, contar(vista)))
+        segundos = time.perf_counter() - inicio
+        tracemalloc.stop()
+
+    print(f"{'cambio':>8}{'QObject':>10}{'widgets':>10}{'objetos Python':>16}{'memoria KB':>12}")
+    for cambio, c in cuentas:
+        print(f"{cambio:>8}{c['qobjects']:>10}{c['widgets']:>10}{c['objetos_python']:>16}{c['memoria_kb']:>12}")
+    print(f"{args.cambios} cambios en {segundos:.1f} s ({segundos / args.cambios * 1000:.1f} ms por cambio)")
+
+    crecimiento = {clave: cuentas[-1][1][clave] - cuentas[0][1][clave] for clave in ("qobjects", "widgets")}
+    if any(crecimiento.values()):
+        print(f"La vista acumuló {crecimiento['qobjects']} QObject y {crecimiento['widgets']} widgets")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
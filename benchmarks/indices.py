@@ -0,0 +1,131 @@
+"""Compara los planes de consulta antes y después de la migración de índices.
+
+Uso: python -m benchmarks.indices --productos 10000 --movimientos 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database.connection import DatabaseConnection
+from database.migraciones import aplicar_migraciones
+
+CONSULTAS = {
+    "agregar_salida": (
+        "SELECT descripcion, stock FROM productos WHERE codigo = ?",
+        ("P00001",),
+    ),
+    "delete_entry": (
+        "SELECT id FROM entradas WHERE codigo = ? AND fecha = ?",
+        ("P00001", "2024-06-01 10:00:00"),
+    ),
+    "crear_grafica_stock": (
+        """
+        WITH movimientos AS (
+            SELECT fecha, cantidad as cambio_stock FROM entradas WHERE codigo = ?
+            UNION ALL
+            SELECT fecha, -cantidad as cambio_stock FROM salidas WHERE codigo = ?
+        )
+        SELECT fecha, SUM(cambio_stock) OVER (ORDER BY fecha) as stock_acumulado
+        FROM movimientos
+        ORDER BY fecha
+        """,
+        ("P00001", "P00001"),
+    ),
+    "generar_observaciones": (
+        """
+        SELECT e.fecha, 'Entrada' as tipo, e.cantidad, p.precio_compra, p.precio_venta
+        FROM entradas e JOIN productos p ON e.codigo = p.codigo
+        WHERE e.codigo = ?
+        UNION ALL
+        SELECT s.fecha, 'Salida' as tipo, s.cantidad, p.precio_compra, p.precio_venta
+        FROM salidas s JOIN productos p ON s.codigo = p.codigo
+        WHERE s.codigo = ?
+        """,
+        ("P00001", "P00001"),
+    ),
+    "reporte_entradas_rango": (
+        """
+        SELECT datetime(e.fecha) as fecha, e.codigo, p.descripcion, e.cantidad
+        FROM entradas e JOIN productos p ON e.codigo = p.codigo
+        WHERE e.fecha BETWEEN ? AND ?
+        ORDER BY e.fecha DESC
+        """,
+        ("2024-06-01", "2024-06-07"),
+    ),
+}
+
+
+def poblar(db_file, productos, movimientos, semilla=1):
+    """Crea el esquema base (sin migraciones) y lo llena con datos sintéticos"""
+    DatabaseConnection(db_file).create_tables(migrar=False)
+    aleatorio = random.Random(semilla)
+    inicio = datetime(2023, 1, 1)
+    segundos = 2 * 365 * 24 * 3600
+
+    def filas_movimientos(n):
+        for _ in range(n):
+            codigo = f"P{aleatorio.randrange(productos):05d}"
+            fecha = inicio + timedelta(seconds=aleatorio.randrange(segundos))
+            yield codigo, codigo, aleatorio.randint(1, 20), fecha.strftime("%Y-%m-%d %H:%M:%S")
+
+    conn = sqlite3.connect(db_file)
+    with conn:
+        conn.executemany(
+            "INSERT INTO productos (codigo, descripcion, precio_compra, precio_venta) VALUES (?, ?, ?, ?)",
+            ((f"P{i:05d}", f"Producto {i}", 10.0, 15.0) for i in range(productos)),
+        )
+        conn.executemany(
+            "INSERT INTO entradas (codigo, descripcion, cantidad, fecha) VALUES (?, ?, ?, ?)",
+            filas_movimientos(movimientos // 2),
+        )
+        conn.executemany(
+            "INSERT INTO salidas (codigo, descripcion, cantidad, fecha) VALUES (?, ?, ?, ?)",
+            filas_movimientos(movimientos - movimientos // 2),
+        )
+    return conn
+
+
+def medir(conn, repeticiones=5):
+    resultados = {}
+    for nombre, (sql, parametros) in CONSULTAS.items():
+        plan = [fila[3] for fila in conn.execute("EXPLAIN QUERY PLAN " + sql, parametros)]
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            conn.execute(sql, parametros).fetchall()
+        tiempo = (time.perf_counter() - inicio) / repeticiones
+        resultados[nombre] = (plan, tiempo)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--productos", type=int, default=10000)
+    parser.add_argument("--movimientos", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        db_file = os.path.join(directorio, "bench.db")
+        print(f"Generando {args.productos} productos y {args.movimientos} movimientos...")
+        conn = poblar(db_file, args.productos, args.movimientos)
+
+        antes = medir(conn)
+        inicio = time.perf_counter()
+        aplicar_migraciones(conn)
+        print(f"Migraciones aplicadas en {time.perf_counter() - inicio:.2f}s")
+        despues = medir(conn)
+        conn.close()
+
+    for nombre in CONSULTAS:
+        plan_antes, t_antes = antes[nombre]
+        plan_despues, t_despues = despues[nombre]
+        print(f"\n{nombre}: {t_antes * 1000:.1f} ms -> {t_despues * 1000:.1f} ms")
+        print("  antes:   " + " | ".join(plan_antes))
+        print("  después: " + " | ".join(plan_despues))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compara el reporte Excel en memoria con el reporte en modo write_only.
+
+Cada modo se ejecuta en un subproceso para medir su pico de memoria (ru_maxrss)
+por separado. Los movimientos se reparten entre entradas y salidas dentro del
+período del reporte.
+
+Uso: python -m benchmarks.reporte_excel --filas 500000
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database.connection import DatabaseConnection
+from database.consultas import (consultar_inventario_periodo, consultar_entradas_periodo,
+                                consultar_salidas_periodo, consultar_longitudes)
+
+INICIO = datetime(2024, 1, 1)
+FIN = datetime(2024, 12, 31, 23, 59, 59)
+
+
+def poblar(db_file, filas, productos, semilla=1):
+    DatabaseConnection(db_file).create_tables(migrar=False)
+    aleatorio = random.Random(semilla)
+    codigos = [f"P{i:06d}" for i in range(productos)]
+    segundos = int((FIN - INICIO).total_seconds())
+
+    def movimientos(n):
+        for _ in range(n):
+            codigo = aleatorio.choice(codigos)
+            fecha = INICIO + timedelta(seconds=aleatorio.randrange(segundos))
+            yield codigo, f"Producto {codigo}", aleatorio.randint(1, 20), fecha.strftime("%Y-%m-%d %H:%M:%S")
+
+    conn = sqlite3.connect(db_file)
+    with conn:
+        conn.executemany(
+            "INSERT INTO productos (codigo, descripcion, precio_compra, precio_venta) VALUES (?, ?, ?, ?)",
+            ((codigo, f"Producto {codigo}", 10.0, 15.0) for codigo in codigos),
+        )
+        conn.executemany(
+            "INSERT INTO entradas (codigo, descripcion, cantidad, fecha) VALUES (?, ?, ?, ?)",
+            movimientos(filas // 2),
+        )
+        conn.executemany(
+            "INSERT INTO salidas (codigo, descripcion, cantidad, fecha) VALUES (?, ?, ?, ?)",
+            movimientos(filas - filas // 2),
+        )
+    conn.close()
+
+
+def generar(modo, db_file, destino):
+    """Se ejecuta dentro del subproceso; imprime tiempo y pico de memoria en JSON"""
+    from utils.reporte_excel_generator import ReporteExcelGenerator, ReporteExcelStreaming
+
+    inicio = time.perf_counter()
+    conn = sqlite3.connect(db_file)
+    if modo == "memoria":
+        wb = ReporteExcelGenerator().generate_report(
+            data_inventario=consultar_inventario_periodo(conn.cursor(), INICIO, FIN).fetchall(),
+            data_entradas=consultar_entradas_periodo(conn.cursor(), INICIO, FIN).fetchall(),
+            data_salidas=consultar_salidas_periodo(conn.cursor(), INICIO, FIN).fetchall(),
+            start_date=INICIO,
+            end_date=FIN,
+        )
+    else:
+        wb = ReporteExcelStreaming().generate_report(
+            data_inventario=consultar_inventario_periodo(conn.cursor(), INICIO, FIN),
+            data_entradas=consultar_entradas_periodo(conn.cursor(), INICIO, FIN),
+            data_salidas=consultar_salidas_periodo(conn.cursor(), INICIO, FIN),
+            start_date=INICIO,
+            end_date=FIN,
+            longitudes=consultar_longitudes(conn.cursor()),
+        )
+    wb.save(destino)
+    conn.close()
+
+    print(json.dumps({
+        "modo": modo,
+        "segundos": round(time.perf_counter() - inicio, 2),
+        "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "tamano_mb": round(os.path.getsize(destino) / 2 ** 20, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, default=500_000)
+    parser.add_argument("--productos", type=int, default=5000)
+    parser.add_argument("--modos", nargs="+", default=["streaming", "memoria"],
+                        choices=["streaming", "memoria"])
+    parser.add_argument("--_generar", nargs=3, metavar=("MODO", "DB", "DESTINO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._generar:
+        generar(*args._generar)
+        return
+
+    with tempfile.TemporaryDirectory() as directorio:
+        db_file = os.path.join(directorio, "bench.db")
+        poblar(db_file, args.filas, args.productos)
+        print(f"{args.filas} movimientos, {args.productos} productos")
+
+        for modo in args.modos:
+            destino = os.path.join(directorio, f"{modo}.xlsx")
+            salida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.reporte_excel", "--_generar", modo, db_file, destino],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(salida.stdout.strip().splitlines()[-1])
+            print(f"{r['modo']:>10}: {r['segundos']:7.2f} s  pico RSS {r['pico_rss_mb']:7.1f} MB  "
+                  f"archivo {r['tamano_mb']} MB")
+
+
+if __name__ == "__main__":
+    main()
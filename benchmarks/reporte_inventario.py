@@ -0,0 +1,93 @@
+"""Mide el costo de la consulta de inventario con un producto de muchos movimientos.
+
+Crea un producto con miles de entradas y salidas y compara la consulta
+anterior (JOIN directo de entradas y salidas) con la agregada por tabla y
+con la que lee los meses completos de movimientos_mensuales. Los totales de
+esas consultas se verifican en tests/test_totales_inventario.py.
+
+Uso: python -m benchmarks.reporte_inventario --movimientos 3000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date
+
+from database.movimientos import reconstruir_totales
+from database.connection import DatabaseConnection
+from database.consultas import (SQL_INVENTARIO_PERIODO, SQL_COMPARACION_PRODUCTOS,
+                                consultar_inventario_periodo)
+
+# Versión anterior, conservada solo para comparar
+SQL_INVENTARIO_JOIN = """
+    SELECT
+        p.codigo,
+        COALESCE(SUM(CASE WHEN e.fecha BETWEEN ? AND ? THEN e.cantidad ELSE 0 END), 0) as entradas,
+        COALESCE(SUM(CASE WHEN s.fecha BETWEEN ? AND ? THEN s.cantidad ELSE 0 END), 0) as salidas
+    FROM productos p
+    LEFT JOIN entradas e ON p.codigo = e.codigo
+    LEFT JOIN salidas s ON p.codigo = s.codigo
+    GROUP BY p.codigo
+"""
+
+
+def poblar(db_file, movimientos):
+    DatabaseConnection(db_file).create_tables()
+    conn = sqlite3.connect(db_file)
+    with conn:
+        conn.executemany(
+            "INSERT INTO productos (codigo, descripcion, precio_compra, precio_venta) VALUES (?, ?, ?, ?)",
+            [("A", "Producto A", 10.0, 15.0), ("B", "Producto B", 5.0, 8.0)],
+        )
+        fechas = [f"2024-03-{1 + i % 28:02d} 10:00:00" for i in range(movimientos)]
+        conn.executemany(
+            "INSERT INTO entradas (codigo, descripcion, cantidad, fecha) VALUES ('A', 'Producto A', 2, ?)",
+            ((fecha,) for fecha in fechas),
+        )
+        conn.executemany(
+            "INSERT INTO salidas (codigo, descripcion, cantidad, fecha) VALUES ('A', 'Producto A', 1, ?)",
+            ((fecha,) for fecha in fechas),
+        )
+        # Los movimientos se insertaron directo: se recalculan totales y resúmenes
+        reconstruir_totales(conn.cursor())
+    return conn
+
+
+def cronometrar(conn, sql, parametros):
+    inicio = time.perf_counter()
+    filas = conn.execute(sql, parametros).fetchall()
+    return filas, time.perf_counter() - inicio
+
+
+def cronometrar_mensual(conn, inicio_periodo, fin_periodo):
+    inicio = time.perf_counter()
+    filas = consultar_inventario_periodo(conn.cursor(), inicio_periodo, fin_periodo).fetchall()
+    return filas, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movimientos", type=int, default=3000)
+    args = parser.parse_args()
+    n = args.movimientos
+    rango = ("2024-01-01", "2024-12-31")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        conn = poblar(os.path.join(directorio, "bench.db"), n)
+
+        _, t_nueva = cronometrar(conn, SQL_INVENTARIO_PERIODO, (rango[0], rango[1] + " 23:59:59") * 2)
+        _, t_mensual = cronometrar_mensual(conn, date(2024, 1, 1), date(2024, 12, 31))
+        _, t_comparacion = cronometrar(conn, SQL_COMPARACION_PRODUCTOS, ("B", 4))
+        filas, t_join = cronometrar(conn, SQL_INVENTARIO_JOIN, rango * 2)
+        a = next(fila for fila in filas if fila[0] == "A")
+        conn.close()
+
+    print(f"Agregado por tabla: {t_nueva * 1000:.1f} ms (entradas={2 * n}, salidas={n})")
+    print(f"Resumen mensual: {t_mensual * 1000:.1f} ms")
+    print(f"Comparación de productos: {t_comparacion * 1000:.1f} ms")
+    print(f"JOIN directo: {t_join * 1000:.1f} ms (entradas={a[1]}, salidas={a[2]})")
+
+
+if __name__ == "__main__":
+    main()
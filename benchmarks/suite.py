@@ -0,0 +1,238 @@
+"""Suite de rendimiento: mide las rutas principales sobre un inventario sintético.
+
+Genera (o reutiliza) una base con benchmarks.datos y cronometra, sin abrir
+ventanas, la carga de productos y movimientos de las vistas, la búsqueda
+del historial, la gráfica de stock, las observaciones y las consultas del
+reporte. La exportación a Excel corre en un subproceso para medir su pico de
+memoria. El resultado se guarda en JSON; con --comparar se muestra la
+diferencia contra una corrida anterior.
+
+Uso:
+    python -m benchmarks.suite --productos 10000 --movimientos 1000000 --salida base.json
+    python -m benchmarks.suite --db bench.db --salida nuevo.json --comparar base.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from benchmarks.datos import DESDE, codigo_producto, generar
+from database.connection import DatabaseConnection
+
+MAX_PUNTOS_STOCK = 500  # El mismo límite que usa la gráfica del historial
+TEXTO_BUSQUEDA = "tornillo acero"
+TEXTO_BUSQUEDA_CORTO = "PV"  # Menos de tres letras: usa LIKE en lugar de FTS
+
+
+def casos(db, productos):
+    """Devuelve {nombre: funcion()}; cada función devuelve cuántas filas leyó"""
+    from database import stock_diario, analisis_producto
+    from database.busqueda import condicion_productos
+    from database.consultas import (consultar_historial_movimientos, consultar_observaciones,
+                                    consultar_comparacion_productos, consultar_inventario_periodo,
+                                    consultar_entradas_periodo, consultar_salidas_periodo)
+    from ui.models.productos_model import ProductosModel
+    from ui.models.movimientos_model import MovimientosModel
+
+    popular = codigo_producto(0)  # El producto con más movimientos
+    comun = codigo_producto(productos // 2)
+    mes = (date(DESDE.year, 6, 1), date(DESDE.year, 6, 30))
+    anio = (date(DESDE.year, 1, 1), date(DESDE.year, 12, 31))
+    fin_datos = DESDE + timedelta(days=730)  # Los datos cubren dos años desde DESDE
+
+    def modelo_productos(texto=""):
+        modelo = ProductosModel(db)
+        modelo.filtrar(texto) if texto else modelo.recargar()
+        filas = min(modelo.rowCount(), ProductosModel.TAMANO_PAGINA)
+        for fila in range(filas):  # Lo que pinta la primera pantalla
+            modelo.data(modelo.index(fila, 1))
+        return filas
+
+    def modelo_movimientos(tabla):
+        modelo = MovimientosModel(db, tabla)
+        modelo.recargar()
+        modelo.fetchMore()  # Primer desplazamiento
+        return modelo.rowCount()
+
+    def consulta(funcion, *args):
+        with db.connect() as conn:
+            return len(funcion(conn.cursor(), *args).fetchall())
+
+    def historial(texto):
+        with db.connect() as conn:
+            condicion, params = condicion_productos(conn, texto)
+            return len(consultar_historial_movimientos(conn.cursor(), condicion, params).fetchall())
+
+    def serie(codigo):
+        with db.connect() as conn:
+            return len(stock_diario.serie_stock(conn.cursor(), codigo, MAX_PUNTOS_STOCK))
+
+    def panel_historial(codigo, memorizado=False):
+        # Lo que calcula HistorialView.mostrar_grafica; sin memoria se mide el recorrido completo
+        if not memorizado:
+            analisis_producto.vaciar()
+        with db.connect() as conn:
+            analisis = analisis_producto.analizar(conn, codigo, MAX_PUNTOS_STOCK)
+            return len(analisis["serie"]) + len(analisis_producto.comparacion(conn, codigo))
+
+    return {
+        "productos_carga": modelo_productos,
+        "productos_busqueda": lambda: modelo_productos(TEXTO_BUSQUEDA),
+        "entradas_carga": lambda: modelo_movimientos("entradas"),
+        "salidas_carga": lambda: modelo_movimientos("salidas"),
+        "historial_busqueda": lambda: historial(TEXTO_BUSQUEDA),
+        "historial_busqueda_corta": lambda: historial(TEXTO_BUSQUEDA_CORTO),
+        "grafica_stock_popular": lambda: serie(popular),
+        "grafica_stock_comun": lambda: serie(comun),
+        "comparacion_productos": lambda: consulta(consultar_comparacion_productos, popular),
+        "comparacion_ultimos_30": lambda: consulta(consultar_comparacion_productos, popular, 4,
+                                                   fin_datos - timedelta(days=30)),
+        "comparacion_ultimos_90": lambda: consulta(consultar_comparacion_productos, popular, 4,
+                                                   fin_datos - timedelta(days=90)),
+        "observaciones_popular": lambda: consulta(consultar_observaciones, popular),
+        "observaciones_comun": lambda: consulta(consultar_observaciones, comun),
+        "panel_historial_popular": lambda: panel_historial(popular),
+        "panel_historial_comun": lambda: panel_historial(comun),
+        "panel_historial_memorizado": lambda: panel_historial(popular, memorizado=True),
+        "reporte_inventario_mes": lambda: consulta(consultar_inventario_periodo, *mes),
+        "reporte_inventario_anio": lambda: consulta(consultar_inventario_periodo, *anio),
+        "reporte_entradas_mes": lambda: consulta(consultar_entradas_periodo, *mes),
+        "reporte_salidas_mes": lambda: consulta(consultar_salidas_periodo, *mes),
+    }
+
+
+def cronometrar(funcion, repeticiones):
+    funcion()  # Calentamiento: caché de páginas de SQLite y del sistema
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        "ms_min": round(min(tiempos), 3),
+        "ms_mediana": round(statistics.median(tiempos), 3),
+        "ms_media": round(statistics.fmean(tiempos), 3),
+        "filas": filas,
+    }
+
+
+def exportar_excel(db_file, destino, inicio, fin):
+    """Se ejecuta dentro del subproceso; imprime tiempo y pico de memoria en JSON"""
+    from utils.reporte_excel_generator import exportar_reporte_periodo
+
+    comienzo = time.perf_counter()
+    with DatabaseConnection(db_file).connect() as conn:
+        exportar_reporte_periodo(conn, date.fromisoformat(inicio), date.fromisoformat(fin), destino)
+    print(json.dumps({
+        "segundos": round(time.perf_counter() - comienzo, 2),
+        "pico_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "tamano_mb": round(os.path.getsize(destino) / 2 ** 20, 2),
+    }))
+
+
+def medir_excel(db_file, directorio, inicio, fin):
+    destino = os.path.join(directorio, f"reporte_{inicio}_{fin}.xlsx")
+    salida = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--_excel", db_file, destino, inicio, fin],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def comparar(actual, anterior):
+    print(f"\n{'caso':<28}{'anterior':>12}{'actual':>12}{'cambio':>10}")
+    for nombre, r in actual["resultados"].items():
+        previo = anterior.get("resultados", {}).get(nombre)
+        if previo is None:
+            print(f"{nombre:<28}{'-':>12}{r['ms_mediana']:>10.2f}ms")
+            continue
+        cambio = (r["ms_mediana"] - previo["ms_mediana"]) / previo["ms_mediana"] * 100 if previo["ms_mediana"] else 0
+        print(f"{nombre:<28}{previo['ms_mediana']:>10.2f}ms{r['ms_mediana']:>10.2f}ms{cambio:>+9.1f}%")
+    for nombre, r in actual.get("excel", {}).items():
+        previo = anterior.get("excel", {}).get(nombre)
+        if previo:
+            print(f"{'excel_' + nombre:<28}{previo['segundos']:>11.2f}s{r['segundos']:>11.2f}s"
+                  f"  RSS {previo['pico_rss_mb']} -> {r['pico_rss_mb']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--productos", type=int, default=10000)
+    parser.add_argument("--movimientos", type=int, default=1000000)
+    parser.add_argument("--db", help="base a reutilizar; si no existe se genera ahí")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--casos", nargs="+", help="ejecutar solo estos casos")
+    parser.add_argument("--sin-excel", action="store_true", help="omitir la exportación a Excel")
+    parser.add_argument("--salida", help="archivo JSON con los resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    parser.add_argument("--_excel", nargs=4, metavar=("DB", "DESTINO", "INICIO", "FIN"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._excel:
+        exportar_excel(*args._excel)
+        return
+
+    with tempfile.TemporaryDirectory() as directorio:
+        db_file = args.db or os.path.join(directorio, "bench.db")
+        generacion = None
+        if not os.path.exists(db_file):
+            print(f"Generando {args.productos} productos y {args.movimientos} movimientos...")
+            generacion = round(generar(db_file, args.productos, args.movimientos), 2)
+            print(f"  {generacion} s")
+
+        with sqlite3.connect(db_file) as conn:
+            productos, entradas, salidas = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM productos), (SELECT COUNT(*) FROM entradas), "
+                "(SELECT COUNT(*) FROM salidas)"
+            ).fetchone()
+        db = DatabaseConnection(db_file)
+        db.create_tables()  # Una base reutilizada puede venir de un esquema anterior
+
+        resultados = {}
+        for nombre, funcion in casos(db, productos).items():
+            if args.casos and nombre not in args.casos:
+                continue
+            resultados[nombre] = cronometrar(funcion, args.repeticiones)
+            r = resultados[nombre]
+            print(f"{nombre:<28}{r['ms_mediana']:>10.2f} ms (mín {r['ms_min']:.2f}, {r['filas']} filas)")
+
+        excel = {}
+        if not args.sin_excel:
+            periodos = {"mes": (f"{DESDE.year}-06-01", f"{DESDE.year}-06-30"),
+                        "anio": (f"{DESDE.year}-01-01", f"{DESDE.year}-12-31")}
+            for nombre, (inicio, fin) in periodos.items():
+                excel[nombre] = medir_excel(db_file, directorio, inicio, fin)
+                r = excel[nombre]
+                print(f"{'excel_' + nombre:<28}{r['segundos']:>10.2f} s  pico RSS {r['pico_rss_mb']} MB  "
+                      f"archivo {r['tamano_mb']} MB")
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "escala": {"productos": productos, "entradas": entradas, "salidas": salidas},
+        "generacion_s": generacion,
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+        "excel": excel,
+    }
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(informe, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Análisis de un producto para el panel del historial.
+
+La serie de stock y las observaciones salen de un solo recorrido por los
+movimientos del producto, leídos en orden de fecha por los índices
+(codigo, fecha) de entradas y salidas. La comparación con los productos de
+más movimiento lee el ranking del índice sobre productos.total_movimientos,
+o suma solo los movimientos de la ventana pedida (últimos 30 o 90 días).
+
+Los análisis se memorizan por código junto a productos.version_analisis,
+que database.movimientos cambia en la misma transacción que cada movimiento
+o cambio de precio del producto. Un análisis vale mientras esa columna no
+cambie, así que escribir en un producto no descarta los de los demás, y una
+lectura anterior al commit del escritor queda con la versión vieja. La
+comparación depende de todo el catálogo y se guarda junto a la versión de
+los datos (database/version_datos.py).
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from database.consultas import consultar_comparacion_productos
+from database.stock_diario import reducir_serie
+from database.version_datos import version_actual
+
+MAX_PRODUCTOS = 64  # Análisis que se conservan en memoria
+PRODUCTOS_COMPARADOS = 4
+
+# Movimientos del producto en orden de fecha: SQLite mezcla las dos ramas
+# ya ordenadas por los índices, sin ordenar en una tabla temporal
+SQL_MOVIMIENTOS_PRODUCTO = """
+    SELECT fecha, julianday(fecha), cantidad, 1 FROM entradas WHERE codigo = ?1
+    UNION ALL
+    SELECT fecha, julianday(fecha), cantidad, 0 FROM salidas WHERE codigo = ?1
+    ORDER BY fecha
+"""
+
+_lock = threading.Lock()
+_analisis = OrderedDict()  # (base, codigo) -> (version_analisis del producto, {'serie', 'observaciones'})
+_comparaciones = OrderedDict()  # (base, codigo, dias) -> (versión de los datos, desde, filas)
+
+
+def _base(conn):
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+
+def crear_version_analisis(cursor):
+    """Agrega productos.version_analisis, que toma la versión de los datos con cada cambio del producto.
+
+    Como la versión de los datos solo crece, un producto borrado y vuelto a
+    crear con el mismo código nunca repite un valor anterior.
+    """
+    columnas = [fila[1] for fila in cursor.execute("PRAGMA table_info(productos)")]
+    if "version_analisis" not in columnas:
+        cursor.execute("ALTER TABLE productos ADD COLUMN version_analisis INTEGER")
+    cursor.execute("UPDATE productos SET version_analisis = (SELECT version FROM version_datos WHERE id = 1)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS productos_version_analisis_ai AFTER INSERT ON productos BEGIN
+            UPDATE productos SET version_analisis = (SELECT version FROM version_datos WHERE id = 1)
+            WHERE rowid = new.rowid;
+        END
+    """)
+
+
+def vaciar():
+    """Descarta todos los análisis memorizados"""
+    with _lock:
+        _analisis.clear()
+
+
+def _guardar(cache, clave, valor):
+    with _lock:
+        cache[clave] = valor
+        cache.move_to_end(clave)
+        while len(cache) > MAX_PRODUCTOS:
+            cache.popitem(last=False)
+
+
+def calcular(conn, codigo):
+    """Recorre una vez los movimientos del producto.
+
+    Devuelve {'serie': [(día, stock al cierre)], 'observaciones': tupla} con
+    las observaciones en el orden de consultas.SQL_OBSERVACIONES.
+    """
+    producto = conn.execute("SELECT precio_compra, precio_venta FROM productos WHERE codigo = ?",
+                            (codigo,)).fetchone()
+    serie = []
+    dia_actual = None
+    stock = 0
+    n_entradas = n_salidas = total_entradas = total_salidas = 0
+    suma_dias = 0.0
+
+    if producto is not None:
+        for fecha, dia_juliano, cantidad, es_entrada in conn.execute(SQL_MOVIMIENTOS_PRODUCTO, (codigo,)):
+            dia = fecha[:10]
+            if dia != dia_actual:
+                if dia_actual is not None:
+                    serie.append((dia_actual, stock))
+                dia_actual = dia
+            if es_entrada:
+                n_entradas += 1
+                total_entradas += cantidad
+                stock += cantidad
+            else:
+                n_salidas += 1
+                total_salidas += cantidad
+                stock -= cantidad
+            suma_dias += dia_juliano or 0.0
+        if dia_actual is not None:
+            serie.append((dia_actual, stock))
+
+    total = n_entradas + n_salidas
+    if total == 0:
+        observaciones = (0, None, None, None, None, None, None, None, None, 0, 0)
+    else:
+        precio_compra, precio_venta = producto
+        observaciones = (
+            total,
+            total_entradas,
+            total_salidas,
+            total_entradas / n_entradas if n_entradas else None,
+            total_salidas / n_salidas if n_salidas else None,
+            # Los movimientos no guardan precio: el rango es el precio actual
+            precio_compra if n_entradas else None,
+            precio_compra if n_entradas else None,
+            precio_venta if n_salidas else None,
+            precio_venta if n_salidas else None,
+            suma_dias / total,
+            total_entradas / total_salidas if total_salidas else 0,
+        )
+    return {"serie": serie, "observaciones": observaciones}
+
+
+def analizar(conn, codigo, max_puntos=None):
+    """Serie de stock (reducida a max_puntos) y observaciones del producto, memorizadas"""
+    clave = (_base(conn), codigo)
+    # La versión se lee antes que los movimientos: si cambia en medio, el
+    # análisis queda con una versión vieja y la próxima lectura lo recalcula
+    fila = conn.execute("SELECT version_analisis FROM productos WHERE codigo = ?", (codigo,)).fetchone()
+    version = fila[0] if fila else None
+    analisis = None
+    with _lock:
+        guardado = _analisis.get(clave)
+        if guardado is not None and version is not None and guardado[0] == version:
+            analisis = guardado[1]
+            _analisis.move_to_end(clave)
+    if analisis is None:
+        analisis = calcular(conn, codigo)
+        _guardar(_analisis, clave, (version, analisis))
+    return {"serie": reducir_serie(analisis["serie"], max_puntos), "observaciones": analisis["observaciones"]}
+
+
+def comparacion(conn, codigo, dias=None):
+    """El producto y los PRODUCTOS_COMPARADOS con más movimientos; vale mientras no cambien los datos.
+
+    Con dias solo cuentan los movimientos de los últimos dias días.
+    """
+    desde = date.today() - timedelta(days=dias) if dias else None
+    clave = (_base(conn), codigo, dias)
+    version = version_actual(conn)
+    with _lock:
+        guardada = _comparaciones.get(clave)
+    if guardada is not None and version is not None and guardada[:2] == (version, desde):
+        return guardada[2]
+    filas = [tuple(fila) for fila in consultar_comparacion_productos(conn.cursor(), codigo,
+                                                                      PRODUCTOS_COMPARADOS, desde)]
+    _guardar(_comparaciones, clave, (version, desde, filas))
+    return filas
@@ -0,0 +1,46 @@
+"""Búsqueda de productos por código o descripción.
+
+Usa el índice de trigramas productos_fts cuando existe; con textos de menos
+de tres caracteres, o si SQLite no tiene FTS5, recurre a LIKE.
+"""
+
+LONGITUD_MINIMA_TRIGRAMA = 3
+
+_con_indice = {}
+
+
+def hay_indice_busqueda(conn):
+    clave = conn.execute("PRAGMA database_list").fetchone()[2]
+    if clave not in _con_indice:
+        fila = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'productos_fts'"
+        ).fetchone()
+        _con_indice[clave] = fila is not None
+    return _con_indice[clave]
+
+
+def expresion_fts(texto, columnas):
+    # El texto va como frase entre comillas para que se busque literal
+    frase = '"' + texto.replace('"', '""') + '"'
+    return "{" + " ".join(columnas) + "} : " + frase
+
+
+def condicion_productos(conn, texto, columnas=("codigo", "descripcion")):
+    """Condición SQL (y parámetros) para filtrar la tabla productos"""
+    texto = texto.strip()
+    if len(texto) >= LONGITUD_MINIMA_TRIGRAMA and hay_indice_busqueda(conn):
+        return ("rowid IN (SELECT rowid FROM productos_fts WHERE productos_fts MATCH ?)",
+                (expresion_fts(texto, columnas),))
+    patron = f"%{texto}%"
+    return " OR ".join(f"{columna} LIKE ?" for columna in columnas), (patron,) * len(columnas)
+
+
+def condicion_movimientos(conn, texto, columnas=("codigo", "descripcion")):
+    """Condición SQL (y parámetros) para filtrar entradas o salidas por producto"""
+    texto = texto.strip()
+    if len(texto) >= LONGITUD_MINIMA_TRIGRAMA and hay_indice_busqueda(conn):
+        return ("codigo IN (SELECT codigo FROM productos WHERE rowid IN "
+                "(SELECT rowid FROM productos_fts WHERE productos_fts MATCH ?))",
+                (expresion_fts(texto, columnas),))
+    patron = f"%{texto}%"
+    return " OR ".join(f"{columna} LIKE ?" for columna in columnas), (patron,) * len(columnas)
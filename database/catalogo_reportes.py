@@ -0,0 +1,176 @@
+"""Catálogo de reportes generados (tabla historial_reportes).
+
+Cada reporte tiene un id entero, la fecha en formato ISO (ordenable e
+indexada), la descripción editable, la ruta del archivo y su tamaño y
+checksum SHA-256 calculados al registrarlo. La vista lo lee por páginas y un
+barrido en segundo plano quita las entradas cuyo archivo ya no existe.
+
+La migración convierte la tabla anterior, con fechas dd/mm/aaaa. El archivo
+historial_reportes.json de la carpeta del proyecto solo se importa en la base
+de la aplicación (DatabaseConnection sin ruta, ver importar_historial_anterior)
+y, una vez confirmado, se renombra a historial_reportes.json.migrado.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+ARCHIVO_HISTORIAL_ANTERIOR = Path("historial_reportes.json")
+ARCHIVO_HISTORIAL_MIGRADO = ARCHIVO_HISTORIAL_ANTERIOR.with_name(ARCHIVO_HISTORIAL_ANTERIOR.name + ".migrado")
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+TAMANO_PAGINA = 100
+
+COLUMNAS = "id, fecha, descripcion, temporalidad, file_path, tamano, checksum"
+
+SQL_CREAR_CATALOGO = """
+    CREATE TABLE historial_reportes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT NOT NULL,
+        descripcion TEXT NOT NULL,
+        temporalidad TEXT,
+        file_path TEXT NOT NULL,
+        tamano INTEGER,
+        checksum TEXT
+    )
+"""
+
+
+def _fecha_anterior(texto):
+    # El historial anterior guardaba 'dd/mm/aaaa HH:MM:SS'
+    try:
+        return datetime.strptime(texto, "%d/%m/%Y %H:%M:%S").strftime(FORMATO_FECHA)
+    except (TypeError, ValueError):
+        return texto or datetime.now().strftime(FORMATO_FECHA)
+
+
+def crear_catalogo_reportes(cursor):
+    anteriores = []
+    existe = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'historial_reportes'"
+    ).fetchone()
+    if existe:
+        anteriores = cursor.execute(
+            "SELECT fecha, descripcion, temporalidad, file_path FROM historial_reportes ORDER BY id"
+        ).fetchall()
+        cursor.execute("DROP TABLE historial_reportes")
+
+    cursor.execute(SQL_CREAR_CATALOGO)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_historial_reportes_fecha ON historial_reportes (fecha, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_historial_reportes_descripcion "
+                   "ON historial_reportes (descripcion COLLATE NOCASE)")
+    # Tamaño y checksum quedan en NULL: calcularlos aquí retrasaría el arranque
+    cursor.executemany(
+        "INSERT INTO historial_reportes (fecha, descripcion, temporalidad, file_path) VALUES (?, ?, ?, ?)",
+        [(_fecha_anterior(fecha), descripcion or "", temporalidad, file_path)
+         for fecha, descripcion, temporalidad, file_path in anteriores if file_path],
+    )
+
+
+def importar_historial_anterior(conn):
+    """Agrega al catálogo los reportes de historial_reportes.json; devuelve cuántos.
+
+    Se omiten los archivos que ya están en el catálogo (su descripción pudo
+    cambiarse ahí), así que repetir la importación no duplica filas. El
+    archivo se renombra después del commit: si la transacción falla, queda
+    para el próximo arranque.
+    """
+    if not ARCHIVO_HISTORIAL_ANTERIOR.exists():
+        return 0
+    try:
+        with open(ARCHIVO_HISTORIAL_ANTERIOR, encoding="utf-8") as f:
+            anteriores = [(r.get("fecha"), r.get("descripcion"), r.get("temporalidad"), r.get("file_path"))
+                          for r in json.load(f)]
+    except (OSError, ValueError, AttributeError):
+        return 0  # Un historial ilegible no debe impedir abrir la aplicación
+
+    cursor = conn.cursor()
+    registrados = {fila[0] for fila in cursor.execute("SELECT file_path FROM historial_reportes")}
+    nuevos = {}
+    for fecha, descripcion, temporalidad, file_path in anteriores:
+        if file_path and file_path not in registrados:
+            nuevos.setdefault(file_path, (fecha, descripcion, temporalidad))
+    cursor.executemany(
+        "INSERT INTO historial_reportes (fecha, descripcion, temporalidad, file_path) VALUES (?, ?, ?, ?)",
+        [(_fecha_anterior(fecha), descripcion or "", temporalidad, file_path)
+         for file_path, (fecha, descripcion, temporalidad) in nuevos.items()],
+    )
+    conn.commit()
+    try:
+        ARCHIVO_HISTORIAL_ANTERIOR.replace(ARCHIVO_HISTORIAL_MIGRADO)
+    except OSError:
+        pass  # Si queda, la próxima importación no duplica filas
+    return len(nuevos)
+
+
+def datos_archivo(ruta, bloque=1024 * 1024):
+    """Devuelve (tamaño en bytes, checksum SHA-256) del archivo"""
+    suma = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        while datos := f.read(bloque):
+            suma.update(datos)
+    return os.path.getsize(ruta), suma.hexdigest()
+
+
+def registrar(cursor, fecha, descripcion, temporalidad, file_path):
+    """Agrega un reporte recién generado; devuelve su id. Lee el archivo completo para el checksum."""
+    tamano, checksum = datos_archivo(file_path)
+    if isinstance(fecha, datetime):
+        fecha = fecha.strftime(FORMATO_FECHA)
+    cursor.execute("""
+        INSERT INTO historial_reportes (fecha, descripcion, temporalidad, file_path, tamano, checksum)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (fecha, descripcion, temporalidad, file_path, tamano, checksum))
+    return cursor.lastrowid
+
+
+def obtener(cursor, id_reporte):
+    return cursor.execute(f"SELECT {COLUMNAS} FROM historial_reportes WHERE id = ?", (id_reporte,)).fetchone()
+
+
+def listar(cursor, texto="", despues=None, limite=TAMANO_PAGINA):
+    """Una página del catálogo, del más reciente al más antiguo.
+
+    despues es (fecha, id) de la última fila ya cargada; texto filtra por
+    fecha o descripción.
+    """
+    condiciones, params = [], []
+    if texto:
+        patron = f"%{texto}%"
+        # La fecha se busca también como se muestra (dd/mm/aaaa)
+        condiciones.append("(fecha LIKE ? OR strftime('%d/%m/%Y %H:%M:%S', fecha) LIKE ? OR descripcion LIKE ?)")
+        params += [patron, patron, patron]
+    if despues is not None:
+        condiciones.append("(fecha, id) < (?, ?)")
+        params += list(despues)
+    where = "WHERE " + " AND ".join(condiciones) if condiciones else ""
+    return cursor.execute(f"""
+        SELECT {COLUMNAS} FROM historial_reportes
+        {where}
+        ORDER BY fecha DESC, id DESC
+        LIMIT ?
+    """, params + [limite]).fetchall()
+
+
+def renombrar(cursor, id_reporte, descripcion):
+    cursor.execute("UPDATE historial_reportes SET descripcion = ? WHERE id = ?", (descripcion, id_reporte))
+    return cursor.rowcount > 0
+
+
+def eliminar(cursor, id_reporte):
+    cursor.execute("DELETE FROM historial_reportes WHERE id = ?", (id_reporte,))
+    return cursor.rowcount > 0
+
+
+def descripciones_con_prefijo(cursor, prefijo):
+    """Descripciones del catálogo que empiezan por prefijo (LIKE usa el índice NOCASE)"""
+    return {fila[0] for fila in cursor.execute(
+        "SELECT descripcion FROM historial_reportes WHERE descripcion LIKE ?", (prefijo + "%",))}
+
+
+def podar_inexistentes(conn):
+    """Borra las entradas cuyo archivo ya no existe; devuelve sus ids"""
+    rutas = conn.execute("SELECT id, file_path FROM historial_reportes").fetchall()
+    faltantes = [id_reporte for id_reporte, ruta in rutas if not os.path.isfile(ruta)]
+    conn.executemany("DELETE FROM historial_reportes WHERE id = ?", [(id_reporte,) for id_reporte in faltantes])
+    return faltantes
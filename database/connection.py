@@ -1,20 +1,31 @@
 import sqlite3
 from pathlib import Path
+from database.pool import obtener_pool
+from database.migraciones import aplicar_migraciones
+from database.catalogo_reportes import importar_historial_anterior
 
 class DatabaseConnection:
-    def __init__(self):
-        # Crear directorio de base de datos si no existe
-        db_path = Path("src/database")
-        db_path.mkdir(parents=True, exist_ok=True)
-        
-        self.db_file = db_path / "inventario.db"
+    def __init__(self, db_file=None):
+        # Solo la base de la aplicación importa el historial anterior de reportes
+        self.predeterminada = db_file is None
+        if db_file is None:
+            # Crear directorio de base de datos si no existe
+            db_path = Path("src/database")
+            db_path.mkdir(parents=True, exist_ok=True)
+            db_file = db_path / "inventario.db"
+
+        self.db_file = db_file
+        # Todas las vistas comparten el mismo pool de conexiones
+        self.pool = obtener_pool(self.db_file)
 
     def connect(self):
-        conn = sqlite3.connect(self.db_file)
-        conn.row_factory = sqlite3.Row  # Esto permite acceder a los resultados como diccionarios
-        return conn
+        # Presta una conexión del pool; se devuelve al salir del bloque "with"
+        return self.pool.conexion()
+
+    def estadisticas(self):
+        return self.pool.estadisticas()
 
-    def create_tables(self):
+    def create_tables(self, migrar=True):
         sql_productos = '''
         CREATE TABLE IF NOT EXISTS productos (
             codigo TEXT PRIMARY KEY,
@@ -67,4 +78,10 @@ class DatabaseConnection:
                 except sqlite3.Error:
                     pass  # La columna ya existe
             
-            conn.commit()
\ No newline at end of file
+            conn.commit()
+
+            # Índices y demás cambios versionados del esquema
+            if migrar:
+                aplicar_migraciones(conn)
+                if self.predeterminada:
+                    importar_historial_anterior(conn)
\ No newline at end of file
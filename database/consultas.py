@@ -0,0 +1,302 @@
+"""Consultas compartidas por las vistas y la generación de reportes.
+
+Cada función ejecuta la consulta sobre el cursor recibido y lo devuelve, de
+modo que quien llama decide si usar fetchall() o iterar fila por fila.
+"""
+from datetime import date, datetime
+from database import movimientos_mensuales
+
+# Los movimientos se agregan por tabla antes del JOIN. Unir entradas y salidas
+# directamente a productos genera el producto cartesiano entradas x salidas de
+# cada código e infla las sumas.
+SQL_INVENTARIO_PERIODO = """
+    WITH e AS (
+        SELECT codigo, SUM(cantidad) as cantidad
+        FROM entradas
+        WHERE fecha BETWEEN ? AND ?
+        GROUP BY codigo
+    ),
+    s AS (
+        SELECT codigo, SUM(cantidad) as cantidad
+        FROM salidas
+        WHERE fecha BETWEEN ? AND ?
+        GROUP BY codigo
+    )
+    SELECT
+        p.codigo,
+        p.descripcion,
+        COALESCE(e.cantidad, 0) as entradas,
+        COALESCE(s.cantidad, 0) as salidas,
+        p.stock,
+        p.precio_compra,
+        p.precio_venta,
+        COALESCE(e.cantidad, 0) * p.precio_compra as valor_compra_total,
+        COALESCE(s.cantidad, 0) * p.precio_venta as valor_venta_total,
+        COALESCE(s.cantidad, 0) * p.precio_venta -
+        COALESCE(e.cantidad, 0) * p.precio_compra as utilidad
+    FROM productos p
+    LEFT JOIN e ON e.codigo = p.codigo
+    LEFT JOIN s ON s.codigo = p.codigo
+    ORDER BY p.codigo
+"""
+
+# Misma salida que SQL_INVENTARIO_PERIODO, pero los meses completos del período
+# salen de movimientos_mensuales y solo los extremos sueltos se leen de
+# entradas y salidas (ver movimientos_mensuales.dividir_periodo).
+SQL_INVENTARIO_PERIODO_MENSUAL = """
+    WITH mov AS (
+        SELECT codigo, entradas, salidas FROM movimientos_mensuales WHERE mes BETWEEN ?1 AND ?2
+        UNION ALL
+        SELECT codigo, cantidad, 0 FROM entradas WHERE fecha >= ?3 AND fecha < ?4
+        UNION ALL
+        SELECT codigo, cantidad, 0 FROM entradas WHERE fecha >= ?5 AND fecha <= ?6
+        UNION ALL
+        SELECT codigo, 0, cantidad FROM salidas WHERE fecha >= ?3 AND fecha < ?4
+        UNION ALL
+        SELECT codigo, 0, cantidad FROM salidas WHERE fecha >= ?5 AND fecha <= ?6
+    ),
+    t AS (
+        SELECT codigo, SUM(entradas) as entradas, SUM(salidas) as salidas
+        FROM mov
+        GROUP BY codigo
+    )
+    SELECT
+        p.codigo,
+        p.descripcion,
+        COALESCE(t.entradas, 0) as entradas,
+        COALESCE(t.salidas, 0) as salidas,
+        p.stock,
+        p.precio_compra,
+        p.precio_venta,
+        COALESCE(t.entradas, 0) * p.precio_compra as valor_compra_total,
+        COALESCE(t.salidas, 0) * p.precio_venta as valor_venta_total,
+        COALESCE(t.salidas, 0) * p.precio_venta -
+        COALESCE(t.entradas, 0) * p.precio_compra as utilidad
+    FROM productos p
+    LEFT JOIN t ON t.codigo = p.codigo
+    ORDER BY p.codigo
+"""
+
+SQL_ENTRADAS_PERIODO = """
+    SELECT
+        datetime(e.fecha) as fecha,
+        e.codigo,
+        p.descripcion,
+        e.cantidad,
+        p.precio_compra,
+        e.cantidad * p.precio_compra as valor_total
+    FROM entradas e
+    JOIN productos p ON e.codigo = p.codigo
+    WHERE e.fecha BETWEEN ? AND ?
+    ORDER BY e.fecha DESC
+"""
+
+SQL_SALIDAS_PERIODO = """
+    SELECT
+        datetime(s.fecha) as fecha,
+        s.codigo,
+        p.descripcion,
+        s.cantidad,
+        p.precio_venta,
+        s.cantidad * p.precio_venta as valor_total
+    FROM salidas s
+    JOIN productos p ON s.codigo = p.codigo
+    WHERE s.fecha BETWEEN ? AND ?
+    ORDER BY s.fecha DESC
+"""
+
+# El producto seleccionado (?1) y los ?2 con más movimientos. El ranking se
+# lee en orden del índice sobre productos.total_movimientos, que mantiene
+# database/movimientos.py: no depende del tamaño del catálogo
+SQL_COMPARACION_PRODUCTOS = """
+    SELECT
+        codigo,
+        descripcion,
+        COALESCE(entradas_totales, 0) as entradas,
+        COALESCE(salidas_totales, 0) as salidas,
+        codigo = ?1 as es_seleccionado,
+        total_movimientos
+    FROM productos
+    WHERE codigo = ?1
+    OR codigo IN (
+        SELECT codigo
+        FROM productos
+        WHERE codigo != ?1
+        ORDER BY total_movimientos DESC
+        LIMIT ?2
+    )
+    ORDER BY es_seleccionado DESC, total_movimientos DESC
+"""
+
+# Variante con ventana móvil: solo cuentan los movimientos desde ?3. Suma los
+# movimientos del rango por el índice de fecha, así que su costo depende del
+# largo de la ventana y no de toda la historia
+SQL_COMPARACION_PRODUCTOS_VENTANA = """
+    WITH m AS (
+        SELECT codigo, cantidad as entradas, 0 as salidas FROM entradas WHERE fecha >= ?3
+        UNION ALL
+        SELECT codigo, 0, cantidad FROM salidas WHERE fecha >= ?3
+    ),
+    t AS (
+        SELECT codigo, SUM(entradas) as entradas, SUM(salidas) as salidas,
+               SUM(entradas) + SUM(salidas) as total_movimientos
+        FROM m
+        GROUP BY codigo
+    ),
+    ranking AS (
+        SELECT codigo FROM t
+        WHERE codigo != ?1
+        ORDER BY total_movimientos DESC
+        LIMIT ?2
+    )
+    SELECT
+        p.codigo,
+        p.descripcion,
+        COALESCE(t.entradas, 0) as entradas,
+        COALESCE(t.salidas, 0) as salidas,
+        p.codigo = ?1 as es_seleccionado,
+        COALESCE(t.total_movimientos, 0) as total_movimientos
+    FROM productos p
+    LEFT JOIN t ON t.codigo = p.codigo
+    WHERE p.codigo = ?1 OR p.codigo IN ranking
+    ORDER BY es_seleccionado DESC, total_movimientos DESC
+"""
+
+# {condicion} filtra la tabla productos (ver database/busqueda.py)
+SQL_HISTORIAL_MOVIMIENTOS = """
+    WITH p AS (
+        SELECT codigo, descripcion, stock, precio_compra, precio_venta
+        FROM productos
+        WHERE {condicion}
+    ),
+    movimientos AS (
+        -- Entradas
+        SELECT
+            e.fecha,
+            p.codigo,
+            p.descripcion,
+            'Entrada' as tipo_movimiento,
+            e.cantidad,
+            p.stock as stock_final,
+            p.precio_compra,
+            p.precio_venta,
+            (e.cantidad * p.precio_compra) as valor_movimiento,
+            (p.stock * p.precio_compra) as valor_stock,
+            0 as utilidad
+        FROM p
+        JOIN entradas e ON p.codigo = e.codigo
+
+        UNION ALL
+
+        -- Salidas
+        SELECT
+            s.fecha,
+            p.codigo,
+            p.descripcion,
+            'Salida' as tipo_movimiento,
+            s.cantidad * -1,
+            p.stock as stock_final,
+            p.precio_compra,
+            p.precio_venta,
+            (s.cantidad * p.precio_venta) as valor_movimiento,
+            (p.stock * p.precio_compra) as valor_stock,
+            ((s.cantidad * p.precio_venta) - (s.cantidad * p.precio_compra)) as utilidad
+        FROM p
+        JOIN salidas s ON p.codigo = s.codigo
+    )
+    SELECT * FROM movimientos
+    ORDER BY fecha DESC
+"""
+
+
+# Resumen de movimientos de un producto para las observaciones del historial
+SQL_OBSERVACIONES = """
+    WITH movimientos AS (
+        SELECT e.fecha, 'Entrada' as tipo, e.cantidad,
+            p.precio_compra, p.precio_venta
+        FROM entradas e
+        JOIN productos p ON e.codigo = p.codigo
+        WHERE e.codigo = ?
+        UNION ALL
+        SELECT s.fecha, 'Salida' as tipo, s.cantidad,
+            p.precio_compra, p.precio_venta
+        FROM salidas s
+        JOIN productos p ON s.codigo = p.codigo
+        WHERE s.codigo = ?
+    ),
+    rotacion AS (
+        SELECT 
+            AVG(JULIANDAY(fecha)) as tiempo_promedio_permanencia,
+            CAST(SUM(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE 0 END) AS FLOAT) / 
+            NULLIF(SUM(CASE WHEN tipo = 'Salida' THEN cantidad ELSE 0 END), 0) as indice_rotacion
+        FROM movimientos
+    )
+    SELECT 
+        COUNT(*) as total_movimientos,
+        SUM(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE 0 END) as total_entradas,
+        SUM(CASE WHEN tipo = 'Salida' THEN cantidad ELSE 0 END) as total_salidas,
+        AVG(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE NULL END) as promedio_entradas,
+        AVG(CASE WHEN tipo = 'Salida' THEN cantidad ELSE NULL END) as promedio_salidas,
+        MIN(CASE WHEN tipo = 'Entrada' THEN precio_compra ELSE NULL END) as min_precio_compra,
+        MAX(CASE WHEN tipo = 'Entrada' THEN precio_compra ELSE NULL END) as max_precio_compra,
+        MIN(CASE WHEN tipo = 'Salida' THEN precio_venta ELSE NULL END) as min_precio_venta,
+        MAX(CASE WHEN tipo = 'Salida' THEN precio_venta ELSE NULL END) as max_precio_venta,
+        COALESCE(r.tiempo_promedio_permanencia, 0) as tiempo_promedio_permanencia,
+        COALESCE(r.indice_rotacion, 0) as indice_rotacion
+    FROM movimientos
+    LEFT JOIN rotacion r ON 1=1
+"""
+
+
+def fin_del_dia(fecha):
+    """Las fechas se comparan como texto: un fin sin hora dejaría fuera los movimientos de ese día"""
+    if isinstance(fecha, date) and not isinstance(fecha, datetime):
+        return f"{fecha:%Y-%m-%d} 23:59:59"
+    return fecha
+
+
+def consultar_inventario_periodo(cursor, fecha_inicio, fecha_fin):
+    fecha_fin = fin_del_dia(fecha_fin)
+    if not movimientos_mensuales.hay_resumen_mensual(cursor.connection):
+        return cursor.execute(SQL_INVENTARIO_PERIODO, (fecha_inicio, fecha_fin, fecha_inicio, fecha_fin))
+
+    meses, antes, despues = movimientos_mensuales.dividir_periodo(fecha_inicio, fecha_fin)
+    # Los rangos vacíos no seleccionan ninguna fila
+    meses = meses or ("1", "0")
+    antes = antes or ("", "")
+    despues = despues or ("1", "0")
+    return cursor.execute(SQL_INVENTARIO_PERIODO_MENSUAL, meses + antes + despues)
+
+
+def consultar_entradas_periodo(cursor, fecha_inicio, fecha_fin):
+    return cursor.execute(SQL_ENTRADAS_PERIODO, (fecha_inicio, fin_del_dia(fecha_fin)))
+
+
+def consultar_salidas_periodo(cursor, fecha_inicio, fecha_fin):
+    return cursor.execute(SQL_SALIDAS_PERIODO, (fecha_inicio, fin_del_dia(fecha_fin)))
+
+
+def consultar_comparacion_productos(cursor, codigo_seleccionado, cantidad=4, desde=None):
+    """Filas (codigo, descripcion, entradas, salidas, es_seleccionado, total_movimientos).
+
+    Con desde (fecha 'YYYY-MM-DD') solo cuentan los movimientos a partir de ese día.
+    """
+    if desde is None:
+        return cursor.execute(SQL_COMPARACION_PRODUCTOS, (codigo_seleccionado, cantidad))
+    return cursor.execute(SQL_COMPARACION_PRODUCTOS_VENTANA, (codigo_seleccionado, cantidad, str(desde)))
+
+
+def consultar_historial_movimientos(cursor, condicion, params):
+    return cursor.execute(SQL_HISTORIAL_MOVIMIENTOS.format(condicion=condicion), params)
+
+
+def consultar_observaciones(cursor, codigo):
+    return cursor.execute(SQL_OBSERVACIONES, (codigo, codigo))
+
+
+def consultar_longitudes(cursor):
+    """Longitudes máximas de código y descripción, para fijar anchos de columna antes de escribir"""
+    codigo, descripcion = cursor.execute(
+        "SELECT COALESCE(MAX(LENGTH(codigo)), 0), COALESCE(MAX(LENGTH(descripcion)), 0) FROM productos"
+    ).fetchone()
+    return {'codigo': codigo, 'descripcion': descripcion}
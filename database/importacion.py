@@ -0,0 +1,171 @@
+"""Importación masiva de entradas o salidas desde CSV o XLSX.
+
+El archivo se lee fila por fila; cada fila se valida contra los productos
+cargados una sola vez en memoria y las válidas se insertan con
+movimientos.registrar_lote, todo en la transacción del llamador. Las filas
+rechazadas se devuelven con el número de línea y el motivo.
+"""
+import csv
+import os
+import unicodedata
+from datetime import datetime, date
+from database import movimientos, repositorio
+
+# Nombres de columna aceptados (sin tildes ni mayúsculas)
+COLUMNAS = {
+    "codigo": ("codigo", "cod", "code", "referencia"),
+    "cantidad": ("cantidad", "cant", "qty", "unidades"),
+    "fecha": ("fecha", "date"),
+}
+FORMATOS_FECHA = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")  # Además de ISO
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto or "")).encode("ascii", "ignore").decode()
+    return texto.strip().lower()
+
+
+def _filas_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8-sig") as f:
+        muestra = f.read(4096)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        yield from csv.reader(f, dialecto)
+
+
+def _filas_xlsx(ruta):
+    from openpyxl import load_workbook  # Solo se necesita para archivos Excel
+
+    wb = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def leer_filas(ruta):
+    """Devuelve (línea, {'codigo', 'cantidad', 'fecha'}) por cada fila de datos del archivo.
+
+    Si el encabezado no trae nombres conocidos se asume el orden código,
+    cantidad, fecha y la primera fila se trata como dato.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        filas = _filas_xlsx(ruta)
+    elif extension in (".csv", ".txt"):
+        filas = _filas_csv(ruta)
+    else:
+        raise ValueError(f"Formato de archivo no soportado: {extension}")
+
+    primera = next(filas, None)
+    if primera is None:
+        return
+    encabezado = [_normalizar(valor) for valor in primera]
+    posiciones = {}
+    for campo, alias in COLUMNAS.items():
+        posiciones[campo] = next((i for i, nombre in enumerate(encabezado) if nombre in alias), None)
+
+    if posiciones["codigo"] is None or posiciones["cantidad"] is None:
+        posiciones = {"codigo": 0, "cantidad": 1, "fecha": 2}
+        filas_datos = ((1, primera),)
+    else:
+        filas_datos = ()
+
+    def registro(valores):
+        return {campo: (valores[i] if i is not None and i < len(valores) else None)
+                for campo, i in posiciones.items()}
+
+    for linea, valores in filas_datos:
+        yield linea, registro(valores)
+    for linea, valores in enumerate(filas, 2):
+        if not any(v not in (None, "") for v in valores):
+            continue  # Fila vacía
+        yield linea, registro(valores)
+
+
+def _fecha(valor, por_defecto):
+    if valor in (None, ""):
+        return por_defecto
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(valor, date):
+        return valor.strftime("%Y-%m-%d 00:00:00")
+    texto = str(valor).strip()
+    try:
+        # Camino rápido para el formato ISO, el más común en los archivos exportados
+        return datetime.fromisoformat(texto).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        pass
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto, formato).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
+    raise ValueError(f"fecha no válida: {texto}")
+
+
+def _cantidad(valor):
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    try:
+        cantidad = int(str(valor).strip())
+    except ValueError:
+        raise ValueError(f"cantidad no válida: {valor}") from None
+    if cantidad <= 0:
+        raise ValueError("la cantidad debe ser mayor que 0")
+    return cantidad
+
+
+def importar_movimientos(conn, tabla, ruta, fecha_por_defecto=None):
+    """Importa el archivo en la tabla indicada dentro de la transacción de conn.
+
+    Devuelve (importadas, rechazadas) donde rechazadas es una lista de
+    (línea, motivo, fila original). Las salidas que dejarían el stock
+    negativo se rechazan, teniendo en cuenta las filas anteriores del archivo.
+    """
+    if tabla not in movimientos.TABLAS:
+        raise ValueError(f"Tabla de movimientos no válida: {tabla}")
+    fecha_por_defecto = fecha_por_defecto or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    cursor = conn.cursor()
+
+    # Productos cargados una sola vez: codigo -> [descripcion, stock]
+    productos = {p.codigo: [p.descripcion, p.stock] for p in repositorio.iterar_productos(cursor)}
+    rechazadas = []
+
+    def validas():
+        for linea, fila in leer_filas(ruta):
+            codigo = str(fila["codigo"] or "").strip()
+            producto = productos.get(codigo)
+            if producto is None:
+                rechazadas.append((linea, "código no existe", fila))
+                continue
+            try:
+                cantidad = _cantidad(fila["cantidad"])
+                fecha = _fecha(fila["fecha"], fecha_por_defecto)
+            except ValueError as e:
+                rechazadas.append((linea, str(e), fila))
+                continue
+            if tabla == "salidas":
+                if producto[1] < cantidad:
+                    rechazadas.append((linea, f"stock insuficiente ({producto[1]})", fila))
+                    continue
+                producto[1] -= cantidad
+            else:
+                producto[1] += cantidad
+            yield codigo, producto[0], cantidad, fecha
+
+    importadas = movimientos.registrar_lote(cursor, tabla, validas())
+    return importadas, rechazadas
+
+
+def guardar_rechazos(rechazadas, ruta):
+    """Escribe las filas rechazadas en un CSV para corregirlas y volver a importarlas"""
+    with open(ruta, "w", newline="", encoding="utf-8-sig") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["linea", "motivo", "codigo", "cantidad", "fecha"])
+        for linea, motivo, fila in rechazadas:
+            escritor.writerow([linea, motivo, fila["codigo"], fila["cantidad"], fila["fecha"]])
+    return ruta
@@ -0,0 +1,276 @@
+"""Instrumentación de consultas: latencia por sentencia y registro de consultas lentas.
+
+Se activa con `python main.py --diagnostico` o con INVENTARIO_DIAGNOSTICO=1:
+main.py y inventario/__main__.py consultan solicitado() y llaman a activar()
+antes de abrir la primera conexión. Desactivada no cambia nada, porque el
+pool abre conexiones sqlite3 normales. Activa, las conexiones usan
+ConexionInstrumentada:
+
+- cada cursor mide el tiempo que pasa dentro de SQLite (execute más cada
+  fetch) y cuenta las filas leídas; la medición se cierra cuando el cursor
+  se agota, ejecuta otra sentencia, se cierra o se libera;
+- set_trace_callback cuenta el control de transacciones (BEGIN/COMMIT
+  implícitos de sqlite3 y conn.commit(), que no pasan por un cursor) y las
+  sentencias de triggers; el resto de lo que traza ya lo miden los cursores;
+- las sentencias más lentas que UMBRAL_LENTA_MS se guardan con su EXPLAIN
+  QUERY PLAN y se imprimen en consola.
+
+Las estadísticas se ven en la pestaña Diagnóstico y se pueden volcar a JSON.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+ACTIVO = False
+UMBRAL_LENTA_MS = float(os.environ.get("INVENTARIO_CONSULTA_LENTA_MS", 100))
+LIMITES_HISTOGRAMA_MS = (1, 5, 20, 100, 500)  # El último tramo es ">= 500 ms"
+MAX_LENTAS = 200
+
+_lock = threading.Lock()
+_sentencias = {}  # sql normalizado -> EstadisticaSentencia
+_lentas = deque(maxlen=MAX_LENTAS)
+_trazadas = {}  # BEGIN, COMMIT, ..., TRIGGER -> veces
+TRAZADAS = {"BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE", "TRIGGER"}
+
+
+def solicitado(argv=()):
+    """True si argv tiene --diagnostico o si INVENTARIO_DIAGNOSTICO está definida"""
+    return "--diagnostico" in argv or bool(os.environ.get("INVENTARIO_DIAGNOSTICO"))
+
+
+def activar(umbral_ms=None):
+    """Activa la instrumentación para las conexiones que se abran desde ahora"""
+    global ACTIVO, UMBRAL_LENTA_MS
+    ACTIVO = True
+    if umbral_ms is not None:
+        UMBRAL_LENTA_MS = umbral_ms
+
+
+def normalizar(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+class EstadisticaSentencia:
+    __slots__ = ("sql", "ejecuciones", "total_ms", "max_ms", "filas", "histograma")
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.ejecuciones = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.filas = 0
+        self.histograma = [0] * (len(LIMITES_HISTOGRAMA_MS) + 1)
+
+    def agregar(self, ms, filas):
+        self.ejecuciones += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.filas += filas
+        tramo = next((i for i, limite in enumerate(LIMITES_HISTOGRAMA_MS) if ms < limite),
+                     len(LIMITES_HISTOGRAMA_MS))
+        self.histograma[tramo] += 1
+
+    def como_dict(self):
+        return {
+            "sql": self.sql,
+            "ejecuciones": self.ejecuciones,
+            "total_ms": round(self.total_ms, 3),
+            "promedio_ms": round(self.total_ms / self.ejecuciones, 3) if self.ejecuciones else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "filas": self.filas,
+            "histograma": dict(zip(nombres_tramos(), self.histograma)),
+        }
+
+
+def nombres_tramos():
+    anteriores = (0,) + LIMITES_HISTOGRAMA_MS
+    return [f"<{limite} ms" if i == 0 else f"{anteriores[i]}-{limite} ms"
+            for i, limite in enumerate(LIMITES_HISTOGRAMA_MS)] + [f">={LIMITES_HISTOGRAMA_MS[-1]} ms"]
+
+
+def _plan(conn, sql, params):
+    # Cursor sqlite3 normal: el EXPLAIN no debe medirse a sí mismo
+    try:
+        cursor = sqlite3.Cursor(conn)
+        return [fila[3] for fila in cursor.execute("EXPLAIN QUERY PLAN " + sql, params)]
+    except (sqlite3.Error, ValueError, TypeError):
+        return []
+
+
+def registrar(conn, sql, params, ms, filas):
+    clave = normalizar(sql)
+    with _lock:
+        estadistica = _sentencias.get(clave)
+        if estadistica is None:
+            estadistica = _sentencias[clave] = EstadisticaSentencia(clave)
+        estadistica.agregar(ms, filas)
+    if ms < UMBRAL_LENTA_MS:
+        return
+
+    plan = _plan(conn, sql, params) if params is not None else []
+    with _lock:
+        _lentas.append({
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "ms": round(ms, 1),
+            "filas": filas,
+            "hilo": threading.current_thread().name,
+            "sql": clave,
+            "parametros": repr(params)[:300],
+            "plan": plan,
+        })
+    print(f"[consulta lenta] {ms:.0f} ms, {filas} filas: {clave[:200]}")
+    for paso in plan:
+        print(f"    {paso}")
+
+
+def _trazar(sql):
+    palabra = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    if palabra.startswith("--"):
+        palabra = "TRIGGER"  # SQLite antepone '-- TRIGGER nombre' a las sentencias de triggers
+    if palabra not in TRAZADAS:
+        return  # Pasó por un cursor y ya está en las estadísticas de sentencias
+    with _lock:
+        _trazadas[palabra] = _trazadas.get(palabra, 0) + 1
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """Cursor que acumula el tiempo de execute y de cada fetch de su sentencia"""
+
+    def __init__(self, conn):
+        super().__init__(conn)
+        self._sql = None
+        self._params = None
+        self._ms = 0.0
+        self._filas = 0
+
+    def _cerrar_medicion(self):
+        if self._sql is not None:
+            sql, self._sql = self._sql, None
+            registrar(self.connection, sql, self._params, self._ms, self._filas)
+
+    def _medir(self, funcion, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args)
+        finally:
+            self._ms += (time.perf_counter() - inicio) * 1000
+
+    def execute(self, sql, parameters=()):
+        self._cerrar_medicion()
+        self._sql, self._params, self._ms, self._filas = sql, parameters, 0.0, 0
+        self._medir(super().execute, sql, parameters)
+        if self.description is None:
+            self._filas = max(self.rowcount, 0)
+            self._cerrar_medicion()  # Sin filas que leer: la sentencia ya terminó
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._cerrar_medicion()
+        self._sql, self._params, self._ms, self._filas = sql, None, 0.0, 0
+        self._medir(super().executemany, sql, seq_of_parameters)
+        self._filas = max(self.rowcount, 0)
+        self._cerrar_medicion()
+        return self
+
+    def executescript(self, script):
+        self._cerrar_medicion()
+        self._sql, self._params, self._ms, self._filas = script, None, 0.0, 0
+        self._medir(super().executescript, script)
+        self._cerrar_medicion()
+        return self
+
+    def fetchone(self):
+        fila = self._medir(super().fetchone)
+        if fila is None:
+            self._cerrar_medicion()
+        else:
+            self._filas += 1
+        return fila
+
+    def fetchmany(self, size=None):
+        filas = self._medir(super().fetchmany, self.arraysize if size is None else size)
+        self._filas += len(filas)
+        if not filas:
+            self._cerrar_medicion()
+        return filas
+
+    def fetchall(self):
+        filas = self._medir(super().fetchall)
+        self._filas += len(filas)
+        self._cerrar_medicion()
+        return filas
+
+    def __next__(self):
+        try:
+            fila = self._medir(super().__next__)
+        except StopIteration:
+            self._cerrar_medicion()
+            raise
+        self._filas += 1
+        return fila
+
+    def close(self):
+        self._cerrar_medicion()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._cerrar_medicion()
+        except Exception:
+            pass  # La conexión pudo cerrarse antes que el cursor
+
+
+class ConexionInstrumentada(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_trazar)
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    # Connection.execute de sqlite3 no pasa por cursor(), así que se redefine
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+
+def estadisticas():
+    """Sentencias ordenadas por tiempo total, consultas lentas y control de transacciones y triggers"""
+    with _lock:
+        sentencias = sorted((e.como_dict() for e in _sentencias.values()),
+                            key=lambda e: e["total_ms"], reverse=True)
+        return {
+            "umbral_lenta_ms": UMBRAL_LENTA_MS,
+            "sentencias": sentencias,
+            "lentas": list(_lentas),
+            "trazadas": dict(_trazadas),
+        }
+
+
+def reiniciar():
+    with _lock:
+        _sentencias.clear()
+        _lentas.clear()
+        _trazadas.clear()
+
+
+def volcar(ruta=None):
+    """Guarda las estadísticas en JSON; devuelve la ruta"""
+    if ruta is None:
+        os.makedirs("src/diagnostico", exist_ok=True)
+        ruta = os.path.join("src/diagnostico", f"consultas_{datetime.now():%Y%m%d_%H%M%S}.json")
+    datos = estadisticas()
+    datos["fecha"] = datetime.now().isoformat(timespec="seconds")
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+    return ruta
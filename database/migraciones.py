@@ -0,0 +1,116 @@
+"""Migraciones versionadas del esquema.
+
+La versión aplicada se guarda en PRAGMA user_version. Cada migración es una
+tupla (versión, descripción, pasos), donde cada paso es una sentencia SQL o
+una función que recibe el cursor.
+"""
+import sqlite3
+from database.stock_diario import crear_stock_diario
+from database.version_datos import crear_version_datos, crear_id_base
+from database.movimientos_mensuales import crear_movimientos_mensuales
+from database.catalogo_reportes import crear_catalogo_reportes
+from database.movimientos import crear_total_movimientos
+from database.analisis_producto import crear_version_analisis
+
+
+def _crear_indice_busqueda(cursor):
+    # Índice de trigramas sobre código y descripción, sincronizado por triggers
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+                codigo, descripcion,
+                content='productos', content_rowid='rowid',
+                tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError:
+        return  # SQLite sin FTS5 o sin trigramas: la búsqueda usa LIKE
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_ai AFTER INSERT ON productos BEGIN
+            INSERT INTO productos_fts (rowid, codigo, descripcion)
+            VALUES (new.rowid, new.codigo, new.descripcion);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_ad AFTER DELETE ON productos BEGIN
+            INSERT INTO productos_fts (productos_fts, rowid, codigo, descripcion)
+            VALUES ('delete', old.rowid, old.codigo, old.descripcion);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS productos_fts_au AFTER UPDATE OF codigo, descripcion ON productos BEGIN
+            INSERT INTO productos_fts (productos_fts, rowid, codigo, descripcion)
+            VALUES ('delete', old.rowid, old.codigo, old.descripcion);
+            INSERT INTO productos_fts (rowid, codigo, descripcion)
+            VALUES (new.rowid, new.codigo, new.descripcion);
+        END
+    """)
+    cursor.execute("INSERT INTO productos_fts (productos_fts) VALUES ('rebuild')")
+
+
+MIGRACIONES = [
+    (1, "Índices para búsquedas por código y fecha", [
+        "CREATE INDEX IF NOT EXISTS idx_entradas_codigo_fecha ON entradas (codigo, fecha)",
+        "CREATE INDEX IF NOT EXISTS idx_entradas_fecha ON entradas (fecha)",
+        "CREATE INDEX IF NOT EXISTS idx_salidas_codigo_fecha ON salidas (codigo, fecha)",
+        "CREATE INDEX IF NOT EXISTS idx_salidas_fecha ON salidas (fecha)",
+        # NOCASE permite que LIKE 'texto%' use el índice
+        "CREATE INDEX IF NOT EXISTS idx_productos_descripcion ON productos (descripcion COLLATE NOCASE)",
+    ]),
+    (2, "Índice de búsqueda de productos (FTS5)", [
+        _crear_indice_busqueda,
+    ]),
+    (3, "Foto diaria del stock para la gráfica de evolución", [
+        crear_stock_diario,
+    ]),
+    (4, "Contador de versión de los datos para la caché de reportes", [
+        crear_version_datos,
+    ]),
+    (5, "Resumen mensual de movimientos para los reportes de varios meses", [
+        crear_movimientos_mensuales,
+    ]),
+    (6, "Catálogo de reportes con id, índices, tamaño y checksum", [
+        crear_catalogo_reportes,
+    ]),
+    (7, "Total de movimientos por producto, indexado para la comparación", [
+        crear_total_movimientos,
+    ]),
+    (8, "Identificador de la base para la caché de reportes", [
+        crear_id_base,
+    ]),
+    (9, "Versión por producto para la memoria del análisis del historial", [
+        crear_version_analisis,
+    ]),
+]
+
+
+def version_actual(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migraciones(conn, hasta=None):
+    """Aplica en orden las migraciones pendientes, cada una en su propia transacción"""
+    version = version_actual(conn)
+    cursor = conn.cursor()
+
+    for numero, descripcion, pasos in MIGRACIONES:
+        if numero <= version or (hasta is not None and numero > hasta):
+            continue
+
+        cursor.execute("BEGIN")
+        try:
+            for paso in pasos:
+                if callable(paso):
+                    paso(cursor)
+                else:
+                    cursor.execute(paso)
+            cursor.execute(f"PRAGMA user_version = {numero}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+        version = numero
+
+    return version
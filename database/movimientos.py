@@ -0,0 +1,230 @@
+"""Registro de entradas y salidas con sus totales derivados.
+
+Toda escritura sobre entradas o salidas pasa por este módulo, que aplica en
+el mismo cursor (y por lo tanto en la misma transacción del llamador) los
+cambios en las columnas derivadas de productos, en stock_diario y en
+movimientos_mensuales:
+
+    entradas_totales, salidas_totales, stock,
+    total_movimientos = entradas_totales + salidas_totales,
+    version_analisis = versión de los datos al escribir (ver database/analisis_producto.py),
+    valor_total = stock * precio_compra,
+    utilidad = salidas_totales * precio_venta - entradas_totales * precio_compra
+
+Los movimientos de un lote se agregan por producto antes de tocar productos,
+así que cada producto se actualiza una sola vez por lote.
+"""
+from collections import defaultdict
+from itertools import islice
+from database import stock_diario, movimientos_mensuales
+
+TABLAS = ("entradas", "salidas")
+
+SQL_APLICAR_ENTRADAS = """
+    UPDATE productos
+    SET entradas_totales = entradas_totales + ?1,
+        total_movimientos = total_movimientos + ?1,
+        version_analisis = (SELECT version FROM version_datos WHERE id = 1),
+        stock = stock + ?1,
+        valor_total = (stock + ?1) * COALESCE(precio_compra, 0),
+        utilidad = salidas_totales * COALESCE(precio_venta, 0)
+                   - (entradas_totales + ?1) * COALESCE(precio_compra, 0)
+    WHERE codigo = ?2
+"""
+
+SQL_APLICAR_SALIDAS = """
+    UPDATE productos
+    SET salidas_totales = salidas_totales + ?1,
+        total_movimientos = total_movimientos + ?1,
+        version_analisis = (SELECT version FROM version_datos WHERE id = 1),
+        stock = stock - ?1,
+        valor_total = (stock - ?1) * COALESCE(precio_compra, 0),
+        utilidad = (salidas_totales + ?1) * COALESCE(precio_venta, 0)
+                   - entradas_totales * COALESCE(precio_compra, 0)
+    WHERE codigo = ?2
+"""
+
+# Totales calculados desde los movimientos; lo usan la reconstrucción y la auditoría
+SQL_TOTALES_CALCULADOS = """
+    WITH e AS (
+        SELECT codigo, SUM(cantidad) as cantidad FROM entradas GROUP BY codigo
+    ),
+    s AS (
+        SELECT codigo, SUM(cantidad) as cantidad FROM salidas GROUP BY codigo
+    )
+    SELECT
+        p.codigo,
+        COALESCE(e.cantidad, 0) as entradas,
+        COALESCE(s.cantidad, 0) as salidas,
+        COALESCE(e.cantidad, 0) - COALESCE(s.cantidad, 0) as stock,
+        COALESCE(e.cantidad, 0) + COALESCE(s.cantidad, 0) as total_movimientos,
+        (COALESCE(e.cantidad, 0) - COALESCE(s.cantidad, 0)) * COALESCE(p.precio_compra, 0) as valor_total,
+        COALESCE(s.cantidad, 0) * COALESCE(p.precio_venta, 0)
+        - COALESCE(e.cantidad, 0) * COALESCE(p.precio_compra, 0) as utilidad
+    FROM productos p
+    LEFT JOIN e ON e.codigo = p.codigo
+    LEFT JOIN s ON s.codigo = p.codigo
+"""
+
+
+def crear_total_movimientos(cursor):
+    """Agrega productos.total_movimientos con su índice; el ranking de la comparación lo lee en orden"""
+    columnas = [fila[1] for fila in cursor.execute("PRAGMA table_info(productos)")]
+    if "total_movimientos" not in columnas:
+        cursor.execute("ALTER TABLE productos ADD COLUMN total_movimientos INTEGER DEFAULT 0")
+    cursor.execute("""
+        UPDATE productos
+        SET total_movimientos = COALESCE(entradas_totales, 0) + COALESCE(salidas_totales, 0)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_productos_total_movimientos ON productos (total_movimientos)")
+
+
+def _validar_tabla(tabla):
+    if tabla not in TABLAS:
+        raise ValueError(f"Tabla de movimientos no válida: {tabla}")
+
+
+def aplicar_deltas(cursor, tabla, movimientos):
+    """Aplica movimientos (codigo, fecha, delta_cantidad) de una tabla a productos y a los resúmenes"""
+    _validar_tabla(tabla)
+    movimientos = list(movimientos)
+    por_codigo = defaultdict(int)
+    for codigo, _, delta in movimientos:
+        por_codigo[codigo] += delta
+
+    sql = SQL_APLICAR_ENTRADAS if tabla == "entradas" else SQL_APLICAR_SALIDAS
+    # También con delta 0: un movimiento de cantidad 0 cambia la serie y las observaciones
+    cursor.executemany(sql, [(delta, codigo) for codigo, delta in por_codigo.items()])
+
+    signo = 1 if tabla == "entradas" else -1
+    stock_diario.aplicar_deltas(cursor, [(codigo, fecha, signo * delta) for codigo, fecha, delta in movimientos])
+    movimientos_mensuales.aplicar_deltas(cursor, tabla, movimientos)
+
+
+def registrar(cursor, tabla, codigo, descripcion, cantidad, fecha):
+    """Inserta un movimiento y actualiza los totales; devuelve el id nuevo"""
+    _validar_tabla(tabla)
+    cursor.execute(f"""
+        INSERT INTO {tabla} (codigo, descripcion, cantidad, fecha)
+        VALUES (?, ?, ?, ?)
+    """, (codigo, descripcion, cantidad, fecha))
+    nuevo_id = cursor.lastrowid
+    aplicar_deltas(cursor, tabla, [(codigo, fecha, cantidad)])
+    return nuevo_id
+
+
+def registrar_lote(cursor, tabla, filas, tamano_bloque=5000):
+    """Inserta muchos movimientos (codigo, descripcion, cantidad, fecha); devuelve cuántos.
+
+    filas puede ser un generador: se inserta con executemany por bloques y los
+    totales se aplican una sola vez al final, agregados por producto y día.
+    """
+    _validar_tabla(tabla)
+    sql = f"""
+        INSERT INTO {tabla} (codigo, descripcion, cantidad, fecha)
+        VALUES (?, ?, ?, ?)
+    """
+    deltas = defaultdict(int)
+    total = 0
+    filas = iter(filas)
+    while True:
+        bloque = list(islice(filas, tamano_bloque))
+        if not bloque:
+            break
+        cursor.executemany(sql, bloque)
+        for codigo, _, cantidad, fecha in bloque:
+            deltas[(codigo, fecha[:10])] += cantidad
+        total += len(bloque)
+
+    aplicar_deltas(cursor, tabla, [(codigo, dia, delta) for (codigo, dia), delta in deltas.items()])
+    return total
+
+
+def modificar_cantidad(cursor, tabla, id_movimiento, nueva_cantidad):
+    """Cambia la cantidad de un movimiento; devuelve la diferencia aplicada o None si no existe"""
+    _validar_tabla(tabla)
+    fila = cursor.execute(f"SELECT codigo, cantidad, fecha FROM {tabla} WHERE id = ?",
+                          (id_movimiento,)).fetchone()
+    if fila is None:
+        return None
+    codigo, cantidad, fecha = fila
+    cursor.execute(f"UPDATE {tabla} SET cantidad = ? WHERE id = ?", (nueva_cantidad, id_movimiento))
+    diferencia = nueva_cantidad - cantidad
+    aplicar_deltas(cursor, tabla, [(codigo, fecha, diferencia)])
+    return diferencia
+
+
+def eliminar(cursor, tabla, id_movimiento):
+    """Borra un movimiento y descuenta su cantidad de los totales; devuelve False si no existe"""
+    _validar_tabla(tabla)
+    fila = cursor.execute(f"SELECT codigo, cantidad, fecha FROM {tabla} WHERE id = ?",
+                          (id_movimiento,)).fetchone()
+    if fila is None:
+        return False
+    codigo, cantidad, fecha = fila
+    cursor.execute(f"DELETE FROM {tabla} WHERE id = ?", (id_movimiento,))
+    aplicar_deltas(cursor, tabla, [(codigo, fecha, -cantidad)])
+    return True
+
+
+def actualizar_producto(cursor, codigo, descripcion, precio_compra, precio_venta):
+    """Cambia descripción y precios recalculando valor_total y utilidad; devuelve False si no existe"""
+    cursor.execute("""
+        UPDATE productos
+        SET descripcion = ?1,
+            precio_compra = ?2,
+            precio_venta = ?3,
+            valor_total = stock * ?2,
+            utilidad = salidas_totales * ?3 - entradas_totales * ?2,
+            version_analisis = (SELECT version FROM version_datos WHERE id = 1)  -- Las observaciones usan los precios
+        WHERE codigo = ?4
+    """, (descripcion, precio_compra, precio_venta, codigo))
+    if cursor.rowcount == 0:
+        return False
+    # La descripción también se guarda en los movimientos
+    cursor.execute("UPDATE entradas SET descripcion = ? WHERE codigo = ?", (descripcion, codigo))
+    cursor.execute("UPDATE salidas SET descripcion = ? WHERE codigo = ?", (descripcion, codigo))
+    return True
+
+
+def auditar_totales(cursor):
+    """Devuelve los códigos cuyas columnas derivadas no coinciden con sus movimientos"""
+    return [fila[0] for fila in cursor.execute(f"""
+        WITH calculado AS ({SQL_TOTALES_CALCULADOS})
+        SELECT p.codigo
+        FROM productos p
+        JOIN calculado c ON c.codigo = p.codigo
+        WHERE p.entradas_totales IS NOT c.entradas
+           OR p.salidas_totales IS NOT c.salidas
+           OR p.stock IS NOT c.stock
+           OR p.total_movimientos IS NOT c.total_movimientos
+           OR abs(COALESCE(p.valor_total, 0) - c.valor_total) > 0.005
+           OR abs(COALESCE(p.utilidad, 0) - c.utilidad) > 0.005
+    """)]
+
+
+def reconstruir_totales(cursor, incluir_resumenes=True):
+    """Recalcula todas las columnas derivadas desde los movimientos en una sola pasada.
+
+    También cambia version_analisis de todos los productos: los movimientos
+    escritos sin pasar por este módulo no la habían cambiado.
+
+    Devuelve la cantidad de productos que estaban desincronizados.
+    """
+    desincronizados = len(auditar_totales(cursor))
+    cursor.execute(f"""
+        UPDATE productos
+        SET entradas_totales = c.entradas,
+            salidas_totales = c.salidas,
+            stock = c.stock,
+            total_movimientos = c.total_movimientos,
+            valor_total = c.valor_total,
+            utilidad = c.utilidad,
+            version_analisis = (SELECT version FROM version_datos WHERE id = 1)
+        FROM ({SQL_TOTALES_CALCULADOS}) as c
+        WHERE c.codigo = productos.codigo
+    """)
+    if incluir_resumenes:
+        stock_diario.crear_stock_diario(cursor)
+        movimientos_mensuales.crear_movimientos_mensuales(cursor)
+    return desincronizados
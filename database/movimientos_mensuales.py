@@ -0,0 +1,106 @@
+"""Resumen mensual de movimientos por producto (tabla movimientos_mensuales).
+
+Cada fila guarda las cantidades de entradas y salidas de un producto en un
+mes ('AAAA-MM'). Se mantiene de forma incremental desde database.movimientos
+y permite que un reporte de varios meses lea un registro por producto y mes
+en lugar de todos los movimientos; solo los meses incompletos de los
+extremos del período se leen de entradas y salidas.
+
+Los valores (compra, venta, utilidad) no se guardan: el reporte los calcula
+con el precio actual del producto, así que cambiarían con cada edición de
+precios.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+SQL_CREAR_MOVIMIENTOS_MENSUALES = """
+    CREATE TABLE IF NOT EXISTS movimientos_mensuales (
+        mes TEXT NOT NULL,
+        codigo TEXT NOT NULL,
+        entradas INTEGER NOT NULL DEFAULT 0,
+        salidas INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (mes, codigo)
+    ) WITHOUT ROWID
+"""
+
+SQL_RECONSTRUIR_MOVIMIENTOS_MENSUALES = """
+    INSERT INTO movimientos_mensuales (mes, codigo, entradas, salidas)
+    SELECT mes, codigo, SUM(entradas), SUM(salidas)
+    FROM (
+        SELECT substr(fecha, 1, 7) as mes, codigo, cantidad as entradas, 0 as salidas FROM entradas
+        UNION ALL
+        SELECT substr(fecha, 1, 7) as mes, codigo, 0 as entradas, cantidad as salidas FROM salidas
+    )
+    GROUP BY mes, codigo
+"""
+
+
+def crear_movimientos_mensuales(cursor):
+    cursor.execute(SQL_CREAR_MOVIMIENTOS_MENSUALES)
+    cursor.execute("DELETE FROM movimientos_mensuales")
+    cursor.execute(SQL_RECONSTRUIR_MOVIMIENTOS_MENSUALES)
+
+
+def hay_resumen_mensual(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movimientos_mensuales'"
+    ).fetchone() is not None
+
+
+def aplicar_deltas(cursor, tabla, movimientos):
+    """Suma movimientos (codigo, fecha, delta) de entradas o salidas a su mes"""
+    deltas = defaultdict(int)
+    for codigo, fecha, delta in movimientos:
+        deltas[(fecha[:7], codigo)] += delta
+
+    columna = "entradas" if tabla == "entradas" else "salidas"
+    cursor.executemany(f"""
+        INSERT INTO movimientos_mensuales (mes, codigo, {columna}) VALUES (?, ?, ?)
+        ON CONFLICT (mes, codigo) DO UPDATE SET {columna} = {columna} + excluded.{columna}
+    """, [(mes, codigo, delta) for (mes, codigo), delta in deltas.items() if delta])
+
+
+def _texto(fecha):
+    if isinstance(fecha, datetime):
+        return fecha.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(fecha, date):
+        return fecha.strftime("%Y-%m-%d")
+    return str(fecha)
+
+
+def _primer_dia(mes):
+    return date(int(mes[:4]), int(mes[5:7]), 1)
+
+
+def _mes_siguiente(dia):
+    return (dia.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def dividir_periodo(fecha_inicio, fecha_fin):
+    """Separa [fecha_inicio, fecha_fin] en meses completos y extremos sueltos.
+
+    fecha_fin ya debe incluir la hora de cierre (ver consultas.fin_del_dia).
+    Devuelve (meses, antes, despues): meses es ('AAAA-MM', 'AAAA-MM') con el
+    primer y último mes completo, antes es (desde, hasta) con hasta excluido
+    y despues es (desde, hasta) con hasta incluido; cualquiera puede ser None.
+    Todo es texto comparable con la columna fecha.
+    """
+    inicio, fin = _texto(fecha_inicio), _texto(fecha_fin)
+    # Primer mes completo: el del inicio solo si este cae el día 1 a las 00:00
+    primero = inicio[:7]
+    if inicio not in (f"{primero}-01", f"{primero}-01 00:00:00"):
+        primero = _mes_siguiente(_primer_dia(primero)).strftime("%Y-%m")
+    # Último mes completo: el del fin solo si este llega al último segundo del mes
+    ultimo = fin[:7]
+    ultimo_dia = _mes_siguiente(_primer_dia(ultimo)) - timedelta(days=1)
+    if fin < f"{ultimo_dia:%Y-%m-%d} 23:59:59":
+        ultimo = (_primer_dia(ultimo) - timedelta(days=1)).strftime("%Y-%m")
+
+    if primero > ultimo:
+        return None, None, (inicio, fin)
+
+    desde_meses = f"{primero}-01"
+    hasta_meses = f"{_mes_siguiente(_primer_dia(ultimo)):%Y-%m-%d}"
+    antes = (inicio, desde_meses) if inicio < desde_meses else None
+    despues = (hasta_meses, fin) if fin >= hasta_meses else None
+    return (primero, ultimo), antes, despues
@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from database import instrumentacion
+
+
+class PoolConexiones:
+    """Mantiene por hilo un pequeño grupo de conexiones SQLite ya abiertas"""
+
+    def __init__(self, db_file, tamano=4, cache_kb=20000, mmap_bytes=256 * 1024 * 1024):
+        self.db_file = db_file
+        self.tamano = tamano
+        self.cache_kb = cache_kb
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        # Contadores
+        self.checkouts = 0
+        self.conexiones_creadas = 0
+        self.tiempo_espera = 0.0
+
+    def _libres(self):
+        # Cada hilo tiene su propia lista: sqlite3 no comparte conexiones entre hilos
+        libres = getattr(self._local, 'libres', None)
+        if libres is None:
+            libres = self._local.libres = []
+        return libres
+
+    def _abrir(self):
+        # Con --diagnostico cada sentencia se mide (ver database/instrumentacion.py)
+        fabrica = instrumentacion.ConexionInstrumentada if instrumentacion.ACTIVO else sqlite3.Connection
+        conn = sqlite3.connect(self.db_file, factory=fabrica)
+        conn.row_factory = sqlite3.Row  # Esto permite acceder a los resultados como diccionarios
+
+        # Los pragmas se aplican una sola vez, al abrir la conexión
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_kb)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_bytes)}")
+
+        with self._lock:
+            self.conexiones_creadas += 1
+        return conn
+
+    def obtener(self):
+        inicio = time.perf_counter()
+        libres = self._libres()
+        conn = libres.pop() if libres else self._abrir()
+        espera = time.perf_counter() - inicio
+
+        with self._lock:
+            self.checkouts += 1
+            self.tiempo_espera += espera
+        return conn
+
+    def devolver(self, conn):
+        # Una transacción olvidada no debe pasar al siguiente uso
+        if conn.in_transaction:
+            conn.rollback()
+
+        libres = self._libres()
+        if len(libres) < self.tamano:
+            libres.append(conn)
+        else:
+            conn.close()
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión; confirma al salir o revierte si hubo una excepción"""
+        conn = self.obtener()
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self.devolver(conn)
+
+    def cerrar(self):
+        """Cierra las conexiones libres del hilo actual"""
+        libres = self._libres()
+        while libres:
+            libres.pop().close()
+
+    def estadisticas(self):
+        with self._lock:
+            checkouts = self.checkouts
+            tiempo_espera = self.tiempo_espera
+            creadas = self.conexiones_creadas
+        return {
+            'checkouts': checkouts,
+            'conexiones_creadas': creadas,
+            'tiempo_espera_total_ms': tiempo_espera * 1000,
+            'tiempo_espera_promedio_ms': (tiempo_espera / checkouts * 1000) if checkouts else 0.0,
+        }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def obtener_pool(db_file):
+    """Devuelve el pool compartido para un archivo de base de datos"""
+    clave = str(db_file)
+    with _pools_lock:
+        pool = _pools.get(clave)
+        if pool is None:
+            pool = _pools[clave] = PoolConexiones(db_file)
+        return pool
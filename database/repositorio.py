@@ -0,0 +1,168 @@
+"""Lectura y escritura de productos y movimientos como registros de models/.
+
+Las vistas, los modelos de tabla, la importación y el generador de reportes
+leen por aquí en lugar de repetir cada uno su SELECT. Las lecturas por
+código o id van en lotes de TAMANO_LOTE con IN (...); los recorridos largos
+usan fetchmany. Las escrituras de movimientos pasan por database.movimientos,
+que mantiene los totales derivados en la misma transacción.
+"""
+from itertools import islice
+from database import movimientos
+from models.producto import Producto
+from models.entrada import Entrada
+from models.salida import Salida
+
+TAMANO_LOTE = 500  # Variables por IN (...), por debajo del límite de SQLite
+
+REGISTROS = {"entradas": Entrada, "salidas": Salida}
+COLUMNAS_PRODUCTO = ", ".join(Producto._fields)
+COLUMNAS_MOVIMIENTO = ", ".join(Entrada._fields)
+
+
+def _registro(tabla):
+    registro = REGISTROS.get(tabla)
+    if registro is None:
+        raise ValueError(f"Tabla de movimientos no válida: {tabla}")
+    return registro
+
+
+def _lotes(valores, tamano):
+    valores = iter(valores)
+    while True:
+        lote = list(islice(valores, tamano))
+        if not lote:
+            break
+        yield lote
+
+
+# --- Productos ---
+
+def obtener_producto(cursor, codigo):
+    """Devuelve el Producto o None si el código no existe"""
+    fila = cursor.execute(f"SELECT {COLUMNAS_PRODUCTO} FROM productos WHERE codigo = ?", (codigo,)).fetchone()
+    return Producto._make(fila) if fila is not None else None
+
+
+def obtener_productos(cursor, codigos):
+    """Devuelve {codigo: Producto} de los códigos que existen"""
+    productos = {}
+    for lote in _lotes(dict.fromkeys(codigos), TAMANO_LOTE):
+        marcadores = ", ".join("?" * len(lote))
+        for fila in cursor.execute(f"SELECT {COLUMNAS_PRODUCTO} FROM productos WHERE codigo IN ({marcadores})",
+                                   lote):
+            productos[fila[0]] = Producto._make(fila)
+    return productos
+
+
+def iterar_productos(cursor, condicion="", params=(), tamano_lote=TAMANO_LOTE):
+    """Recorre los productos en orden de rowid; condicion es SQL sobre la tabla productos"""
+    where = f"WHERE {condicion}" if condicion else ""
+    cursor.execute(f"SELECT {COLUMNAS_PRODUCTO} FROM productos {where} ORDER BY rowid", params)
+    while True:
+        filas = cursor.fetchmany(tamano_lote)
+        if not filas:
+            break
+        yield from map(Producto._make, filas)
+
+
+def pagina_productos(cursor, limite, condicion="", params=(), despues_de=None, desplazamiento=0):
+    """Devuelve [(rowid, Producto)] en orden de rowid.
+
+    Con despues_de (un rowid) continúa desde ahí por el índice; si no, salta
+    desplazamiento filas.
+    """
+    condiciones = [f"({condicion})"] if condicion else []
+    params = tuple(params)
+    if despues_de is not None:
+        condiciones.append("rowid > ?")
+        params += (despues_de, limite)
+        limite_sql = "LIMIT ?"
+    else:
+        params += (limite, desplazamiento)
+        limite_sql = "LIMIT ? OFFSET ?"
+    where = "WHERE " + " AND ".join(condiciones) if condiciones else ""
+    return [(fila[0], Producto._make(fila[1:])) for fila in cursor.execute(f"""
+        SELECT rowid, {COLUMNAS_PRODUCTO}
+        FROM productos
+        {where}
+        ORDER BY rowid
+        {limite_sql}
+    """, params)]
+
+
+def insertar_productos(cursor, productos):
+    """Inserta productos nuevos; lanza sqlite3.IntegrityError si un código ya existe.
+
+    Los totales empiezan en 0: solo los cambian los movimientos.
+    """
+    cursor.executemany("""
+        INSERT INTO productos (
+            codigo, descripcion, precio_compra, precio_venta,
+            entradas_totales, salidas_totales, stock, valor_total
+        )
+        VALUES (?, ?, ?, ?, 0, 0, 0, 0)
+    """, [(p.codigo, p.descripcion, p.precio_compra, p.precio_venta) for p in productos])
+
+
+def actualizar_productos(cursor, productos):
+    """Cambia descripción y precios; devuelve los códigos que no existían"""
+    return [p.codigo for p in productos
+            if not movimientos.actualizar_producto(cursor, p.codigo, p.descripcion, p.precio_compra, p.precio_venta)]
+
+
+def eliminar_producto(cursor, codigo):
+    """Borra el producto; devuelve False si no existía"""
+    cursor.execute("DELETE FROM productos WHERE codigo = ?", (codigo,))
+    return cursor.rowcount > 0
+
+
+def contar_movimientos(cursor, codigo):
+    """Devuelve (cantidad de entradas, cantidad de salidas) del producto"""
+    return tuple(cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM entradas WHERE codigo = ?1),
+               (SELECT COUNT(*) FROM salidas WHERE codigo = ?1)
+    """, (codigo,)).fetchone())
+
+
+# --- Movimientos ---
+
+def pagina_movimientos(cursor, tabla, condicion="", params=(), limite=None):
+    """Entradas o Salidas en orden (fecha DESC, id DESC); condicion es SQL sobre la tabla"""
+    registro = _registro(tabla)
+    where = f"WHERE {condicion}" if condicion else ""
+    sql = f"""
+        SELECT {COLUMNAS_MOVIMIENTO}
+        FROM {tabla}
+        {where}
+        ORDER BY fecha DESC, id DESC
+    """
+    params = tuple(params)
+    if limite is not None:
+        sql += " LIMIT ?"
+        params += (limite,)
+    return [registro._make(fila) for fila in cursor.execute(sql, params)]
+
+
+def obtener_movimientos(cursor, tabla, ids):
+    """Devuelve {id: Entrada o Salida} de los ids que existen"""
+    registro = _registro(tabla)
+    resultado = {}
+    for lote in _lotes(dict.fromkeys(ids), TAMANO_LOTE):
+        marcadores = ", ".join("?" * len(lote))
+        for fila in cursor.execute(f"SELECT {COLUMNAS_MOVIMIENTO} FROM {tabla} WHERE id IN ({marcadores})", lote):
+            resultado[fila[0]] = registro._make(fila)
+    return resultado
+
+
+def insertar_movimientos(cursor, tabla, registros):
+    """Inserta Entradas o Salidas (se ignora su id) actualizando los totales; devuelve cuántas"""
+    _registro(tabla)
+    return movimientos.registrar_lote(
+        cursor, tabla, ((r.codigo, r.descripcion, r.cantidad, r.fecha) for r in registros))
+
+
+def actualizar_cantidades(cursor, tabla, cantidades):
+    """Aplica {id: nueva cantidad}; devuelve los ids que no existían"""
+    _registro(tabla)
+    return [id_movimiento for id_movimiento, cantidad in cantidades.items()
+            if movimientos.modificar_cantidad(cursor, tabla, id_movimiento, cantidad) is None]
@@ -0,0 +1,104 @@
+"""Foto diaria del stock por producto (tabla stock_diario).
+
+Cada fila guarda el stock al cierre de un día con movimientos. La tabla se
+mantiene de forma incremental: un movimiento suma su delta al día en que
+ocurrió y a todos los días posteriores del mismo producto.
+"""
+from collections import defaultdict
+from datetime import date
+
+SQL_CREAR_STOCK_DIARIO = """
+    CREATE TABLE IF NOT EXISTS stock_diario (
+        codigo TEXT NOT NULL,
+        fecha TEXT NOT NULL,
+        stock INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (codigo, fecha)
+    ) WITHOUT ROWID
+"""
+
+SQL_RECONSTRUIR_STOCK_DIARIO = """
+    INSERT INTO stock_diario (codigo, fecha, stock)
+    SELECT codigo, dia, SUM(delta) OVER (PARTITION BY codigo ORDER BY dia)
+    FROM (
+        SELECT codigo, dia, SUM(delta) as delta
+        FROM (
+            SELECT codigo, date(fecha) as dia, cantidad as delta FROM entradas
+            UNION ALL
+            SELECT codigo, date(fecha) as dia, -cantidad as delta FROM salidas
+        )
+        GROUP BY codigo, dia
+    )
+"""
+
+
+def crear_stock_diario(cursor):
+    cursor.execute(SQL_CREAR_STOCK_DIARIO)
+    cursor.execute("DELETE FROM stock_diario")
+    cursor.execute(SQL_RECONSTRUIR_STOCK_DIARIO)
+
+
+def aplicar_deltas(cursor, movimientos):
+    """Aplica movimientos (codigo, fecha, delta) agrupándolos por producto y día"""
+    deltas = defaultdict(int)
+    for codigo, fecha, delta in movimientos:
+        deltas[(codigo, fecha[:10])] += delta
+
+    deltas = [(codigo, dia, delta) for (codigo, dia), delta in deltas.items() if delta]
+
+    # Primero se crean todos los días nuevos, cada uno con el stock del último día
+    # anterior; luego cada delta se suma a su día y a los siguientes. Como todas
+    # las inserciones van antes que las sumas, el orden de los días no importa.
+    cursor.executemany("""
+        INSERT OR IGNORE INTO stock_diario (codigo, fecha, stock)
+        VALUES (?1, ?2, COALESCE((
+            SELECT stock FROM stock_diario
+            WHERE codigo = ?1 AND fecha < ?2
+            ORDER BY fecha DESC LIMIT 1
+        ), 0))
+    """, [(codigo, dia) for codigo, dia, _ in deltas])
+    cursor.executemany("""
+        UPDATE stock_diario SET stock = stock + ?
+        WHERE codigo = ? AND fecha >= ?
+    """, [(delta, codigo, dia) for codigo, dia, delta in deltas])
+
+
+def serie_stock(cursor, codigo, max_puntos=None):
+    """Devuelve [(fecha, stock)] ordenado por fecha, reducido a max_puntos si se indica"""
+    cursor.execute("SELECT fecha, stock FROM stock_diario WHERE codigo = ? ORDER BY fecha", (codigo,))
+    return reducir_serie([tuple(fila) for fila in cursor.fetchall()], max_puntos)
+
+
+def reducir_serie(puntos, max_puntos=None):
+    """Reduce [(fecha, stock)] a max_puntos con LTTB (Largest Triangle Three Buckets).
+
+    Los puntos intermedios se reparten en max_puntos - 2 tramos y de cada tramo
+    se conserva el que forma el triángulo más grande con el punto elegido antes
+    y el promedio del tramo siguiente, así que los picos y caídas de stock se
+    mantienen aunque caigan entre dos muestras. El primer y el último punto (el
+    stock actual) siempre se conservan.
+    """
+    if not max_puntos or len(puntos) <= max_puntos:
+        return puntos
+    if max_puntos < 3:
+        return [puntos[0], puntos[-1]][-max_puntos:]
+
+    xs = [date.fromisoformat(fecha[:10]).toordinal() for fecha, _ in puntos]
+    ys = [stock for _, stock in puntos]
+    n = len(puntos)
+    tamano = (n - 2) / (max_puntos - 2)
+
+    reducidos = [puntos[0]]
+    a = 0
+    for i in range(max_puntos - 2):
+        inicio = int(i * tamano) + 1
+        fin = int((i + 1) * tamano) + 1
+        siguiente_fin = min(int((i + 2) * tamano) + 1, n)
+        prom_x = sum(xs[fin:siguiente_fin]) / (siguiente_fin - fin)
+        prom_y = sum(ys[fin:siguiente_fin]) / (siguiente_fin - fin)
+
+        ax, ay = xs[a], ys[a]
+        a = max(range(inicio, fin),
+                key=lambda j: abs((ax - prom_x) * (ys[j] - ay) - (ax - xs[j]) * (prom_y - ay)))
+        reducidos.append(puntos[a])
+    reducidos.append(puntos[-1])
+    return reducidos
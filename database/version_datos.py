@@ -0,0 +1,49 @@
+"""Contador de versión de los datos (tabla version_datos).
+
+Triggers sobre productos, entradas y salidas incrementan el contador con cada
+fila escrita, así que dos lecturas con la misma versión ven los mismos datos.
+A diferencia de PRAGMA data_version, el valor se guarda en la base y también
+cambia con las escrituras de la propia conexión.
+
+El contador empieza en 0 en cada base, así que dos bases distintas pueden
+tener la misma versión: id_base, un valor aleatorio fijado por la migración,
+las distingue en la caché de reportes.
+"""
+import uuid
+
+TABLAS_VERSIONADAS = ("productos", "entradas", "salidas")
+
+
+def crear_version_datos(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS version_datos (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO version_datos (id, version) VALUES (1, 0)")
+    for tabla in TABLAS_VERSIONADAS:
+        for evento in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {tabla}_version_{evento.lower()}
+                AFTER {evento} ON {tabla} BEGIN
+                    UPDATE version_datos SET version = version + 1 WHERE id = 1;
+                END
+            """)
+
+
+def version_actual(conn):
+    fila = conn.execute("SELECT version FROM version_datos WHERE id = 1").fetchone()
+    return fila[0] if fila else None
+
+
+def crear_id_base(cursor):
+    columnas = [fila[1] for fila in cursor.execute("PRAGMA table_info(version_datos)")]
+    if "id_base" not in columnas:
+        cursor.execute("ALTER TABLE version_datos ADD COLUMN id_base TEXT")
+    cursor.execute("UPDATE version_datos SET id_base = ? WHERE id = 1 AND id_base IS NULL", (uuid.uuid4().hex,))
+
+
+def id_base(conn):
+    fila = conn.execute("SELECT id_base FROM version_datos WHERE id = 1").fetchone()
+    return fila[0] if fila else None
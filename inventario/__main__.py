@@ -0,0 +1,180 @@
+"""Línea de comandos del inventario, sin interfaz gráfica.
+
+Pensada para tareas programadas. Se ejecuta desde la carpeta del proyecto:
+
+    python -m inventario report --from 2024-01-01 --to 2024-12-31 --mensual --format pdf
+    python -m inventario report --rango 2024-01-01:2024-03-31 --rango 2024-04-01:2024-06-30
+    python -m inventario totales --reconstruir
+    python -m inventario --diagnostico report --from 2024-01-01 --to 2024-12-31
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from database.connection import DatabaseConnection
+
+FORMATOS = ("xlsx", "csv", "pdf")
+
+
+def _fecha(texto):
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha no válida (use AAAA-MM-DD): {texto}")
+
+
+def _rango(texto):
+    inicio, separador, fin = texto.partition(":")
+    if not separador:
+        raise argparse.ArgumentTypeError(f"rango no válido (use INICIO:FIN): {texto}")
+    return _fecha(inicio), _fecha(fin)
+
+
+def dividir_por_mes(inicio, fin):
+    """Parte [inicio, fin] en rangos de mes calendario"""
+    rangos = []
+    while inicio <= fin:
+        siguiente = (inicio.replace(day=1) + timedelta(days=32)).replace(day=1)
+        rangos.append((inicio, min(fin, siguiente - timedelta(days=1))))
+        inicio = siguiente
+    return rangos
+
+
+def _rangos(args, parser):
+    rangos = list(args.rango or [])
+    if args.desde or args.hasta:
+        if not (args.desde and args.hasta):
+            parser.error("--from y --to van juntos")
+        rangos.append((args.desde, args.hasta))
+    if not rangos:
+        parser.error("indique --from/--to o al menos un --rango")
+    for inicio, fin in rangos:
+        if inicio > fin:
+            parser.error(f"el rango {inicio} - {fin} termina antes de empezar")
+    if args.mensual:
+        rangos = [mes for inicio, fin in rangos for mes in dividir_por_mes(inicio, fin)]
+    return rangos
+
+
+def _abrir_base(args):
+    db = DatabaseConnection(args.db) if args.db else DatabaseConnection()
+    db.create_tables()  # Aplica las migraciones pendientes, igual que al abrir la aplicación
+    return db
+
+
+def comando_report(args, parser):
+    rangos = _rangos(args, parser)
+    os.makedirs(args.outdir, exist_ok=True)
+    db = _abrir_base(args)
+
+    def progreso(hoja, filas):
+        if args.verbose:
+            print(f"    {hoja}: {filas:,} filas", file=sys.stderr)
+
+    cache = None
+    if args.format != "csv" and not args.sin_cache:
+        from utils.cache_reportes import CacheReportes
+        cache = CacheReportes(args.cache_dir)
+
+    generados = []
+    # Una sola conexión para todos los rangos
+    with db.connect() as conn:
+        for inicio, fin in rangos:
+            base = os.path.join(args.outdir, f"reporte_{inicio:%Y%m%d}_{fin:%Y%m%d}")
+            comienzo = time.perf_counter()
+            if args.format == "csv":
+                from utils.reporte_csv import exportar_reporte_csv
+                rutas = exportar_reporte_csv(conn, inicio, fin, base, progreso)
+            else:
+                from utils.reporte_excel_generator import exportar_reporte_periodo
+                rutas = [exportar_reporte_periodo(conn, inicio, fin, base + ".xlsx", progreso, cache=cache)]
+            print(f"{inicio} a {fin}: {', '.join(rutas)} ({time.perf_counter() - comienzo:.1f} s)")
+            generados.extend(rutas)
+
+    if args.format == "pdf":
+        # Todos los Excel se convierten juntos con un solo LibreOffice
+        from utils.libreoffice_converter import LibreOfficeConverter, ConversionIncompleta
+        codigo_salida = 0
+        with LibreOfficeConverter(args.libreoffice, persistente=True) as convertidor:
+            try:
+                pdfs = convertidor.convert_batch(generados, "pdf")
+            except ConversionIncompleta as e:
+                print(f"Error al convertir a PDF: {e}", file=sys.stderr)
+                pdfs = e.salidas
+                codigo_salida = 1
+        for excel, pdf in zip(generados, pdfs):
+            if pdf is None or not os.path.exists(pdf):
+                print(f"No se generó el PDF de {excel}", file=sys.stderr)
+                codigo_salida = 1
+                continue
+            print(pdf)
+            if not args.conservar_xlsx:
+                os.remove(excel)
+        return codigo_salida
+    return 0
+
+
+def comando_totales(args, parser):
+    from database import movimientos
+
+    db = _abrir_base(args)
+    with db.connect() as conn:
+        cursor = conn.cursor()
+        if args.reconstruir:
+            corregidos = movimientos.reconstruir_totales(cursor)
+            print(f"Totales reconstruidos; productos corregidos: {corregidos}")
+            return 0
+        codigos = movimientos.auditar_totales(cursor)
+    if codigos:
+        print(f"Productos con totales desincronizados ({len(codigos)}): {', '.join(codigos[:50])}")
+        return 1
+    print("Todos los totales coinciden con los movimientos")
+    return 0
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m inventario", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="ruta de la base (por defecto src/database/inventario.db)")
+    parser.add_argument("--diagnostico", action="store_true",
+                        help="medir cada consulta y guardar las estadísticas en src/diagnostico")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    report = subparsers.add_parser("report", help="genera reportes de uno o varios períodos")
+    report.add_argument("--from", dest="desde", type=_fecha, help="inicio AAAA-MM-DD")
+    report.add_argument("--to", dest="hasta", type=_fecha, help="fin AAAA-MM-DD (incluido)")
+    report.add_argument("--rango", action="append", type=_rango, metavar="INICIO:FIN",
+                        help="período adicional; se puede repetir")
+    report.add_argument("--mensual", action="store_true", help="un reporte por mes calendario")
+    report.add_argument("--format", choices=FORMATOS, default="xlsx")
+    report.add_argument("--outdir", default=".", help="carpeta de salida")
+    report.add_argument("--libreoffice", default="libreoffice", help="ejecutable para --format pdf")
+    report.add_argument("--conservar-xlsx", action="store_true", help="con pdf, no borrar los Excel")
+    report.add_argument("--sin-cache", action="store_true", help="generar aunque el reporte esté en caché")
+    report.add_argument("--cache-dir", help="carpeta de la caché (por defecto src/cache/reportes)")
+    report.add_argument("-v", "--verbose", action="store_true", help="mostrar filas por hoja")
+    report.set_defaults(funcion=comando_report)
+
+    totales = subparsers.add_parser("totales", help="audita los totales derivados de productos")
+    totales.add_argument("--reconstruir", action="store_true", help="recalcularlos desde los movimientos")
+    totales.set_defaults(funcion=comando_totales)
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    from database import instrumentacion
+    if not (args.diagnostico or instrumentacion.solicitado()):
+        return args.funcion(args, parser)
+
+    instrumentacion.activar()  # Antes de abrir la primera conexión
+    try:
+        return args.funcion(args, parser)
+    finally:
+        print(f"Diagnóstico de consultas: {instrumentacion.volcar()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
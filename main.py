@@ -1,12 +1,23 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
-from database.connection import DatabaseConnection
+from utils import arranque
+from database import instrumentacion
+
+# Antes de importar la ventana principal, que agrega la pestaña Diagnóstico
+if instrumentacion.solicitado(sys.argv):
+    instrumentacion.activar()
+
+with arranque.medir("importar PyQt6"):
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+with arranque.medir("importar ventana principal"):
+    from ui.main_window import MainWindow
+    from database.connection import DatabaseConnection
 
 def main():
     # Inicializar la base de datos y crear tablas
-    db = DatabaseConnection()
-    db.create_tables()
+    with arranque.medir("crear tablas y migrar"):
+        db = DatabaseConnection()
+        db.create_tables()
     
     app = QApplication([])
     
@@ -18,9 +29,14 @@ def main():
     except FileNotFoundError:
         print("Archivo de estilo no encontrado.")
     
-    window = MainWindow()
+    with arranque.medir("ventana principal"):
+        window = MainWindow()
     window.show()
+    if instrumentacion.ACTIVO:
+        # Al salir se guardan las estadísticas de consultas de la sesión
+        app.aboutToQuit.connect(lambda: print(f"Diagnóstico de consultas: {instrumentacion.volcar()}"))
+    QTimer.singleShot(0, arranque.informar)  # Después del primer ciclo de eventos
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,10 @@
+from typing import NamedTuple, Optional
+
+
+class Entrada(NamedTuple):
+    """Una fila de la tabla entradas; id es None antes de insertarla"""
+    id: Optional[int]
+    codigo: str
+    descripcion: str
+    cantidad: int
+    fecha: str  # yyyy-MM-dd HH:mm:ss
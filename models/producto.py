@@ -0,0 +1,28 @@
+from typing import NamedTuple, Optional
+
+
+class Producto(NamedTuple):
+    """Un producto con sus totales derivados (los mantiene database/movimientos.py).
+
+    Es una tupla: los modelos de tabla y los reportes la siguen leyendo por
+    posición sin costo extra, y el resto del código por nombre.
+    """
+    codigo: str
+    descripcion: str
+    entradas_totales: int = 0
+    salidas_totales: int = 0
+    stock: int = 0
+    precio_compra: Optional[float] = None
+    precio_venta: Optional[float] = None
+
+    @property
+    def valor_compra_total(self):
+        return self.entradas_totales * (self.precio_compra or 0)
+
+    @property
+    def valor_venta_total(self):
+        return self.salidas_totales * (self.precio_venta or 0)
+
+    @property
+    def utilidad(self):
+        return self.valor_venta_total - self.valor_compra_total
@@ -0,0 +1,68 @@
+"""Totales de la consulta de inventario con un producto de miles de movimientos.
+
+A recibe N entradas de 2 unidades y N salidas de 1 por database.movimientos;
+B no tiene movimientos. Los tiempos de las mismas consultas se miden en
+benchmarks/reporte_inventario.py.
+"""
+from datetime import date
+
+import pytest
+
+from database import movimientos
+from database.connection import DatabaseConnection
+from database.consultas import SQL_INVENTARIO_PERIODO, SQL_COMPARACION_PRODUCTOS, consultar_inventario_periodo
+
+N = 3000
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    db = DatabaseConnection(str(tmp_path_factory.mktemp("inventario") / "inventario.db"))
+    db.create_tables()
+    with db.connect() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO productos (codigo, descripcion, precio_compra, precio_venta) VALUES (?, ?, ?, ?)",
+            [("A", "Producto A", 10.0, 15.0), ("B", "Producto B", 5.0, 8.0)],
+        )
+        fechas = [f"2024-03-{1 + i % 28:02d} 10:00:00" for i in range(N)]
+        movimientos.registrar_lote(cursor, "entradas", (("A", "Producto A", 2, fecha) for fecha in fechas))
+        movimientos.registrar_lote(cursor, "salidas", (("A", "Producto A", 1, fecha) for fecha in fechas))
+        conn.commit()
+        yield conn
+
+
+def inventario(conn, inicio, fin):
+    return {fila["codigo"]: fila for fila in conn.execute(SQL_INVENTARIO_PERIODO, (inicio, fin) * 2)}
+
+
+def test_totales_del_periodo(conn):
+    filas = inventario(conn, "2024-01-01", "2024-12-31 23:59:59")
+    a, b = filas["A"], filas["B"]
+    assert (a["entradas"], a["salidas"]) == (2 * N, N)
+    assert a["valor_compra_total"] == 2 * N * 10.0
+    assert a["valor_venta_total"] == N * 15.0
+    assert (b["entradas"], b["salidas"]) == (0, 0)
+
+
+def test_totales_derivados_coinciden(conn):
+    assert movimientos.auditar_totales(conn.cursor()) == []
+    a = conn.execute("SELECT entradas_totales, salidas_totales, stock FROM productos WHERE codigo = 'A'").fetchone()
+    assert tuple(a) == (2 * N, N, N)
+
+
+@pytest.mark.parametrize("inicio, fin", [
+    (date(2024, 1, 1), date(2024, 12, 31)),
+    (date(2024, 2, 15), date(2024, 3, 10)),  # Extremos sueltos fuera de meses completos
+])
+def test_resumen_mensual_igual_a_movimientos(conn, inicio, fin):
+    mensual = [tuple(fila) for fila in consultar_inventario_periodo(conn.cursor(), inicio, fin)]
+    directo = [tuple(fila) for fila in conn.execute(SQL_INVENTARIO_PERIODO,
+                                                     (str(inicio), f"{fin} 23:59:59") * 2)]
+    assert mensual == directo
+
+
+def test_comparacion_usa_los_totales(conn):
+    filas = {fila[0]: fila for fila in conn.execute(SQL_COMPARACION_PRODUCTOS, ("B", 4))}
+    a = filas["A"]
+    assert (a["entradas"], a["salidas"], a["total_movimientos"]) == (2 * N, N, 3 * N)
@@ -0,0 +1,54 @@
+import os
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import QFileDialog, QMessageBox
+from database.importacion import importar_movimientos, guardar_rechazos
+from ui.tareas import TareaConsulta
+
+MAX_RECHAZOS_MOSTRADOS = 10
+
+
+def importar_desde_archivo(vista, tabla, boton=None):
+    """Pide un CSV/XLSX e importa sus movimientos en segundo plano.
+
+    La vista debe tener db, modelo y data_changed (EntradasView, SalidasView).
+    Todo el archivo se guarda en una sola transacción: si algo falla no se
+    importa ninguna fila.
+    """
+    ruta, _ = QFileDialog.getOpenFileName(
+        vista, f"Importar {tabla}", "", "Archivos de movimientos (*.csv *.xlsx);;Todos los archivos (*)"
+    )
+    if not ruta:
+        return
+
+    tarea = TareaConsulta(vista.db, 0, lambda conn: importar_movimientos(conn, tabla, ruta))
+    if boton is not None:
+        boton.setEnabled(False)
+
+    def terminada(_, resultado):
+        if boton is not None:
+            boton.setEnabled(True)
+        importadas, rechazadas = resultado
+        vista.modelo.recargar()
+        vista.data_changed.emit()
+
+        mensaje = f"Filas importadas: {importadas}\nFilas rechazadas: {len(rechazadas)}"
+        if rechazadas:
+            archivo_rechazos = guardar_rechazos(rechazadas, os.path.splitext(ruta)[0] + "_rechazos.csv")
+            detalle = "\n".join(f"Línea {linea}: {motivo}"
+                                for linea, motivo, _ in rechazadas[:MAX_RECHAZOS_MOSTRADOS])
+            if len(rechazadas) > MAX_RECHAZOS_MOSTRADOS:
+                detalle += "\n..."
+            mensaje += f"\n\n{detalle}\n\nDetalle completo en:\n{archivo_rechazos}"
+            QMessageBox.warning(vista, "Importación", mensaje)
+        else:
+            QMessageBox.information(vista, "Importación", mensaje)
+
+    def fallida(_, error):
+        if boton is not None:
+            boton.setEnabled(True)
+        QMessageBox.warning(vista, "Error", f"No se pudo importar el archivo:\n{error}")
+
+    tarea.senales.terminada.connect(terminada)
+    tarea.senales.fallida.connect(fallida)
+    vista._tarea_importacion = tarea  # Mantener viva la referencia hasta que termine
+    QThreadPool.globalInstance().start(tarea)
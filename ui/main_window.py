@@ -1,13 +1,24 @@
+import importlib
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QTabWidget
-from .views.productos_view import ProductosView
-from .views.entradas_view import EntradasView
-from .views.salidas_view import SalidasView
-from .views.reporte_view import ReporteView
-from .views.historial_view import HistorialView  # Importar la nueva vista
+from utils import arranque
+from database import instrumentacion
+
+# (título de la pestaña, módulo, clase). Cada vista se importa y se crea la
+# primera vez que se abre su pestaña.
+VISTAS = [
+    ("Productos", ".views.productos_view", "ProductosView"),
+    ("Entradas", ".views.entradas_view", "EntradasView"),
+    ("Salidas", ".views.salidas_view", "SalidasView"),
+    ("Reportes", ".views.reporte_view", "ReporteView"),
+    ("Historial", ".views.historial_view", "HistorialView"),
+]
+if instrumentacion.ACTIVO:
+    VISTAS.append(("Diagnóstico", ".views.diagnostico_view", "DiagnosticoView"))
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        self.vistas = {}  # índice de pestaña -> vista ya creada
         self.initUI()
 
     def initUI(self):
@@ -19,12 +30,26 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
 
-        # Crear tabs
-        tabs = QTabWidget()
-        tabs.addTab(ProductosView(), "Productos")
-        tabs.addTab(EntradasView(), "Entradas")
-        tabs.addTab(SalidasView(), "Salidas")
-        tabs.addTab(ReporteView(), "Reportes")
-        tabs.addTab(HistorialView(), "Historial")  # Añadir la nueva pestaña
+        # Crear tabs con un contenedor vacío que recibe la vista al abrirse
+        self.tabs = QTabWidget()
+        for titulo, _, _ in VISTAS:
+            contenedor = QWidget()
+            contenedor_layout = QVBoxLayout(contenedor)
+            contenedor_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(contenedor, titulo)
+        self.tabs.currentChanged.connect(self.construir_vista)
+        self.construir_vista(self.tabs.currentIndex())
+
+        layout.addWidget(self.tabs)
 
-        layout.addWidget(tabs)
\ No newline at end of file
+    def construir_vista(self, indice):
+        if indice < 0 or indice in self.vistas:
+            return self.vistas.get(indice)
+        titulo, modulo, clase = VISTAS[indice]
+        with arranque.medir(f"importar {titulo}"):
+            vista_cls = getattr(importlib.import_module(modulo, __package__), clase)
+        with arranque.medir(f"crear vista {titulo}"):
+            vista = vista_cls()
+        self.tabs.widget(indice).layout().addWidget(vista)
+        self.vistas[indice] = vista
+        return vista
@@ -0,0 +1,142 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from database import repositorio
+
+
+class MovimientosModel(QAbstractTableModel):
+    """Modelo de entradas o salidas con carga incremental (paginación por fecha, id)"""
+
+    ENCABEZADOS = ["Código", "Descripción", "Cantidad", "Fecha"]
+    TAMANO_PAGINA = 200
+
+    def __init__(self, db, tabla, parent=None):
+        super().__init__(parent)
+        if tabla not in ("entradas", "salidas"):
+            raise ValueError(f"Tabla de movimientos no válida: {tabla}")
+        self.db = db
+        self.tabla = tabla
+        self._filas = []  # Entrada o Salida, ordenadas por fecha DESC, id DESC
+        self._hay_mas = False
+        self._filtro_sql = ""
+        self._filtro_params = ()
+        self._columnas_vacias = set()
+
+    # --- Carga de datos ---
+
+    def _consultar(self, condicion="", params=(), limite=None):
+        condiciones = [c for c in (self._filtro_sql, condicion) if c]
+        condicion = " AND ".join(f"({c})" for c in condiciones)
+        with self.db.connect() as conn:
+            return repositorio.pagina_movimientos(conn.cursor(), self.tabla, condicion,
+                                                  self._filtro_params + tuple(params), limite)
+
+    def recargar(self):
+        self.beginResetModel()
+        self._filas = self._consultar(limite=self.TAMANO_PAGINA)
+        self._hay_mas = len(self._filas) == self.TAMANO_PAGINA
+        self._columnas_vacias.clear()
+        self.endResetModel()
+
+    def filtrar(self, condicion, params=()):
+        """Restringe el modelo con una condición SQL sobre la tabla de movimientos"""
+        self._filtro_sql = condicion
+        self._filtro_params = tuple(params)
+        self.recargar()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._hay_mas
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._filas:
+            return
+        ultima = self._filas[-1]
+        pagina = self._consultar("(fecha, id) < (?, ?)", (ultima.fecha, ultima.id), self.TAMANO_PAGINA)
+        self._hay_mas = len(pagina) == self.TAMANO_PAGINA
+        if pagina:
+            inicio = len(self._filas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(pagina) - 1)
+            self._filas.extend(pagina)
+            self.endInsertRows()
+
+    def _posicion(self, fecha, id_):
+        # Búsqueda binaria sobre el orden descendente (fecha, id)
+        bajo, alto = 0, len(self._filas)
+        clave = (fecha, id_)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            fila = self._filas[medio]
+            if (fila.fecha, fila.id) > clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    # --- Actualizaciones puntuales después de escribir ---
+
+    def insertar_por_id(self, id_):
+        """Agrega al modelo el movimiento recién insertado sin recargar la tabla"""
+        filas = self._consultar("id = ?", (id_,))
+        if not filas:
+            return  # No coincide con el filtro actual
+        fila = filas[0]
+        posicion = self._posicion(fila.fecha, fila.id)
+        if posicion == len(self._filas) and self._hay_mas:
+            return  # Aún no se ha cargado esa parte del historial
+        self.beginInsertRows(QModelIndex(), posicion, posicion)
+        self._filas.insert(posicion, fila)
+        self.endInsertRows()
+
+    def actualizar_fila(self, row):
+        """Vuelve a leer un movimiento editado"""
+        id_ = self._filas[row].id
+        filas = self._consultar("id = ?", (id_,))
+        if not filas or filas[0].fecha != self._filas[row].fecha:
+            # Cambió la fecha o dejó de cumplir el filtro: se reubica
+            self.eliminar_fila(row)
+            if filas:
+                self.insertar_por_id(id_)
+            return
+        self._filas[row] = filas[0]
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def eliminar_fila(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._filas[row]
+        self.endRemoveRows()
+
+    def registro(self, row):
+        """Devuelve la Entrada o Salida de la fila o None"""
+        if 0 <= row < len(self._filas):
+            return self._filas[row]
+        return None
+
+    # --- Formato ---
+
+    def vaciar_columna(self, col):
+        self._columnas_vacias.add(col)
+        self.dataChanged.emit(self.index(0, col), self.index(self.rowCount() - 1, col))
+
+    def vaciar_tabla(self):
+        self._columnas_vacias.update(range(len(self.ENCABEZADOS)))
+        self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    # --- API de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ENCABEZADOS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.ENCABEZADOS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        col = index.column()
+        if col in self._columnas_vacias:
+            return None
+        # Las columnas visibles son codigo, descripcion, cantidad y fecha
+        return str(self._filas[index.row()][col + 1])
@@ -0,0 +1,180 @@
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont
+from database.busqueda import condicion_productos
+from database import repositorio
+
+
+class ProductosModel(QAbstractTableModel):
+    """Modelo virtual de productos: carga páginas bajo demanda y formatea solo las celdas visibles"""
+
+    ENCABEZADOS = [
+        "Código", "Descripción", "Entradas", "Salidas",
+        "Stock", "Precio Compra", "Precio Venta", "Valor Compra Total", "Valor Venta Total", "Utilidad"
+    ]
+    TAMANO_PAGINA = 256
+    MAX_PAGINAS = 64  # Páginas que se conservan en memoria
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self._cantidad = 0
+        self._totales = (0,) * 8
+        self._paginas = OrderedDict()
+        self._filtro_sql = ""
+        self._filtro_params = ()
+        self._columnas_vacias = set()
+        self._fuente_totales = QFont()
+        self._fuente_totales.setBold(True)
+
+    # --- Carga de datos ---
+
+    def recargar(self):
+        """Vuelve a contar los productos y calcula la fila de totales en una sola consulta"""
+        self.beginResetModel()
+        with self.db.connect() as conn:
+            fila = conn.execute("""
+                SELECT COUNT(*),
+                       COALESCE(SUM(entradas_totales), 0),
+                       COALESCE(SUM(salidas_totales), 0),
+                       COALESCE(SUM(stock), 0),
+                       COALESCE(SUM(precio_compra), 0),
+                       COALESCE(SUM(precio_venta), 0),
+                       COALESCE(SUM(entradas_totales * precio_compra), 0),
+                       COALESCE(SUM(salidas_totales * precio_venta), 0)
+                FROM productos
+            """).fetchone()
+            total_compra, total_venta = fila[6], fila[7]
+            self._totales = tuple(fila[1:]) + (total_venta - total_compra,)
+            self._cantidad = self._contar(conn) if self._filtro_sql else fila[0]
+
+        self._paginas.clear()
+        self._columnas_vacias.clear()
+        self.endResetModel()
+
+    def filtrar(self, texto):
+        """Filtra por código o descripción; la fila de totales sigue siendo la del catálogo completo"""
+        texto = texto.strip()
+        self.beginResetModel()
+        with self.db.connect() as conn:
+            if texto:
+                # Búsqueda por el índice de trigramas (o LIKE para textos cortos)
+                self._filtro_sql, self._filtro_params = condicion_productos(conn, texto)
+                self._cantidad = self._contar(conn)
+            else:
+                self._filtro_sql = ""
+                self._filtro_params = ()
+                self._cantidad = conn.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+        self._paginas.clear()
+        self.endResetModel()
+
+    def _contar(self, conn):
+        return conn.execute(
+            f"SELECT COUNT(*) FROM productos WHERE {self._filtro_sql}", self._filtro_params
+        ).fetchone()[0]
+
+    def _pagina(self, numero):
+        pagina = self._paginas.get(numero)
+        if pagina is not None:
+            self._paginas.move_to_end(numero)
+            return pagina
+
+        # Si la página anterior está en memoria se continúa desde su último rowid
+        anterior = self._paginas.get(numero - 1)
+        with self.db.connect() as conn:
+            pagina = repositorio.pagina_productos(
+                conn.cursor(), self.TAMANO_PAGINA, self._filtro_sql, self._filtro_params,
+                despues_de=anterior[-1][0] if anterior else None,
+                desplazamiento=numero * self.TAMANO_PAGINA)
+
+        self._paginas[numero] = pagina
+        if len(self._paginas) > self.MAX_PAGINAS:
+            self._paginas.popitem(last=False)
+        return pagina
+
+    def registro(self, row):
+        """Devuelve el Producto de la fila o None"""
+        if row < 0 or row >= self._cantidad:
+            return None
+        pagina = self._pagina(row // self.TAMANO_PAGINA)
+        indice = row % self.TAMANO_PAGINA
+        if indice >= len(pagina):
+            return None
+        return pagina[indice][1]
+
+    # --- Formato ---
+
+    def vaciar_columna(self, col):
+        self._columnas_vacias.add(col)
+        self.dataChanged.emit(self.index(0, col), self.index(self.rowCount() - 1, col))
+
+    def vaciar_tabla(self):
+        self._columnas_vacias.update(range(len(self.ENCABEZADOS)))
+        self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    # --- API de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._cantidad + 1  # +1 para la fila de totales
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ENCABEZADOS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.ENCABEZADOS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        es_totales = row == self._cantidad
+
+        if role == Qt.ItemDataRole.FontRole:
+            return self._fuente_totales if es_totales else None
+        if role != Qt.ItemDataRole.DisplayRole or col in self._columnas_vacias:
+            return None
+
+        if es_totales:
+            return self._formatear_totales(col)
+
+        registro = self.registro(row)
+        if registro is None:
+            return None
+        codigo, descripcion, entradas, salidas, stock, precio_compra, precio_venta = registro
+        precio_compra = precio_compra or 0
+        precio_venta = precio_venta or 0
+
+        if col == 0:
+            return codigo
+        if col == 1:
+            return descripcion
+        if col == 2:
+            return str(entradas)
+        if col == 3:
+            return str(salidas)
+        if col == 4:
+            return str(stock)
+        if col == 5:
+            return f"${precio_compra:,.3f}"
+        if col == 6:
+            return f"${precio_venta:,.3f}"
+
+        valor_compra_total = entradas * precio_compra
+        valor_venta_total = salidas * precio_venta
+        if col == 7:
+            return f"${valor_compra_total:,.3f}"
+        if col == 8:
+            return f"${valor_venta_total:,.3f}"
+        return f"${valor_venta_total - valor_compra_total:,.3f}"
+
+    def _formatear_totales(self, col):
+        if col == 0:
+            return "TOTALES"
+        if col == 1:
+            return None
+        valor = self._totales[col - 2]
+        if col <= 4:
+            return str(valor)
+        return f"${valor:,.3f}"
@@ -0,0 +1,155 @@
+from datetime import datetime
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+from database import catalogo_reportes
+
+
+class ReportesModel(QAbstractTableModel):
+    """Catálogo de reportes con carga incremental (paginación por fecha, id)"""
+
+    ENCABEZADOS = ["FECHA", "DESCRIPCIÓN", "TEMPORALIDAD", "DESCARGAR"]
+    COLUMNA_DESCRIPCION = 1
+    COLUMNA_DESCARGAR = 3
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self._filas = []  # (id, fecha, descripcion, temporalidad, file_path, tamano, checksum)
+        self._hay_mas = False
+        self._texto = ""
+        self.fila_resaltada = None  # Fila cuyo "Descargar" se muestra en rojo
+
+    # --- Carga de datos ---
+
+    def _pagina(self, despues=None):
+        with self.db.connect() as conn:
+            return [tuple(fila) for fila in catalogo_reportes.listar(conn.cursor(), self._texto, despues)]
+
+    def recargar(self):
+        self.beginResetModel()
+        self._filas = self._pagina()
+        self._hay_mas = len(self._filas) == catalogo_reportes.TAMANO_PAGINA
+        self.fila_resaltada = None
+        self.endResetModel()
+
+    def filtrar(self, texto):
+        self._texto = texto.strip()
+        self.recargar()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._hay_mas
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._filas:
+            return
+        ultima = self._filas[-1]
+        pagina = self._pagina((ultima[1], ultima[0]))
+        self._hay_mas = len(pagina) == catalogo_reportes.TAMANO_PAGINA
+        if pagina:
+            inicio = len(self._filas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(pagina) - 1)
+            self._filas.extend(pagina)
+            self.endInsertRows()
+
+    # --- Actualizaciones puntuales ---
+
+    def insertar_por_id(self, id_reporte):
+        """Agrega arriba un reporte recién registrado sin recargar el catálogo"""
+        with self.db.connect() as conn:
+            fila = catalogo_reportes.obtener(conn.cursor(), id_reporte)
+        if fila is None:
+            return
+        fila = tuple(fila)
+        if self._texto and self._texto.lower() not in f"{self._fecha(fila)} {fila[2]}".lower():
+            return  # No coincide con la búsqueda actual
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._filas.insert(0, fila)
+        self.endInsertRows()
+
+    def quitar_ids(self, ids):
+        """Quita del modelo las filas de los ids dados (por ejemplo, tras el barrido)"""
+        ids = set(ids)
+        for row in range(len(self._filas) - 1, -1, -1):
+            if self._filas[row][0] in ids:
+                self.eliminar_fila(row)
+
+    def eliminar_fila(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._filas[row]
+        self.endRemoveRows()
+        self.fila_resaltada = None
+
+    def registro(self, row):
+        """Devuelve (id, fecha, descripcion, temporalidad, file_path, tamano, checksum) o None"""
+        if 0 <= row < len(self._filas):
+            return self._filas[row]
+        return None
+
+    def descripciones(self):
+        return {fila[2] for fila in self._filas}
+
+    def resaltar(self, row):
+        anterior, self.fila_resaltada = self.fila_resaltada, row
+        for fila in {anterior, row} - {None}:
+            indice = self.index(fila, self.COLUMNA_DESCARGAR)
+            self.dataChanged.emit(indice, indice, [Qt.ItemDataRole.ForegroundRole])
+
+    # --- API de QAbstractTableModel ---
+
+    @staticmethod
+    def _fecha(fila):
+        try:
+            return datetime.strptime(fila[1], catalogo_reportes.FORMATO_FECHA).strftime("%d/%m/%Y %H:%M:%S")
+        except ValueError:
+            return fila[1]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ENCABEZADOS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.ENCABEZADOS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        banderas = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+        if index.column() == self.COLUMNA_DESCRIPCION:
+            banderas |= Qt.ItemFlag.ItemIsEditable
+        return banderas
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        fila, col = self._filas[index.row()], index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if col == 0:
+                return self._fecha(fila)
+            if col == self.COLUMNA_DESCARGAR:
+                return "Descargar"
+            return fila[col + 1]  # descripcion, temporalidad
+        if col == self.COLUMNA_DESCARGAR:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor(255, 0, 0) if index.row() == self.fila_resaltada else QColor(0, 0, 255)
+        if role == Qt.ItemDataRole.ToolTipRole and fila[5] is not None:
+            return f"{fila[4]}\n{fila[5] / 1024:,.0f} KB - SHA-256 {fila[6][:12]}"
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Edita la descripción y la guarda en el catálogo"""
+        if role != Qt.ItemDataRole.EditRole or index.column() != self.COLUMNA_DESCRIPCION:
+            return False
+        descripcion = str(value).strip()
+        fila = self._filas[index.row()]
+        if not descripcion or descripcion == fila[2]:
+            return False
+        with self.db.connect() as conn:
+            if not catalogo_reportes.renombrar(conn.cursor(), fila[0], descripcion):
+                return False
+        self._filas[index.row()] = fila[:2] + (descripcion,) + fila[3:]
+        self.dataChanged.emit(index, index)
+        return True
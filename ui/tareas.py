@@ -0,0 +1,179 @@
+import sqlite3
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class SenalesTarea(QObject):
+    terminada = pyqtSignal(int, object)  # generación, resultado
+    fallida = pyqtSignal(int, str)       # generación, mensaje de error
+
+
+class TareaConsulta(QRunnable):
+    """Ejecuta funcion(conn) en un hilo del QThreadPool.
+
+    La tarea se puede cancelar desde el hilo de la interfaz: si la consulta ya
+    está en curso se interrumpe con sqlite3.Connection.interrupt() y no se emite
+    ningún resultado.
+    """
+
+    def __init__(self, db, generacion, funcion):
+        super().__init__()
+        self.db = db
+        self.generacion = generacion
+        self.funcion = funcion
+        self.senales = SenalesTarea()
+        self._conn = None
+        self._cancelada = False
+        self._lock = threading.Lock()
+
+    @property
+    def cancelada(self):
+        return self._cancelada
+
+    def cancelar(self):
+        with self._lock:
+            self._cancelada = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+    def run(self):
+        try:
+            with self.db.connect() as conn:
+                with self._lock:
+                    if self._cancelada:
+                        return
+                    self._conn = conn
+                try:
+                    resultado = self.funcion(conn)
+                finally:
+                    with self._lock:
+                        self._conn = None
+        except sqlite3.OperationalError as e:
+            if not self._cancelada:  # Si fue cancelada, el error es la interrupción
+                self.senales.fallida.emit(self.generacion, str(e))
+            return
+        except Exception as e:
+            self.senales.fallida.emit(self.generacion, str(e))
+            return
+
+        if not self._cancelada:
+            self.senales.terminada.emit(self.generacion, resultado)
+
+
+class SenalesTrabajo(QObject):
+    progreso = pyqtSignal(int, str, int)  # trabajo, etapa (hoja), filas escritas
+    iniciado = pyqtSignal(int)
+    terminado = pyqtSignal(int, object)
+    fallido = pyqtSignal(int, str)
+    cancelado = pyqtSignal(int)
+
+
+class TrabajoLargo(TareaConsulta):
+    """Tarea con avance y cancelación cooperativa.
+
+    funcion(conn, progreso, cancelado) recibe un callback progreso(etapa, filas)
+    y otro cancelado() que debe consultar periódicamente; además la consulta en
+    curso se interrumpe igual que en TareaConsulta.
+    """
+
+    def __init__(self, db, id_trabajo, descripcion, funcion):
+        super().__init__(db, id_trabajo, None)
+        self.descripcion = descripcion
+        self.funcion = lambda conn: funcion(conn, self._progreso, lambda: self._cancelada)
+        self.senales = SenalesTrabajo()
+
+    def _progreso(self, etapa, filas):
+        self.senales.progreso.emit(self.generacion, etapa, filas)
+
+    def run(self):
+        if self._cancelada:
+            self.senales.cancelado.emit(self.generacion)
+            return
+        self.senales.iniciado.emit(self.generacion)
+        try:
+            with self.db.connect() as conn:
+                with self._lock:
+                    self._conn = conn
+                try:
+                    resultado = self.funcion(conn)
+                finally:
+                    with self._lock:
+                        self._conn = None
+        except Exception as e:
+            if self._cancelada:
+                self.senales.cancelado.emit(self.generacion)
+            else:
+                self.senales.fallido.emit(self.generacion, str(e))
+            return
+
+        if self._cancelada:
+            self.senales.cancelado.emit(self.generacion)
+        else:
+            self.senales.terminado.emit(self.generacion, resultado)
+
+
+class ColaTrabajos(QObject):
+    """Cola FIFO de trabajos largos que se ejecutan de a uno en un hilo propio.
+
+    Usa su propio QThreadPool para no ocupar los hilos de las búsquedas.
+    """
+
+    progreso = pyqtSignal(int, str, int)
+    iniciado = pyqtSignal(int)
+    terminado = pyqtSignal(int, object)
+    fallido = pyqtSignal(int, str)
+    cancelado = pyqtSignal(int)
+    cambiada = pyqtSignal()  # Cambió la cantidad de trabajos pendientes
+
+    def __init__(self, db, parent=None, hilos=1):
+        super().__init__(parent)
+        self.db = db
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(hilos)
+        self._trabajos = {}  # id -> TrabajoLargo, en orden de llegada
+        self._siguiente_id = 1
+
+    def encolar(self, descripcion, funcion):
+        id_trabajo = self._siguiente_id
+        self._siguiente_id += 1
+        trabajo = TrabajoLargo(self.db, id_trabajo, descripcion, funcion)
+        trabajo.senales.progreso.connect(self.progreso)
+        trabajo.senales.iniciado.connect(self.iniciado)
+        trabajo.senales.terminado.connect(self._al_terminar)
+        trabajo.senales.fallido.connect(self._al_fallar)
+        trabajo.senales.cancelado.connect(self._al_cancelar)
+        self._trabajos[id_trabajo] = trabajo
+        self._pool.start(trabajo)
+        self.cambiada.emit()
+        return id_trabajo
+
+    def _al_terminar(self, id_trabajo, resultado):
+        self._trabajos.pop(id_trabajo, None)
+        self.terminado.emit(id_trabajo, resultado)
+        self.cambiada.emit()
+
+    def _al_fallar(self, id_trabajo, mensaje):
+        self._trabajos.pop(id_trabajo, None)
+        self.fallido.emit(id_trabajo, mensaje)
+        self.cambiada.emit()
+
+    def _al_cancelar(self, id_trabajo):
+        self._trabajos.pop(id_trabajo, None)
+        self.cancelado.emit(id_trabajo)
+        self.cambiada.emit()
+
+    def cancelar(self, id_trabajo):
+        trabajo = self._trabajos.get(id_trabajo)
+        if trabajo is not None:
+            trabajo.cancelar()
+
+    def cancelar_todos(self):
+        for trabajo in list(self._trabajos.values()):
+            trabajo.cancelar()
+
+    def pendientes(self):
+        """Trabajos aún no terminados como lista de (id, descripcion)"""
+        return [(i, t.descripcion) for i, t in self._trabajos.items()]
+
+    def esperar(self, msecs=-1):
+        return self._pool.waitForDone(msecs)
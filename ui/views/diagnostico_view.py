@@ -0,0 +1,107 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QPlainTextEdit,
+                             QSplitter, QMessageBox)
+from PyQt6.QtCore import Qt, QTimer
+from database.connection import DatabaseConnection
+from database import instrumentacion
+
+
+class DiagnosticoView(QWidget):
+    """Estadísticas de consultas; la pestaña solo existe con --diagnostico"""
+
+    INTERVALO_MS = 2000
+    COLUMNAS = ["Sentencia", "Ejecuciones", "Total ms", "Promedio ms", "Máx ms", "Filas"]
+
+    def __init__(self):
+        super().__init__()
+        self.db = DatabaseConnection()
+        self.init_ui()
+        # Se actualiza solo mientras la pestaña está visible
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.actualizar)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        header_layout = QHBoxLayout()
+        title_label = QLabel("Diagnóstico de consultas")
+        title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+        for texto, accion in (("Actualizar", self.actualizar), ("Reiniciar", self.reiniciar),
+                              ("Guardar en archivo", self.guardar)):
+            boton = QPushButton(texto)
+            boton.clicked.connect(accion)
+            header_layout.addWidget(boton)
+        layout.addLayout(header_layout)
+
+        self.resumen_label = QLabel("")
+        layout.addWidget(self.resumen_label)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.tabla = QTableWidget()
+        columnas = self.COLUMNAS + instrumentacion.nombres_tramos()
+        self.tabla.setColumnCount(len(columnas))
+        self.tabla.setHorizontalHeaderLabels(columnas)
+        self.tabla.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.tabla.setWordWrap(False)
+        header = self.tabla.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for i in range(1, len(columnas)):
+            header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+        splitter.addWidget(self.tabla)
+
+        self.lentas_text = QPlainTextEdit()
+        self.lentas_text.setReadOnly(True)
+        splitter.addWidget(self.lentas_text)
+        layout.addWidget(splitter)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.actualizar()
+        self.timer.start(self.INTERVALO_MS)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def actualizar(self):
+        datos = instrumentacion.estadisticas()
+        pool = self.db.estadisticas()
+        total_ms = sum(s["total_ms"] for s in datos["sentencias"])
+        trazadas = ", ".join(f"{k}: {v}" for k, v in sorted(datos["trazadas"].items(), key=lambda t: -t[1]))
+        self.resumen_label.setText(
+            f"{len(datos['sentencias'])} sentencias distintas, {total_ms:,.0f} ms en total. "
+            f"Umbral de consulta lenta: {datos['umbral_lenta_ms']:.0f} ms. "
+            f"Pool: {pool['checkouts']} préstamos, {pool['conexiones_creadas']} conexiones.\n"
+            f"Transacciones y triggers (fuera de los cursores): {trazadas}"
+        )
+
+        self.tabla.setRowCount(len(datos["sentencias"]))
+        for fila, s in enumerate(datos["sentencias"]):
+            valores = [s["sql"], s["ejecuciones"], f"{s['total_ms']:.1f}", f"{s['promedio_ms']:.2f}",
+                       f"{s['max_ms']:.1f}", s["filas"]] + list(s["histograma"].values())
+            for col, valor in enumerate(valores):
+                item = QTableWidgetItem(str(valor))
+                if col == 0:
+                    item.setToolTip(s["sql"])
+                else:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tabla.setItem(fila, col, item)
+
+        lineas = []
+        for lenta in reversed(datos["lentas"]):
+            lineas.append(f"{lenta['fecha']}  {lenta['ms']:.0f} ms  {lenta['filas']} filas  [{lenta['hilo']}]")
+            lineas.append(f"  {lenta['sql']}")
+            lineas.append(f"  parámetros: {lenta['parametros']}")
+            lineas.extend(f"    {paso}" for paso in lenta["plan"])
+            lineas.append("")
+        self.lentas_text.setPlainText("\n".join(lineas) or "Sin consultas lentas")
+
+    def reiniciar(self):
+        instrumentacion.reiniciar()
+        self.actualizar()
+
+    def guardar(self):
+        ruta = instrumentacion.volcar()
+        QMessageBox.information(self, "Diagnóstico", f"Estadísticas guardadas en:\n{ruta}")
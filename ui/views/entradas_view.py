@@ -1,15 +1,20 @@
 import sqlite3
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView, QSpacerItem, QSizePolicy, QDateTimeEdit, QMenu, QInputDialog)
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView, QMessageBox, QHeaderView, QSpacerItem, QSizePolicy, QDateTimeEdit, QMenu, QInputDialog)
 from PyQt6.QtCore import Qt, pyqtSignal, QDateTime
 from database.connection import DatabaseConnection
+from database.busqueda import condicion_movimientos
+from database import movimientos, repositorio
+from ui.models.movimientos_model import MovimientosModel
+from ui.importar import importar_desde_archivo
 
 class EntradasView(QWidget):
     data_changed = pyqtSignal()
 
     def __init__(self):
         super().__init__()
-        self.init_ui()
         self.db = DatabaseConnection()
+        self.modelo = MovimientosModel(self.db, "entradas", self)
+        self.init_ui()
         self.load_data()
 
     def init_ui(self):
@@ -35,7 +40,12 @@ class EntradasView(QWidget):
         btn_tema = QPushButton("Cambiar Tema")
         btn_tema.setObjectName("btn_tema")
         
+        self.btn_importar = QPushButton("Importar")
+        self.btn_importar.setObjectName("btn_importar")
+        self.btn_importar.clicked.connect(lambda: importar_desde_archivo(self, "entradas", self.btn_importar))
+
         header_layout.addWidget(btn_actualizar)
+        header_layout.addWidget(self.btn_importar)
         header_layout.addWidget(self.btn_formatear)
         header_layout.addWidget(btn_tema)
         
@@ -79,13 +89,12 @@ class EntradasView(QWidget):
 
         layout.addLayout(form_layout)
 
-        # Tabla
-        self.tabla = QTableWidget()
-        self.tabla.setColumnCount(4)
-        self.tabla.setHorizontalHeaderLabels([
-            "Código", "Descripción", "Cantidad", "Fecha"
-        ])
+        # Tabla (el modelo carga el historial por páginas al desplazarse)
+        self.tabla = QTableView()
+        self.tabla.setModel(self.modelo)
         self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.tabla.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.tabla.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.tabla.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tabla.customContextMenuRequested.connect(self.show_context_menu)
         layout.addWidget(self.tabla)
@@ -107,9 +116,7 @@ class EntradasView(QWidget):
 
     def eliminar_columna(self):
         # Obtener los nombres de las columnas
-        headers = []
-        for col in range(self.tabla.columnCount()):
-            headers.append(self.tabla.horizontalHeaderItem(col).text())
+        headers = list(MovimientosModel.ENCABEZADOS)
         
         # Mostrar diálogo para seleccionar la columna
         columna, ok = QInputDialog.getItem(
@@ -136,8 +143,7 @@ class EntradasView(QWidget):
             
             if reply == QMessageBox.StandardButton.Yes:
                 # Eliminar los datos de la columna
-                for row in range(self.tabla.rowCount()):
-                    self.tabla.setItem(row, col_index, QTableWidgetItem(""))
+                self.modelo.vaciar_columna(col_index)
 
     def eliminar_tabla(self):
         # Confirmar la eliminación
@@ -151,9 +157,7 @@ class EntradasView(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             # Eliminar todos los datos manteniendo la estructura
-            for row in range(self.tabla.rowCount()):
-                for col in range(self.tabla.columnCount()):
-                    self.tabla.setItem(row, col, QTableWidgetItem(""))
+            self.modelo.vaciar_tabla()
 
     def agregar_entrada(self):
         codigo = self.codigo_input.text()
@@ -173,29 +177,15 @@ class EntradasView(QWidget):
 
         with self.db.connect() as conn:
             cursor = conn.cursor()
-            # Obtener la descripción del producto
-            cursor.execute("SELECT descripcion FROM productos WHERE codigo = ?", (codigo,))
-            result = cursor.fetchone()
-            if result:
-                descripcion = result[0]
+            producto = repositorio.obtener_producto(cursor, codigo)
+            if producto:
                 try:
-                    cursor.execute("""
-                        INSERT INTO entradas (codigo, descripcion, cantidad, fecha)
-                        VALUES (?, ?, ?, ?)
-                    """, (codigo, descripcion, cantidad, fecha))
-                    
-                    # Actualizar la tabla de productos
-                    cursor.execute("""
-                        UPDATE productos
-                        SET entradas_totales = entradas_totales + ?, 
-                            stock = stock + ?,
-                            valor_total = (stock + ?) * precio_compra
-                        WHERE codigo = ?
-                    """, (cantidad, cantidad, cantidad, codigo))
+                    # Registra la entrada y actualiza los totales del producto
+                    nuevo_id = movimientos.registrar(cursor, "entradas", codigo, producto.descripcion, cantidad, fecha)
                     
                     conn.commit()
                     QMessageBox.information(self, "Éxito", "Entrada agregada exitosamente")
-                    self.load_data()
+                    self.modelo.insertar_por_id(nuevo_id)
                     self.data_changed.emit()
                     
                     # Limpiar campos
@@ -208,32 +198,16 @@ class EntradasView(QWidget):
                 QMessageBox.warning(self, "Error", "El código del producto no existe")
 
     def load_data(self):
-        with self.db.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT codigo, descripcion, cantidad, fecha FROM entradas ORDER BY fecha DESC, id DESC")
-            entradas = cursor.fetchall()
-
-            self.tabla.setRowCount(len(entradas))
-
-            for row_idx, entrada in enumerate(entradas):
-                codigo, descripcion, cantidad, fecha = entrada
-
-                for col_idx, value in enumerate([codigo, descripcion, cantidad, fecha]):
-                    item = QTableWidgetItem(str(value))
-                    self.tabla.setItem(row_idx, col_idx, item)
+        self.modelo.recargar()
 
     def search_entry(self):
-        search_text = self.search_input.text().lower()
-        for row in range(self.tabla.rowCount()):
-            codigo_item = self.tabla.item(row, 0)
-            descripcion_item = self.tabla.item(row, 1)
-            if codigo_item and descripcion_item:
-                codigo = codigo_item.text().lower()
-                descripcion = descripcion_item.text().lower()
-                if search_text in codigo or search_text in descripcion:
-                    self.tabla.showRow(row)
-                else:
-                    self.tabla.hideRow(row)
+        search_text = self.search_input.text().strip()
+        if search_text:
+            with self.db.connect() as conn:
+                condicion, params = condicion_movimientos(conn, search_text, ("codigo", "descripcion"))
+            self.modelo.filtrar(condicion, params)
+        else:
+            self.modelo.filtrar("")
 
     def show_context_menu(self, position):
         menu = QMenu()
@@ -247,14 +221,13 @@ class EntradasView(QWidget):
             self.delete_entry()
 
     def edit_entry(self):
-        row = self.tabla.currentRow()
-        if row == -1:
+        row = self.tabla.currentIndex().row()
+        registro = self.modelo.registro(row)
+        if registro is None:
             QMessageBox.warning(self, "Advertencia", "Seleccione una entrada para editar.")
             return
 
-        codigo = self.tabla.item(row, 0).text()
-        cantidad_original = int(self.tabla.item(row, 2).text())
-        fecha = self.tabla.item(row, 3).text()
+        id_movimiento, codigo, _, cantidad_original, _ = registro
 
         new_cantidad, ok = QInputDialog.getInt(self, "Editar Cantidad", "Nueva Cantidad:", cantidad_original, 1)
         if ok:
@@ -264,26 +237,11 @@ class EntradasView(QWidget):
                     # Iniciar transacción
                     cursor.execute("BEGIN TRANSACTION")
                     
-                    # Actualizar entrada
-                    cursor.execute("""
-                        UPDATE entradas
-                        SET cantidad = ?
-                        WHERE codigo = ? AND fecha = ?
-                    """, (new_cantidad, codigo, fecha))
-                    
-                    # Actualizar productos
-                    diferencia = new_cantidad - cantidad_original
-                    cursor.execute("""
-                        UPDATE productos
-                        SET entradas_totales = entradas_totales + ?,
-                            stock = stock + ?,
-                            valor_total = (stock + ?) * precio_compra,
-                            utilidad = (salidas_totales * precio_venta) - ((entradas_totales + ?) * precio_compra)
-                        WHERE codigo = ?
-                    """, (diferencia, diferencia, diferencia, diferencia, codigo))
+                    # Actualizar entrada y totales del producto
+                    movimientos.modificar_cantidad(cursor, "entradas", id_movimiento, new_cantidad)
                     
                     cursor.execute("COMMIT")
-                    self.load_data()
+                    self.modelo.actualizar_fila(row)
                     self.data_changed.emit()
                     
                 except sqlite3.Error as e:
@@ -291,13 +249,13 @@ class EntradasView(QWidget):
                     QMessageBox.warning(self, "Error", f"Error en la base de datos: {str(e)}")
 
     def delete_entry(self):
-        row = self.tabla.currentRow()
-        if row == -1:
+        row = self.tabla.currentIndex().row()
+        registro = self.modelo.registro(row)
+        if registro is None:
             QMessageBox.warning(self, "Advertencia", "Seleccione una entrada para eliminar.")
             return
 
-        codigo = self.tabla.item(row, 0).text()
-        fecha = self.tabla.item(row, 3).text()
+        id_movimiento, codigo, _, cantidad, fecha = registro
 
         reply = QMessageBox.question(
             self,
@@ -310,7 +268,7 @@ class EntradasView(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             with self.db.connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute("DELETE FROM entradas WHERE codigo = ? AND fecha = ?", (codigo, fecha))
+                movimientos.eliminar(cursor, "entradas", id_movimiento)
                 conn.commit()
-                self.load_data()
+                self.modelo.eliminar_fila(row)
                 self.data_changed.emit()
\ No newline at end of file
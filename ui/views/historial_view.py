@@ -1,18 +1,70 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                             QTableWidget, QTableWidgetItem, QGroupBox, QPushButton,
-                            QStackedWidget, QHeaderView, QScrollArea)
-from PyQt6.QtCore import Qt, QDateTime
+                            QStackedWidget, QHeaderView, QScrollArea, QComboBox)
+from PyQt6.QtCore import Qt, QDateTime, QTimer, QThreadPool, QPointF
 from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis, QDateTimeAxis
 from PyQt6.QtGui import QPainter, QColor
 from database.connection import DatabaseConnection
+from database.consultas import consultar_historial_movimientos
+from database.busqueda import condicion_productos
+from database import analisis_producto
+from ui.tareas import TareaConsulta
 import sqlite3
 
 class HistorialView(QWidget):
+    RETARDO_BUSQUEDA_MS = 250
+    MAX_PUNTOS_STOCK = 500
+    # (texto, días) de la ventana de la gráfica de comparación; None es toda la historia
+    VENTANAS_COMPARACION = [("Todo el historial", None), ("Últimos 90 días", 90), ("Últimos 30 días", 30)]
+    UMBRAL_ANIMACION_PUNTOS = 200  # Con más puntos la gráfica de stock se dibuja sin animación
+    # Se aplica una sola vez, al crear el cuadro de observaciones
+    ESTILO_OBSERVACIONES = """
+        QGroupBox {
+            background-color: #ffffff;
+            border: 1px solid #e1e4e8;
+            border-radius: 10px;
+            margin-top: 15px;
+            padding: 15px;
+        }
+        QGroupBox::title {
+            background-color: #ffffff;
+            padding: 5px 10px;
+            color: #2d3748;
+            font-weight: bold;
+            font-size: 14px;
+            subcontrol-origin: margin;
+            subcontrol-position: top center;
+            margin-top: -12px;
+        }
+        QLabel {
+            background-color: #f8f9fa;
+            padding: 20px;
+            border-radius: 12px;
+            font-size: 13px;
+            line-height: 1.5;
+            color: #1a202c;
+            border: 1px solid #edf2f7;
+        }
+        QLabel:hover {
+            background-color: #edf2f7;
+        }
+    """
+
     def __init__(self):
         super().__init__()
+        self.chart_stock = None  # Página de gráficas, creada al mostrar el primer producto
         self.init_ui()
         self.db = DatabaseConnection()
 
+        # La búsqueda se ejecuta en segundo plano cuando el usuario deja de escribir
+        self._texto_busqueda = ""
+        self._generacion = 0
+        self._tarea_busqueda = None
+        self._temporizador = QTimer(self)
+        self._temporizador.setSingleShot(True)
+        self._temporizador.setInterval(self.RETARDO_BUSQUEDA_MS)
+        self._temporizador.timeout.connect(self._lanzar_busqueda)
+
     def init_ui(self):
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
@@ -46,8 +98,15 @@ class HistorialView(QWidget):
         btn_ver_grafica.setStyleSheet("padding: 5px 15px;")
         btn_ver_grafica.clicked.connect(self.mostrar_grafica)
         
+        self.ventana_combo = QComboBox()
+        for texto, dias in self.VENTANAS_COMPARACION:
+            self.ventana_combo.addItem(texto, dias)
+        self.ventana_combo.setToolTip("Movimientos que cuenta la gráfica de comparación")
+        self.ventana_combo.currentIndexChanged.connect(self.cambiar_ventana)
+
         view_layout.addWidget(btn_ver_tabla)
         view_layout.addWidget(btn_ver_grafica)
+        view_layout.addWidget(self.ventana_combo)
         view_group.setLayout(view_layout)
         
         control_panel.addWidget(view_group)
@@ -93,345 +152,229 @@ class HistorialView(QWidget):
         return chart_view
 
     def buscar_historial(self, texto_busqueda):
+        self._texto_busqueda = texto_busqueda
         if len(texto_busqueda) >= 3:
-            with self.db.connect() as conn:
-                cursor = conn.cursor()
+            self._temporizador.start()
+        else:
+            self._temporizador.stop()
+            self._cancelar_busqueda()
+
+    def _cancelar_busqueda(self):
+        # Los resultados de búsquedas anteriores ya no se aplican
+        self._generacion += 1
+        if self._tarea_busqueda is not None:
+            self._tarea_busqueda.cancelar()
+            self._tarea_busqueda = None
+
+    def _lanzar_busqueda(self):
+        self._cancelar_busqueda()
+        texto_busqueda = self._texto_busqueda
+
+        def consultar(conn):
+            condicion, params = condicion_productos(conn, texto_busqueda)
+            cursor = conn.cursor()
+            return [tuple(fila) for fila in consultar_historial_movimientos(cursor, condicion, params)]
+
+        tarea = TareaConsulta(self.db, self._generacion, consultar)
+        tarea.senales.terminada.connect(self._mostrar_resultados)
+        tarea.senales.fallida.connect(self._busqueda_fallida)
+        self._tarea_busqueda = tarea
+        QThreadPool.globalInstance().start(tarea)
+
+    def _busqueda_fallida(self, generacion, mensaje):
+        if generacion != self._generacion:
+            return
+        self._tarea_busqueda = None
+        self.historial_table.setRowCount(0)  # No dejar a la vista los resultados de otro texto
+        print(f"Error en la búsqueda del historial: {mensaje}")
+
+    def _mostrar_resultados(self, generacion, resultados):
+        if generacion != self._generacion:
+            return  # Resultado de una búsqueda ya reemplazada
+        self._tarea_busqueda = None
+
+        self.historial_table.setRowCount(len(resultados))
+        for row, dato in enumerate(resultados):
+            for col, value in enumerate(dato):
+                item = QTableWidgetItem()
                 
-                # Consulta unificada de movimientos
-                query = """
-                WITH movimientos AS (
-                    -- Entradas
-                    SELECT 
-                        e.fecha,
-                        p.codigo,
-                        p.descripcion,
-                        'Entrada' as tipo_movimiento,
-                        e.cantidad,
-                        p.stock as stock_final,
-                        p.precio_compra,
-                        p.precio_venta,
-                        (e.cantidad * p.precio_compra) as valor_movimiento,
-                        (p.stock * p.precio_compra) as valor_stock,
-                        0 as utilidad
-                    FROM productos p
-                    JOIN entradas e ON p.codigo = e.codigo
-                    WHERE p.codigo LIKE ? OR p.descripcion LIKE ?
+                # Formato especial para valores monetarios
+                if col in [6, 7, 8, 9, 10]:  # Precios, valores y utilidad
+                    item.setText(f"${value:,.3f}")
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                # Formato especial para cantidades
+                elif col == 4:  # Cantidad
+                    item.setText(f"{value:,}")
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                else:
+                    item.setText(str(value))
                     
-                    UNION ALL
-                    
-                    -- Salidas
-                    SELECT 
-                        s.fecha,
-                        p.codigo,
-                        p.descripcion,
-                        'Salida' as tipo_movimiento,
-                        s.cantidad * -1,
-                        p.stock as stock_final,
-                        p.precio_compra,
-                        p.precio_venta,
-                        (s.cantidad * p.precio_venta) as valor_movimiento,
-                        (p.stock * p.precio_compra) as valor_stock,
-                        ((s.cantidad * p.precio_venta) - (s.cantidad * p.precio_compra)) as utilidad
-                    FROM productos p
-                    JOIN salidas s ON p.codigo = s.codigo
-                    WHERE p.codigo LIKE ? OR p.descripcion LIKE ?
-                )
-                SELECT * FROM movimientos
-                ORDER BY fecha DESC
-                """
-                
-                cursor.execute(query, (
-                    f'%{texto_busqueda}%', 
-                    f'%{texto_busqueda}%',
-                    f'%{texto_busqueda}%', 
-                    f'%{texto_busqueda}%'
-                ))
-                
-                resultados = cursor.fetchall()
-                
-                self.historial_table.setRowCount(len(resultados))
-                for row, dato in enumerate(resultados):
-                    for col, value in enumerate(dato):
-                        item = QTableWidgetItem()
-                        
-                        # Formato especial para valores monetarios
-                        if col in [6, 7, 8, 9, 10]:  # Precios, valores y utilidad
-                            item.setText(f"${value:,.3f}")
-                            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                        # Formato especial para cantidades
-                        elif col == 4:  # Cantidad
-                            item.setText(f"{value:,}")
-                            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                        else:
-                            item.setText(str(value))
-                            
-                        self.historial_table.setItem(row, col, item)
+                self.historial_table.setItem(row, col, item)
 
     def mostrar_grafica(self):
         codigo = self.search_input.text()
         if not codigo:
             return
-            
-        # Limpiar el layout de gráficas existente
-        for i in reversed(range(self.graficas_layout.count())): 
-            self.graficas_layout.itemAt(i).widget().setParent(None)
 
         with self.db.connect() as conn:
-            cursor = conn.cursor()
-            
-            # Contenedor para las gráficas superiores
-            top_charts_container = QWidget()
-            top_charts_layout = QHBoxLayout(top_charts_container)
-            
-            # Gráfica de stock
-            chart_stock = self.crear_grafica_stock(cursor, codigo)
-            chart_view1 = self.crear_chart_view(chart_stock)
-            top_charts_layout.addWidget(chart_view1)
-            
-            # Gráfica de comparación con otros productos
-            chart_comparacion = self.crear_grafica_comparacion_productos(cursor, codigo)  # Añadido el parámetro codigo
-            chart_view2 = self.crear_chart_view(chart_comparacion, 350)
-            
-            self.graficas_layout.addWidget(top_charts_container)
-            self.graficas_layout.addWidget(chart_view2)
-            
-            # Cuadro de observaciones
-            observaciones = self.generar_observaciones(cursor, codigo)
-            observaciones_group = QGroupBox("Observaciones")
-            observaciones_group.setStyleSheet("""
-                QGroupBox {
-                    background-color: #ffffff;
-                    border: 1px solid #e1e4e8;
-                    border-radius: 10px;
-                    margin-top: 15px;
-                    padding: 15px;
-                }
-                QGroupBox::title {
-                    background-color: #ffffff;
-                    padding: 5px 10px;
-                    color: #2d3748;
-                    font-weight: bold;
-                    font-size: 14px;
-                    subcontrol-origin: margin;
-                    subcontrol-position: top center;
-                    margin-top: -12px;
-                }
-            """)
-            
-            observaciones_layout = QVBoxLayout()
-            observaciones_layout.setContentsMargins(15, 20, 15, 15)
-            observaciones_layout.setSpacing(10)
-            
-            observaciones_label = QLabel(observaciones)
-            observaciones_label.setWordWrap(True)
-            observaciones_label.setTextFormat(Qt.TextFormat.RichText)
-            observaciones_label.setStyleSheet("""
-                QLabel {
-                    background-color: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 12px;
-                    font-size: 13px;
-                    line-height: 1.5;
-                    color: #1a202c;
-                    border: 1px solid #edf2f7;
-                }
-                QLabel:hover {
-                    background-color: #edf2f7;
-                    transition: background-color 0.3s ease;
-                }
-            """)
-            
-            observaciones_layout.addWidget(observaciones_label)
-            observaciones_group.setLayout(observaciones_layout)
-            self.graficas_layout.addWidget(observaciones_group)
-                
+            # Serie de stock y observaciones salen de un solo recorrido, memorizado por código
+            analisis = analisis_producto.analizar(conn, codigo, self.MAX_PUNTOS_STOCK)
+            datos_comparacion = analisis_producto.comparacion(conn, codigo, self.ventana_combo.currentData())
+
+        # La página se crea una vez; entre productos solo se reemplazan datos y texto
+        if self.chart_stock is None:
+            self.crear_graficas()
+        self.actualizar_grafica_stock(analisis["serie"])
+        self.actualizar_grafica_comparacion(datos_comparacion)
+
+        self.observaciones_label.setText(self.generar_observaciones(analisis["observaciones"]))
+
         self.stacked_widget.setCurrentIndex(1)
 
 
-    def crear_grafica_stock(self, cursor, codigo):
-        query_stock = """
-        WITH movimientos AS (
-            SELECT fecha, cantidad as cambio_stock
-            FROM entradas
-            WHERE codigo = ?
-            UNION ALL
-            SELECT fecha, -cantidad as cambio_stock
-            FROM salidas
-            WHERE codigo = ?
-        )
-        SELECT fecha,
-                SUM(cambio_stock) OVER (ORDER BY fecha) as stock_acumulado
-        FROM movimientos
-        ORDER BY fecha
-        """
-        
-        cursor.execute(query_stock, (codigo, codigo))
-        datos_stock = cursor.fetchall()
-        
+    def cambiar_ventana(self):
+        if self.stacked_widget.currentIndex() == 1:
+            self.mostrar_grafica()
+
+    def crear_graficas(self):
+        # Contenedor para las gráficas superiores
+        top_charts_container = QWidget()
+        top_charts_layout = QHBoxLayout(top_charts_container)
+
+        # Gráfica de stock
+        self.chart_stock = self.crear_grafica_stock()
+        top_charts_layout.addWidget(self.crear_chart_view(self.chart_stock))
+
+        # Gráfica de comparación con otros productos
+        self.chart_comparacion = self.crear_grafica_comparacion_productos()
+
+        self.graficas_layout.addWidget(top_charts_container)
+        self.graficas_layout.addWidget(self.crear_chart_view(self.chart_comparacion, 350))
+
+        # Cuadro de observaciones; al cambiar de producto solo cambia el texto
+        observaciones_group = QGroupBox("Observaciones")
+        observaciones_group.setStyleSheet(self.ESTILO_OBSERVACIONES)
+
+        observaciones_layout = QVBoxLayout()
+        observaciones_layout.setContentsMargins(15, 20, 15, 15)
+        observaciones_layout.setSpacing(10)
+
+        self.observaciones_label = QLabel()
+        self.observaciones_label.setWordWrap(True)
+        self.observaciones_label.setTextFormat(Qt.TextFormat.RichText)
+
+        observaciones_layout.addWidget(self.observaciones_label)
+        observaciones_group.setLayout(observaciones_layout)
+        self.graficas_layout.addWidget(observaciones_group)
+
+    def crear_grafica_stock(self):
         chart = QChart()
-        series = QLineSeries()
+        self.series_stock = QLineSeries()
         
         # Establecer color y estilo
-        pen = series.pen()
+        pen = self.series_stock.pen()
         pen.setWidth(2)
         pen.setColor(QColor("#3498db"))
-        series.setPen(pen)
-        series.setName("Stock")
+        self.series_stock.setPen(pen)
+        self.series_stock.setName("Stock")
         
-        for fecha, stock in datos_stock:
-            dt = QDateTime.fromString(fecha, "yyyy-MM-dd HH:mm:ss")
-            series.append(dt.toMSecsSinceEpoch(), stock)
-        
-        chart.addSeries(series)
+        chart.addSeries(self.series_stock)
         
         # Configurar ejes
-        axis_x = QDateTimeAxis()
-        axis_x.setFormat("dd/MM/yyyy")
-        axis_x.setTitleText("Fecha")
-        chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
-        series.attachAxis(axis_x)
+        self.eje_fecha_stock = QDateTimeAxis()
+        self.eje_fecha_stock.setFormat("dd/MM/yyyy")
+        self.eje_fecha_stock.setTitleText("Fecha")
+        chart.addAxis(self.eje_fecha_stock, Qt.AlignmentFlag.AlignBottom)
+        self.series_stock.attachAxis(self.eje_fecha_stock)
         
-        axis_y = QValueAxis()
-        axis_y.setTitleText("Stock")
-        axis_y.setLabelsAngle(-90)
-        chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
-        series.attachAxis(axis_y)
+        self.eje_stock = QValueAxis()
+        self.eje_stock.setTitleText("Stock")
+        self.eje_stock.setLabelsAngle(-90)
+        chart.addAxis(self.eje_stock, Qt.AlignmentFlag.AlignLeft)
+        self.series_stock.attachAxis(self.eje_stock)
         
         chart.setTitle("Evolución del Stock")
-        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
         chart.legend().setAlignment(Qt.AlignmentFlag.AlignBottom)
         
         return chart
 
-    def crear_grafica_comparacion_productos(self, cursor, codigo_seleccionado):
-            query_comparacion = """
-            WITH total_movimientos AS (
-                SELECT 
-                    p.codigo, 
-                    p.descripcion,
-                    COALESCE(SUM(e.cantidad), 0) as entradas,
-                    COALESCE(SUM(s.cantidad), 0) as salidas,
-                    CASE WHEN p.codigo = ? THEN 1 ELSE 0 END as es_seleccionado,
-                    COALESCE(SUM(e.cantidad), 0) + COALESCE(SUM(s.cantidad), 0) as total_movimientos
-                FROM productos p
-                LEFT JOIN entradas e ON p.codigo = e.codigo
-                LEFT JOIN salidas s ON p.codigo = s.codigo
-                GROUP BY p.codigo, p.descripcion
-            )
-            SELECT 
-                codigo,
-                descripcion,
-                entradas,
-                salidas,
-                es_seleccionado,
-                total_movimientos
-            FROM total_movimientos
-            WHERE codigo = ?
-            OR codigo IN (
-                SELECT codigo
-                FROM total_movimientos
-                WHERE codigo != ?
-                ORDER BY total_movimientos DESC
-                LIMIT 4
-            )
-            ORDER BY es_seleccionado DESC, total_movimientos DESC
-            """
-            
-            cursor.execute(query_comparacion, (codigo_seleccionado, codigo_seleccionado, codigo_seleccionado))
-            datos_comparacion = cursor.fetchall()
-            
+    def actualizar_grafica_stock(self, datos_stock):
+        # La serie ya viene reducida a MAX_PUNTOS_STOCK (LTTB); se carga de una vez con replace()
+        puntos = [QPointF(QDateTime.fromString(fecha, "yyyy-MM-dd").toMSecsSinceEpoch(), stock)
+                  for fecha, stock in datos_stock]
+        animar = len(puntos) <= self.UMBRAL_ANIMACION_PUNTOS
+        self.chart_stock.setAnimationOptions(QChart.AnimationOption.SeriesAnimations if animar
+                                             else QChart.AnimationOption.NoAnimation)
+        self.series_stock.replace(puntos)
+
+        if puntos:
+            self.eje_fecha_stock.setRange(QDateTime.fromMSecsSinceEpoch(int(puntos[0].x())),
+                                          QDateTime.fromMSecsSinceEpoch(int(puntos[-1].x())))
+            minimo = min(stock for _, stock in datos_stock)
+            maximo = max(stock for _, stock in datos_stock)
+            margen = (maximo - minimo) * 0.05 or 1
+            self.eje_stock.setRange(minimo - margen, maximo + margen)
+
+    def crear_grafica_comparacion_productos(self):
             chart = QChart()
             
             series_entradas = QBarSeries()
             series_salidas = QBarSeries()
             
-            set_entradas = QBarSet("Entradas")
-            set_entradas.setColor(QColor("#2ecc71"))
+            self.set_entradas = QBarSet("Entradas")
+            self.set_entradas.setColor(QColor("#2ecc71"))
             
-            set_salidas = QBarSet("Salidas")
-            set_salidas.setColor(QColor("#e74c3c"))
+            self.set_salidas = QBarSet("Salidas")
+            self.set_salidas.setColor(QColor("#e74c3c"))
             
-            categorias = []
-            for codigo, descripcion, entradas, salidas, es_seleccionado, _ in datos_comparacion:
-                set_entradas.append(entradas)
-                set_salidas.append(salidas)
-                
-                # Resaltar el producto seleccionado en la descripción
-                nombre_categoria = descripcion[:15] + "..." if len(descripcion) > 15 else descripcion
-                if es_seleccionado:
-                    nombre_categoria = "➤ " + nombre_categoria
-                categorias.append(nombre_categoria)
-            
-            series_entradas.append(set_entradas)
-            series_salidas.append(set_salidas)
+            series_entradas.append(self.set_entradas)
+            series_salidas.append(self.set_salidas)
             
             chart.addSeries(series_entradas)
             chart.addSeries(series_salidas)
             
-            axis_x = QBarCategoryAxis()
-            axis_x.append(categorias)
-            chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
-            series_entradas.attachAxis(axis_x)
-            series_salidas.attachAxis(axis_x)
+            self.eje_productos = QBarCategoryAxis()
+            chart.addAxis(self.eje_productos, Qt.AlignmentFlag.AlignBottom)
+            series_entradas.attachAxis(self.eje_productos)
+            series_salidas.attachAxis(self.eje_productos)
             
-            axis_y = QValueAxis()
-            axis_y.setTitleText("Cantidad")
-            axis_y.setLabelsAngle(-90)
+            self.eje_cantidad = QValueAxis()
+            self.eje_cantidad.setTitleText("Cantidad")
+            self.eje_cantidad.setLabelsAngle(-90)
             
-            max_valor = max([max([e, s]) for _, _, e, s, _, _ in datos_comparacion])
-            axis_y.setRange(0, max_valor * 1.1)
+            chart.addAxis(self.eje_cantidad, Qt.AlignmentFlag.AlignLeft)
+            series_entradas.attachAxis(self.eje_cantidad)
+            series_salidas.attachAxis(self.eje_cantidad)
             
-            chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
-            series_entradas.attachAxis(axis_y)
-            series_salidas.attachAxis(axis_y)
-            
-            chart.setTitle("Comparación de Movimientos")
             chart.legend().setAlignment(Qt.AlignmentFlag.AlignBottom)
             chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
             
             return chart
 
-    def generar_observaciones(self, cursor, codigo):
-        query_observaciones = """
-        WITH movimientos AS (
-            SELECT e.fecha, 'Entrada' as tipo, e.cantidad,
-                p.precio_compra, p.precio_venta
-            FROM entradas e
-            JOIN productos p ON e.codigo = p.codigo
-            WHERE e.codigo = ?
-            UNION ALL
-            SELECT s.fecha, 'Salida' as tipo, s.cantidad,
-                p.precio_compra, p.precio_venta
-            FROM salidas s
-            JOIN productos p ON s.codigo = p.codigo
-            WHERE s.codigo = ?
-        ),
-        rotacion AS (
-            SELECT 
-                AVG(JULIANDAY(fecha)) as tiempo_promedio_permanencia,
-                CAST(SUM(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE 0 END) AS FLOAT) / 
-                NULLIF(SUM(CASE WHEN tipo = 'Salida' THEN cantidad ELSE 0 END), 0) as indice_rotacion
-            FROM movimientos
-        )
-        SELECT 
-            COUNT(*) as total_movimientos,
-            SUM(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE 0 END) as total_entradas,
-            SUM(CASE WHEN tipo = 'Salida' THEN cantidad ELSE 0 END) as total_salidas,
-            AVG(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE NULL END) as promedio_entradas,
-            AVG(CASE WHEN tipo = 'Salida' THEN cantidad ELSE NULL END) as promedio_salidas,
-            MIN(CASE WHEN tipo = 'Entrada' THEN precio_compra ELSE NULL END) as min_precio_compra,
-            MAX(CASE WHEN tipo = 'Entrada' THEN precio_compra ELSE NULL END) as max_precio_compra,
-            MIN(CASE WHEN tipo = 'Salida' THEN precio_venta ELSE NULL END) as min_precio_venta,
-            MAX(CASE WHEN tipo = 'Salida' THEN precio_venta ELSE NULL END) as max_precio_venta,
-            COALESCE(r.tiempo_promedio_permanencia, 0) as tiempo_promedio_permanencia,
-            COALESCE(r.indice_rotacion, 0) as indice_rotacion
-        FROM movimientos
-        LEFT JOIN rotacion r ON 1=1;
-        """
-        
-        cursor.execute(query_observaciones, (codigo, codigo))
-        datos = cursor.fetchone()
-        
+    def actualizar_grafica_comparacion(self, datos_comparacion):
+            categorias = []
+            for codigo, descripcion, entradas, salidas, es_seleccionado, _ in datos_comparacion:
+                # Resaltar el producto seleccionado en la descripción
+                nombre_categoria = descripcion[:15] + "..." if len(descripcion) > 15 else descripcion
+                if es_seleccionado:
+                    nombre_categoria = "➤ " + nombre_categoria
+                categorias.append(nombre_categoria)
+
+            self.set_entradas.remove(0, self.set_entradas.count())
+            self.set_salidas.remove(0, self.set_salidas.count())
+            self.set_entradas.append([float(fila[2]) for fila in datos_comparacion])
+            self.set_salidas.append([float(fila[3]) for fila in datos_comparacion])
+            self.eje_productos.clear()
+            self.eje_productos.append(categorias)
+
+            # En una ventana sin movimientos todos los valores son 0
+            max_valor = max([max([e, s]) for _, _, e, s, _, _ in datos_comparacion], default=0) or 1
+            self.eje_cantidad.setRange(0, max_valor * 1.1)
+
+            self.chart_comparacion.setTitle(
+                f"Comparación de Movimientos ({self.ventana_combo.currentText().lower()})")
+
+    def generar_observaciones(self, datos):
         # Función auxiliar para formatear valores con colores
         def format_value(value, format_str="{:.2f}", prefix="", suffix=""):
             if value is None or (isinstance(value, (int, float)) and value == 0):
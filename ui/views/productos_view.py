@@ -1,17 +1,20 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView, QSpacerItem, QSizePolicy, QDateEdit, QMenu, QDialog, QInputDialog)
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView, QMessageBox, QHeaderView, QSpacerItem, QSizePolicy, QDateEdit, QMenu, QDialog, QInputDialog)
 from PyQt6.QtGui import QAction, QPixmap  
 from PyQt6.QtCore import Qt, pyqtSignal, QDate
 from database.connection import DatabaseConnection
+from ui.models.productos_model import ProductosModel
+from database import repositorio
+from models.producto import Producto
 import sqlite3
-from PyQt6.QtCharts import QChart, QChartView, QBarSeries, QBarSet, QValueAxis, QBarCategoryAxis
 
 class ProductosView(QWidget):
     data_changed = pyqtSignal()
 
     def __init__(self):
         super().__init__()
-        self.init_ui()
         self.db = DatabaseConnection()
+        self.modelo = ProductosModel(self.db, self)
+        self.init_ui()
         self.load_data()
 
     def init_ui(self):
@@ -85,17 +88,15 @@ class ProductosView(QWidget):
 
         layout.addLayout(form_layout)
 
-        # Tabla de productos
-        self.tabla = QTableWidget()
-        self.tabla.setColumnCount(10)
-        self.tabla.setHorizontalHeaderLabels([
-            "Código", "Descripción", "Entradas", "Salidas", 
-            "Stock", "Precio Compra", "Precio Venta", "Valor Compra Total", "Valor Venta Total", "Utilidad"
-        ])
+        # Tabla de productos (el modelo solo carga y formatea las filas visibles)
+        self.tabla = QTableView()
+        self.tabla.setModel(self.modelo)
         self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.tabla.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.tabla.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.tabla.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tabla.customContextMenuRequested.connect(self.show_context_menu)
-        self.tabla.cellDoubleClicked.connect(self.show_product_details)
+        self.tabla.doubleClicked.connect(self.show_product_details)
         layout.addWidget(self.tabla)
 
     def setup_format_button(self):
@@ -115,9 +116,7 @@ class ProductosView(QWidget):
 
     def eliminar_columna(self):
         # Obtener los nombres de las columnas
-        headers = []
-        for col in range(self.tabla.columnCount()):
-            headers.append(self.tabla.horizontalHeaderItem(col).text())
+        headers = list(ProductosModel.ENCABEZADOS)
         
         # Mostrar diálogo para seleccionar la columna
         columna, ok = QInputDialog.getItem(
@@ -144,8 +143,7 @@ class ProductosView(QWidget):
             
             if reply == QMessageBox.StandardButton.Yes:
                 # Eliminar los datos de la columna
-                for row in range(self.tabla.rowCount()):
-                    self.tabla.setItem(row, col_index, QTableWidgetItem(""))
+                self.modelo.vaciar_columna(col_index)
 
     def eliminar_tabla(self):
         # Confirmar la eliminación
@@ -159,9 +157,7 @@ class ProductosView(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             # Eliminar todos los datos manteniendo la estructura
-            for row in range(self.tabla.rowCount()):
-                for col in range(self.tabla.columnCount()):
-                    self.tabla.setItem(row, col, QTableWidgetItem(""))
+            self.modelo.vaciar_tabla()
 
     def agregar_producto(self):
         codigo = self.codigo_input.text()
@@ -180,13 +176,8 @@ class ProductosView(QWidget):
         with self.db.connect() as conn:
             cursor = conn.cursor()
             try:
-                cursor.execute("""
-                    INSERT INTO productos (
-                        codigo, descripcion, precio_compra, precio_venta,
-                        entradas_totales, salidas_totales, stock, valor_total
-                    )
-                    VALUES (?, ?, ?, ?, 0, 0, 0, 0)
-                """, (codigo, descripcion, precio_compra, precio_venta))
+                repositorio.insertar_productos(cursor, [Producto(codigo, descripcion, precio_compra=precio_compra,
+                                                                 precio_venta=precio_venta)])
                 conn.commit()
                 QMessageBox.information(self, "Éxito", "Producto agregado exitosamente")
                 self.load_data()
@@ -202,83 +193,10 @@ class ProductosView(QWidget):
                 QMessageBox.warning(self, "Error", "El código del producto ya existe")
 
     def load_data(self):
-        with self.db.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM productos")
-            productos = cursor.fetchall()
-
-            self.tabla.setRowCount(len(productos) + 1)  # +1 para la fila de totales
-            total_entradas = 0
-            total_salidas = 0
-            total_stock = 0
-            total_precio_compra = 0
-            total_precio_venta = 0
-            total_precio_compra_total = 0
-            total_precio_venta_total = 0
-            total_utilidad = 0
-
-            for row, producto in enumerate(productos):
-                entradas_totales = producto["entradas_totales"]
-                salidas_totales = producto["salidas_totales"]
-                stock = producto["stock"]
-                precio_compra = producto["precio_compra"]
-                precio_venta = producto["precio_venta"]
-                valor_compra_total = entradas_totales * precio_compra
-                valor_venta_total = salidas_totales * precio_venta
-                utilidad = valor_venta_total - valor_compra_total
-
-                total_entradas += entradas_totales
-                total_salidas += salidas_totales
-                total_stock += stock
-                total_precio_compra += precio_compra
-                total_precio_venta += precio_venta
-                total_precio_compra_total += valor_compra_total
-                total_precio_venta_total += valor_venta_total
-                total_utilidad += utilidad
-
-                self.tabla.setItem(row, 0, QTableWidgetItem(producto["codigo"]))
-                self.tabla.setItem(row, 1, QTableWidgetItem(producto["descripcion"]))
-                self.tabla.setItem(row, 2, QTableWidgetItem(str(entradas_totales)))
-                self.tabla.setItem(row, 3, QTableWidgetItem(str(salidas_totales)))
-                self.tabla.setItem(row, 4, QTableWidgetItem(str(stock)))
-                self.tabla.setItem(row, 5, QTableWidgetItem(f"${precio_compra:,.3f}"))
-                self.tabla.setItem(row, 6, QTableWidgetItem(f"${precio_venta:,.3f}"))
-                self.tabla.setItem(row, 7, QTableWidgetItem(f"${valor_compra_total:,.3f}"))
-                self.tabla.setItem(row, 8, QTableWidgetItem(f"${valor_venta_total:,.3f}"))
-                self.tabla.setItem(row, 9, QTableWidgetItem(f"${utilidad:,.3f}"))
-
-            # Fila de totales
-            total_row = len(productos)
-            self.tabla.setItem(total_row, 0, QTableWidgetItem("TOTALES"))
-            self.tabla.setItem(total_row, 2, QTableWidgetItem(str(total_entradas)))
-            self.tabla.setItem(total_row, 3, QTableWidgetItem(str(total_salidas)))
-            self.tabla.setItem(total_row, 4, QTableWidgetItem(str(total_stock)))
-            self.tabla.setItem(total_row, 5, QTableWidgetItem(f"${total_precio_compra:,.3f}"))
-            self.tabla.setItem(total_row, 6, QTableWidgetItem(f"${total_precio_venta:,.3f}"))
-            self.tabla.setItem(total_row, 7, QTableWidgetItem(f"${total_precio_compra_total:,.3f}"))
-            self.tabla.setItem(total_row, 8, QTableWidgetItem(f"${total_precio_venta_total:,.3f}"))
-            self.tabla.setItem(total_row, 9, QTableWidgetItem(f"${total_utilidad:,.3f}"))
-
-            # Estilo en negrilla para la fila de totales
-            for col in range(10):
-                item = self.tabla.item(total_row, col)
-                if item:
-                    font = item.font()
-                    font.setBold(True)
-                    item.setFont(font)
+        self.modelo.recargar()
 
     def search_product(self):
-        search_text = self.search_input.text().lower()
-        for row in range(self.tabla.rowCount()):
-            codigo_item = self.tabla.item(row, 0)
-            descripcion_item = self.tabla.item(row, 1)
-            if codigo_item is not None and descripcion_item is not None:
-                codigo = codigo_item.text().lower()
-                descripcion = descripcion_item.text().lower()
-                if search_text in codigo or search_text in descripcion:
-                    self.tabla.showRow(row)
-                else:
-                    self.tabla.hideRow(row)
+        self.modelo.filtrar(self.search_input.text())
 
     def show_context_menu(self, position):
         menu = QMenu()
@@ -292,16 +210,14 @@ class ProductosView(QWidget):
             self.delete_product()
 
     def edit_product(self):
-        row = self.tabla.currentRow()
-        codigo = self.tabla.item(row, 0).text()
-        descripcion = self.tabla.item(row, 1).text()
-        precio_compra = self.tabla.item(row, 5).text().replace("$", "").replace(",", "")
-        precio_venta = self.tabla.item(row, 6).text().replace("$", "").replace(",", "")
-
-        self.codigo_input.setText(codigo)
-        self.descripcion_input.setText(descripcion)
-        self.precio_compra_input.setText(precio_compra)
-        self.precio_venta_input.setText(precio_venta)
+        row = self.tabla.currentIndex().row()
+        registro = self.modelo.registro(row)
+        if registro is None:
+            return
+        self.codigo_input.setText(registro.codigo)
+        self.descripcion_input.setText(registro.descripcion)
+        self.precio_compra_input.setText(f"{registro.precio_compra or 0:.3f}")
+        self.precio_venta_input.setText(f"{registro.precio_venta or 0:.3f}")
 
         self.btn_agregar.setText("Guardar Cambios")
         self.btn_agregar.clicked.disconnect()
@@ -323,39 +239,9 @@ class ProductosView(QWidget):
                 # Iniciar transacción
                 cursor.execute("BEGIN TRANSACTION")
                 
-                # Obtener los valores actuales
-                cursor.execute("""
-                    SELECT entradas_totales, salidas_totales, stock 
-                    FROM productos 
-                    WHERE codigo = ?
-                """, (codigo,))
-                result = cursor.fetchone()
-                if result:
-                    entradas_totales = result['entradas_totales']
-                    salidas_totales = result['salidas_totales']
-                    stock = result['stock']
-                    
-                    # Calcular los nuevos valores
-                    valor_total = stock * precio_compra
-                    utilidad = (salidas_totales * precio_venta) - (entradas_totales * precio_compra)
-                    
-                    # Actualizar producto
-                    cursor.execute("""
-                        UPDATE productos
-                        SET descripcion = ?, 
-                            precio_compra = ?, 
-                            precio_venta = ?,
-                            valor_total = ?,
-                            utilidad = ?
-                        WHERE codigo = ?
-                    """, (descripcion, precio_compra, precio_venta, valor_total, utilidad, codigo))
-                    
-                    # Actualizar descripción en tablas relacionadas
-                    cursor.execute("UPDATE entradas SET descripcion = ? WHERE codigo = ?", 
-                                 (descripcion, codigo))
-                    cursor.execute("UPDATE salidas SET descripcion = ? WHERE codigo = ?", 
-                                 (descripcion, codigo))
-                    
+                # Actualizar producto, sus valores derivados y la descripción en los movimientos
+                if not repositorio.actualizar_productos(cursor, [Producto(codigo, descripcion, precio_compra=precio_compra,
+                                                                           precio_venta=precio_venta)]):
                     cursor.execute("COMMIT")
                     QMessageBox.information(self, "Éxito", "Producto actualizado exitosamente")
                     self.load_data()
@@ -379,21 +265,23 @@ class ProductosView(QWidget):
         self.precio_venta_input.clear()
 
     def delete_product(self):
-        row = self.tabla.currentRow()
-        codigo = self.tabla.item(row, 0).text()
+        registro = self.modelo.registro(self.tabla.currentIndex().row())
+        if registro is None:
+            return
 
         with self.db.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM productos WHERE codigo = ?", (codigo,))
+            repositorio.eliminar_producto(cursor, registro.codigo)
             conn.commit()
             QMessageBox.information(self, "Éxito", "Producto eliminado exitosamente")
             self.load_data()
             self.data_changed.emit()
 
-    def show_product_details(self, row, col):
-        if col == 0 or col == 1:  # Código o Descripción
-            codigo = self.tabla.item(row, 0).text()
-            self.open_product_details_window(codigo)
+    def show_product_details(self, index):
+        if index.column() in (0, 1):  # Código o Descripción
+            registro = self.modelo.registro(index.row())
+            if registro is not None:
+                self.open_product_details_window(registro.codigo)
 
     def open_product_details_window(self, codigo):
         dialog = QDialog(self)
@@ -403,24 +291,18 @@ class ProductosView(QWidget):
         # Obtener información detallada del producto
         with self.db.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT p.*, 
-                       (SELECT COUNT(*) FROM entradas WHERE codigo = p.codigo) as compras_count,
-                       (SELECT COUNT(*) FROM salidas WHERE codigo = p.codigo) as ventas_count
-                FROM productos p
-                WHERE p.codigo = ?
-            """, (codigo,))
-            producto = cursor.fetchone()
+            producto = repositorio.obtener_producto(cursor, codigo)
 
             if producto:
+                compras, ventas = repositorio.contar_movimientos(cursor, codigo)
                 # Mostrar información básica
-                layout.addWidget(QLabel(f"Código: {producto['codigo']}"))
-                layout.addWidget(QLabel(f"Descripción: {producto['descripcion']}"))
-                layout.addWidget(QLabel(f"Stock actual: {producto['stock']}"))
-                layout.addWidget(QLabel(f"Precio de compra: ${producto['precio_compra']:.3f}"))
-                layout.addWidget(QLabel(f"Precio de venta: ${producto['precio_venta']:.3f}"))
-                layout.addWidget(QLabel(f"Compras totales: {producto['compras_count']}"))
-                layout.addWidget(QLabel(f"Ventas totales: {producto['ventas_count']}"))
+                layout.addWidget(QLabel(f"Código: {producto.codigo}"))
+                layout.addWidget(QLabel(f"Descripción: {producto.descripcion}"))
+                layout.addWidget(QLabel(f"Stock actual: {producto.stock}"))
+                layout.addWidget(QLabel(f"Precio de compra: ${producto.precio_compra:.3f}"))
+                layout.addWidget(QLabel(f"Precio de venta: ${producto.precio_venta:.3f}"))
+                layout.addWidget(QLabel(f"Compras totales: {compras}"))
+                layout.addWidget(QLabel(f"Ventas totales: {ventas}"))
 
                 # Obtener historial de compras y ventas
                 cursor.execute("""
@@ -432,19 +314,20 @@ class ProductosView(QWidget):
                 historial = cursor.fetchall()
 
                 layout.addWidget(QLabel("Últimas 10 transacciones:"))
-                for transaccion in historial:
-                    layout.addWidget(QLabel(f"{transaccion['tipo']} - Fecha: {transaccion['fecha']}, Cantidad: {transaccion['cantidad']}"))
+                for tipo, fecha, cantidad in historial:
+                    layout.addWidget(QLabel(f"{tipo} - Fecha: {fecha}, Cantidad: {cantidad}"))
 
-                # Crear gráfico de comparación
+                # Crear gráfico de comparación (QtCharts se carga solo al abrir un detalle)
+                from PyQt6.QtCharts import QChart, QChartView, QBarSeries, QBarSet, QValueAxis, QBarCategoryAxis
                 chart = QChart()
                 series = QBarSeries()
                 set_stock = QBarSet("Stock")
                 set_entradas = QBarSet("Entradas Totales")
                 set_salidas = QBarSet("Salidas Totales")
 
-                set_stock.append(producto['stock'])
-                set_entradas.append(producto['entradas_totales'])
-                set_salidas.append(producto['salidas_totales'])
+                set_stock.append(producto.stock)
+                set_entradas.append(producto.entradas_totales)
+                set_salidas.append(producto.salidas_totales)
 
                 series.append(set_stock)
                 series.append(set_entradas)
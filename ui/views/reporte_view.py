@@ -1,15 +1,19 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QTableWidget, QTableWidgetItem, 
+                            QPushButton, QTableView,
                             QFileDialog, QDateEdit, QSpacerItem, QSizePolicy,
                             QHeaderView, QMessageBox, QLineEdit, QMenu)
-from PyQt6.QtCore import Qt, QDate, QDateTime, QPoint
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QDate, QDateTime, QPoint, QCoreApplication, QThreadPool, QTimer
 from database.connection import DatabaseConnection
-from utils.reporte_excel_generator import ReporteExcelGenerator
+from database import catalogo_reportes
+from ui.models.reportes_model import ReportesModel
+from ui.tareas import ColaTrabajos, TareaConsulta
+from utils.cache_reportes import CacheReportes
 from datetime import datetime
 import os
 import shutil
 
+INTERVALO_BARRIDO_MS = 10 * 60 * 1000  # Cada cuánto se buscan reportes cuyo archivo ya no existe
+
 class ReporteView(QWidget):
     def __init__(self):
         super().__init__()
@@ -17,11 +21,29 @@ class ReporteView(QWidget):
         self.fecha_inicio = QDateEdit()
         self.fecha_fin = QDateEdit()
         self.reportes_table = None
-        self.reportes_generados = {}  # Diccionario para almacenar rutas de archivos generados
+        self.modelo = ReportesModel(self.db, self)
+        self.tarea_barrido = None
+        self.reportes_en_cola = {}  # id de trabajo -> (fecha, nombre_archivo, temporalidad, file_path)
+        self.trabajo_actual = None
+        self.cache = CacheReportes()  # Reportes ya generados, por período y versión de los datos
+        self.convertidor = None  # LibreOffice persistente, se abre con la primera exportación a PDF
+        self.exportaciones_pdf = set()  # ids de trabajos de conversión a PDF
+        self.cola = ColaTrabajos(self.db, self)
+        self.cola.iniciado.connect(self._reporte_iniciado)
+        self.cola.progreso.connect(self._reporte_progreso)
+        self.cola.terminado.connect(self._reporte_terminado)
+        self.cola.fallido.connect(self._reporte_fallido)
+        self.cola.cancelado.connect(self._reporte_cancelado)
+        self.cola.cambiada.connect(self._actualizar_estado_cola)
         self.init_ui()
-        self.crear_tabla_historial()
         self.cargar_historial()
 
+        # Barrido en segundo plano del catálogo: al abrir la pestaña y luego periódicamente
+        self.timer_barrido = QTimer(self)
+        self.timer_barrido.timeout.connect(self.podar_catalogo)
+        self.timer_barrido.start(INTERVALO_BARRIDO_MS)
+        self.podar_catalogo()
+
     def init_ui(self):
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
@@ -67,15 +89,24 @@ class ReporteView(QWidget):
         
         main_layout.addLayout(filters_layout)
 
-        # Nueva tabla de historial de reportes
-        self.reportes_table = QTableWidget()
-        self.reportes_table.setColumnCount(4)
-        self.reportes_table.setHorizontalHeaderLabels([
-            "FECHA", "DESCRIPCIÓN", "TEMPORALIDAD", "DESCARGAR"
-        ])
+        # Estado de la cola de reportes
+        estado_layout = QHBoxLayout()
+        self.estado_label = QLabel("")
+        estado_layout.addWidget(self.estado_label)
+        estado_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Policy.Expanding,
+                                                QSizePolicy.Policy.Minimum))
+        self.btn_cancelar_reporte = QPushButton("Cancelar")
+        self.btn_cancelar_reporte.clicked.connect(self.cancelar_reporte)
+        self.btn_cancelar_reporte.setVisible(False)
+        estado_layout.addWidget(self.btn_cancelar_reporte)
+        main_layout.addLayout(estado_layout)
+
+        # Catálogo de reportes (el modelo carga por páginas al desplazarse)
+        self.reportes_table = QTableView()
+        self.reportes_table.setModel(self.modelo)
+        self.reportes_table.verticalHeader().setVisible(False)
         self.reportes_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.reportes_table.customContextMenuRequested.connect(self.mostrar_menu_contextual)
-        self.reportes_table.itemChanged.connect(self.actualizar_descripcion)
         main_layout.addWidget(self.reportes_table)
         
         # Configurar el ancho de las columnas
@@ -84,8 +115,8 @@ class ReporteView(QWidget):
             header.setSectionResizeMode(i, QHeaderView.ResizeMode.Stretch)
 
         # Conectar eventos
-        self.reportes_table.cellEntered.connect(self.hover_descargar)
-        self.reportes_table.cellClicked.connect(self.descargar_reporte)
+        self.reportes_table.entered.connect(self.hover_descargar)
+        self.reportes_table.clicked.connect(self.descargar_reporte)
 
     def mostrar_mensaje(self, titulo, mensaje, tipo="info"):
         """Muestra un mensaje al usuario"""
@@ -114,258 +145,201 @@ class ReporteView(QWidget):
             dias_restantes = dias % 30
             return f"{meses} mes(es), {dias_restantes} día(s)"
 
-    def agregar_reporte_a_historial(self, fecha_actual, nombre_archivo, temporalidad, file_path):
-        """Agrega una nueva fila a la tabla de historial de reportes"""
-        row_position = self.reportes_table.rowCount()
-        self.reportes_table.insertRow(0)  # Insertar en la primera fila
-        
-        # Fecha
-        fecha_item = QTableWidgetItem(fecha_actual.toString("dd/MM/yyyy HH:mm:ss"))
-        self.reportes_table.setItem(0, 0, fecha_item)
-        
-        # Descripción
-        desc_item = QTableWidgetItem(nombre_archivo)
-        desc_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsEnabled)
-        self.reportes_table.setItem(0, 1, desc_item)
-        
-        # Temporalidad
-        temp_item = QTableWidgetItem(temporalidad)
-        self.reportes_table.setItem(0, 2, temp_item)
-        
-        # Texto de descarga
-        item_descargar = QTableWidgetItem("Descargar")
-        item_descargar.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        item_descargar.setForeground(QColor(0, 0, 255))  # Blue color
-        item_descargar.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-        self.reportes_table.setItem(0, 3, item_descargar)
-        
-        # Almacenar la ruta del archivo generado
-        self.reportes_generados[nombre_archivo] = file_path
+    def generar_reporte(self):
+        """Encola el reporte del período; se genera en segundo plano"""
+        fecha_inicio = self.fecha_inicio.date().toPyDate()
+        fecha_fin = self.fecha_fin.date().toPyDate()
+        fecha_actual = QDateTime.currentDateTime()
 
-        # Guardar el historial en la base de datos
-        self.guardar_historial_db(fecha_actual, nombre_archivo, temporalidad, file_path)
+        # Definir el nombre del archivo (con sufijo si ya hay otro en el mismo segundo)
+        base = f"reporte_{fecha_actual.toString('yyyyMMdd_HHmmss')}"
+        nombre_archivo = base
+        with self.db.connect() as conn:
+            en_uso = catalogo_reportes.descripciones_con_prefijo(conn.cursor(), base)
+        en_uso |= {datos[1] for datos in self.reportes_en_cola.values()}
+        sufijo = 1
+        while nombre_archivo in en_uso:
+            sufijo += 1
+            nombre_archivo = f"{base}_{sufijo}"
+        file_path = os.path.join(os.path.expanduser("~"), "Documents", f"{nombre_archivo}.xlsx")
 
-    def verificar_archivo_guardado(self, ruta_archivo):
-        """Verifica si el archivo existe y es accesible"""
-        try:
-            if os.path.exists(ruta_archivo):
-                # Intenta abrir el archivo para verificar acceso
-                with open(ruta_archivo, 'rb') as f:
-                    return True
-            return False
-        except Exception:
-            return False
+        temporalidad = self.calcular_temporalidad(fecha_inicio, fecha_fin)
+        fecha_registro = fecha_actual.toPyDateTime()
 
-    def generar_reporte(self):
+        def exportar(conn, progreso, cancelado):
+            # openpyxl se importa en el hilo del trabajo, no al abrir la pestaña
+            from utils.reporte_excel_generator import exportar_reporte_periodo
+            ruta = exportar_reporte_periodo(conn, fecha_inicio, fecha_fin, file_path, progreso, cancelado,
+                                            cache=self.cache)
+            # El checksum también se calcula aquí, fuera del hilo de la interfaz
+            return catalogo_reportes.registrar(conn.cursor(), fecha_registro, nombre_archivo, temporalidad, ruta), ruta
+
+        id_trabajo = self.cola.encolar(f"{fecha_inicio:%d/%m/%Y} - {fecha_fin:%d/%m/%Y}", exportar)
+        self.reportes_en_cola[id_trabajo] = (fecha_actual, nombre_archivo, temporalidad, file_path)
+
+    def cancelar_reporte(self):
+        """Cancela el reporte que se está generando; los demás siguen en cola"""
+        if self.trabajo_actual is not None:
+            self.cola.cancelar(self.trabajo_actual)
+
+    def _reporte_iniciado(self, id_trabajo):
+        self.trabajo_actual = id_trabajo
+        self._actualizar_estado_cola()
+
+    def _reporte_progreso(self, id_trabajo, hoja, filas):
+        nombre = self._nombre_trabajo(id_trabajo)
+        self.estado_label.setText(f"Generando {nombre}: {hoja}, {filas:,} filas{self._texto_en_espera()}")
+
+    def _reporte_terminado(self, id_trabajo, resultado):
+        if id_trabajo in self.exportaciones_pdf:
+            self.exportaciones_pdf.discard(id_trabajo)
+            self.mostrar_mensaje("Éxito", "PDF generados:\n" + "\n".join(resultado))
+            return
+        self.reportes_en_cola.pop(id_trabajo, None)
+        id_reporte, file_path = resultado
+        print(f"Reporte generado: {file_path}")
+        # El trabajo ya lo registró en el catálogo; solo falta mostrarlo
+        self.modelo.insertar_por_id(id_reporte)
+
+    def _reporte_fallido(self, id_trabajo, mensaje):
+        self.reportes_en_cola.pop(id_trabajo, None)
+        self.exportaciones_pdf.discard(id_trabajo)
+        self.mostrar_mensaje(
+            "Error",
+            f"Error al generar el reporte:\n{mensaje}",
+            "error"
+        )
+
+    def _reporte_cancelado(self, id_trabajo):
+        self.reportes_en_cola.pop(id_trabajo, None)
+        self.exportaciones_pdf.discard(id_trabajo)
+
+    def _nombre_trabajo(self, id_trabajo):
+        if id_trabajo in self.reportes_en_cola:
+            return self.reportes_en_cola[id_trabajo][1]
+        return dict(self.cola.pendientes()).get(id_trabajo, "")
+
+    def _texto_en_espera(self):
+        en_espera = len(self.cola.pendientes()) - (1 if self.trabajo_actual is not None else 0)
+        return f" ({en_espera} en cola)" if en_espera > 0 else ""
+
+    def _actualizar_estado_cola(self):
+        pendientes = dict(self.cola.pendientes())
+        if self.trabajo_actual not in pendientes:
+            self.trabajo_actual = None
+        if not pendientes:
+            self.estado_label.setText("")
+            self.btn_cancelar_reporte.setVisible(False)
+            return
+        if self.trabajo_actual is not None:
+            nombre = self._nombre_trabajo(self.trabajo_actual)
+            self.estado_label.setText(f"Generando {nombre}...{self._texto_en_espera()}")
+        else:
+            self.estado_label.setText(f"{len(pendientes)} reporte(s) en cola")
+        self.btn_cancelar_reporte.setVisible(self.trabajo_actual is not None)
+
+    def descargar_reporte(self, index):
+        if index.column() != ReportesModel.COLUMNA_DESCARGAR:
+            return
+        registro = self.modelo.registro(index.row())
+        if registro is None:
+            return
+        id_reporte, _, descripcion, _, file_path, _, _ = registro
+        save_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Guardar Reporte Excel",
+            os.path.join(os.path.expanduser("~"), "Downloads", f"{descripcion}.xlsx"),
+            "Excel Files (*.xlsx);;All Files (*)"
+        )
+        if not save_path:
+            return
         try:
-            fecha_inicio = self.fecha_inicio.date().toPyDate()
-            fecha_fin = self.fecha_fin.date().toPyDate()
-            fecha_actual = QDateTime.currentDateTime()
-            
-            # Obtener datos de la base de datos
-            with self.db.connect() as conn:
-                cursor = conn.cursor()
-                
-                # Consulta para inventario con cálculos correctos
-                cursor.execute("""
-                    SELECT 
-                        p.codigo,
-                        p.descripcion,
-                        COALESCE(SUM(CASE WHEN e.fecha BETWEEN ? AND ? THEN e.cantidad ELSE 0 END), 0) as entradas,
-                        COALESCE(SUM(CASE WHEN s.fecha BETWEEN ? AND ? THEN s.cantidad ELSE 0 END), 0) as salidas,
-                        p.stock,
-                        p.precio_compra,
-                        p.precio_venta,
-                        COALESCE(SUM(CASE WHEN e.fecha BETWEEN ? AND ? THEN e.cantidad * p.precio_compra ELSE 0 END), 0) as valor_compra_total,
-                        COALESCE(SUM(CASE WHEN s.fecha BETWEEN ? AND ? THEN s.cantidad * p.precio_venta ELSE 0 END), 0) as valor_venta_total,
-                        COALESCE(SUM(CASE WHEN s.fecha BETWEEN ? AND ? THEN s.cantidad * p.precio_venta ELSE 0 END), 0) - 
-                        COALESCE(SUM(CASE WHEN e.fecha BETWEEN ? AND ? THEN e.cantidad * p.precio_compra ELSE 0 END), 0) as utilidad
-                    FROM productos p
-                    LEFT JOIN entradas e ON p.codigo = e.codigo
-                    LEFT JOIN salidas s ON p.codigo = s.codigo
-                    GROUP BY p.codigo, p.descripcion, p.stock, p.precio_compra, p.precio_venta
-                """, (fecha_inicio, fecha_fin, fecha_inicio, fecha_fin, fecha_inicio, fecha_fin, 
-                        fecha_inicio, fecha_fin, fecha_inicio, fecha_fin, fecha_inicio, fecha_fin))
-                data_inventario = cursor.fetchall()
-                
-                # Consulta para entradas
-                cursor.execute("""
-                    SELECT 
-                        datetime(e.fecha) as fecha,
-                        e.codigo,
-                        p.descripcion,
-                        e.cantidad,
-                        p.precio_compra,
-                        e.cantidad * p.precio_compra as valor_total
-                    FROM entradas e
-                    JOIN productos p ON e.codigo = p.codigo
-                    WHERE e.fecha BETWEEN ? AND ?
-                    ORDER BY e.fecha DESC
-                """, (fecha_inicio, fecha_fin))
-                data_entradas = cursor.fetchall()
-                
-                # Consulta para salidas
-                cursor.execute("""
-                    SELECT 
-                        datetime(s.fecha) as fecha,
-                        s.codigo,
-                        p.descripcion,
-                        s.cantidad,
-                        p.precio_venta,
-                        s.cantidad * p.precio_venta as valor_total
-                    FROM salidas s
-                    JOIN productos p ON s.codigo = p.codigo
-                    WHERE s.fecha BETWEEN ? AND ?
-                    ORDER BY s.fecha DESC
-                """, (fecha_inicio, fecha_fin))
-                data_salidas = cursor.fetchall()
-
-            # Generar el reporte
-            generator = ReporteExcelGenerator()
-            wb = generator.generate_report(
-                data_inventario=data_inventario,
-                data_entradas=data_entradas,
-                data_salidas=data_salidas,
-                start_date=fecha_inicio,
-                end_date=fecha_fin
-            )
-            
-            # Definir el nombre del archivo
-            nombre_archivo = f"reporte_{fecha_actual.toString('yyyyMMdd_HHmmss')}"
-            
-            # Guardar el archivo temporalmente
-            file_path = os.path.join(os.path.expanduser("~"), "Documents", f"{nombre_archivo}.xlsx")
-            wb.save(file_path)
-            print(f"Reporte generado: {file_path}")
-            
-            # Calcular la temporalidad
-            temporalidad = self.calcular_temporalidad(fecha_inicio, fecha_fin)
-            
-            # Agregar el nuevo reporte al historial
-            self.agregar_reporte_a_historial(fecha_actual, nombre_archivo, temporalidad, file_path)
-                
+            shutil.copy(file_path, save_path)
+            self.mostrar_mensaje("Éxito", "El archivo se ha descargado exitosamente.", "info")
+        except FileNotFoundError:
+            # El barrido aún no lo había detectado: se quita del catálogo ahora
+            self.eliminar_reporte_db(id_reporte)
+            self.modelo.quitar_ids([id_reporte])
+            self.mostrar_mensaje("Error", "El archivo original no se encuentra.", "error")
         except Exception as e:
-            self.mostrar_mensaje(
-                "Error",
-                f"Error al generar el reporte:\n{str(e)}",
-                "error"
-            )
-
-    def descargar_reporte(self, row, column):
-        if column == 3:  # Columna "DESCARGAR"
-            descripcion = self.reportes_table.item(row, 1).text()
-            file_path = self.reportes_generados.get(descripcion)
-            if file_path and os.path.exists(file_path):
-                save_path, _ = QFileDialog.getSaveFileName(
-                    self,
-                    "Guardar Reporte Excel",
-                    os.path.join(os.path.expanduser("~"), "Downloads", f"{descripcion}.xlsx"),
-                    "Excel Files (*.xlsx);;All Files (*)"
-                )
-                if save_path:
-                    try:
-                        shutil.copy(file_path, save_path)
-                        self.mostrar_mensaje("Éxito", "El archivo se ha descargado exitosamente.", "info")
-                    except Exception as e:
-                        self.mostrar_mensaje("Error", f"Hubo un error al descargar el archivo: {str(e)}", "error")
-            else:
-                self.mostrar_mensaje("Error", "El archivo original no se encuentra.", "error")
-
-    def hover_descargar(self, row, column):
-        if column == 3:  # Columna "DESCARGAR"
-            item = self.reportes_table.item(row, column)
-            item.setForeground(QColor(255, 0, 0))  # Red color on hover
+            self.mostrar_mensaje("Error", f"Hubo un error al descargar el archivo: {str(e)}", "error")
+
+    def hover_descargar(self, index):
+        if index.column() == ReportesModel.COLUMNA_DESCARGAR:
+            self.modelo.resaltar(index.row())  # Rojo al pasar el mouse
         else:
-            for r in range(self.reportes_table.rowCount()):
-                item = self.reportes_table.item(r, 3)
-                item.setForeground(QColor(0, 0, 255))  # Reset to blue
+            self.modelo.resaltar(None)
 
     def buscar_en_historial(self):
-        """Filtra la tabla de historial de reportes según el texto de búsqueda"""
-        texto_busqueda = self.search_field.text().lower()
-        for row in range(self.reportes_table.rowCount()):
-            fecha_item = self.reportes_table.item(row, 0)
-            descripcion_item = self.reportes_table.item(row, 1)
-            if fecha_item and descripcion_item and (texto_busqueda in fecha_item.text().lower() or texto_busqueda in descripcion_item.text().lower()):
-                self.reportes_table.setRowHidden(row, False)
-            else:
-                self.reportes_table.setRowHidden(row, True)
-
-    def guardar_historial_db(self, fecha, descripcion, temporalidad, file_path):
-        """Guarda el historial de reportes en la base de datos"""
-        with self.db.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO historial_reportes (fecha, descripcion, temporalidad, file_path)
-                VALUES (?, ?, ?, ?)
-            """, (fecha.toString("dd/MM/yyyy HH:mm:ss"), descripcion, temporalidad, file_path))
-            conn.commit()
-
-    def actualizar_descripcion(self, item):
-        """Actualiza la descripción del reporte en la base de datos"""
-        if item.column() == 1:  # Columna "DESCRIPCIÓN"
-            fila = item.row()
-            nueva_descripcion = item.text()
-            fecha_item = self.reportes_table.item(fila, 0)
-            temporalidad_item = self.reportes_table.item(fila, 2)
-            if fecha_item and temporalidad_item:
-                fecha = fecha_item.text()
-                temporalidad = temporalidad_item.text()
-                file_path = self.reportes_generados.pop(self.reportes_table.item(fila, 1).text(), None)
-                self.reportes_generados[nueva_descripcion] = file_path
-                with self.db.connect() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE historial_reportes
-                        SET descripcion = ?
-                        WHERE fecha = ? AND temporalidad = ?
-                    """, (nueva_descripcion, fecha, temporalidad))
-                    conn.commit()
-
-    def cargar_historial(self):
-        """Carga el historial de reportes desde la base de datos"""
-        with self.db.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT fecha, descripcion, temporalidad, file_path FROM historial_reportes")
-            historial = cursor.fetchall()
-            for reporte in historial:
-                fecha = QDateTime.fromString(reporte[0], "dd/MM/yyyy HH:mm:ss")
-                descripcion = reporte[1]
-                temporalidad = reporte[2]
-                file_path = reporte[3]
-                self.agregar_reporte_a_historial(fecha, descripcion, temporalidad, file_path)
-
-    def crear_tabla_historial(self):
-        """Crea la tabla historial_reportes si no existe"""
-        with self.db.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS historial_reportes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    fecha TEXT,
-                    descripcion TEXT,
-                    temporalidad TEXT,
-                    file_path TEXT
-                )
-            """)
-            conn.commit()
+        """Filtra el catálogo de reportes según el texto de búsqueda"""
+        self.cargar_historial(self.search_field.text().strip())
+
+    def cargar_historial(self, texto_busqueda=""):
+        """Carga la primera página del catálogo; el resto se lee al desplazarse"""
+        self.modelo.filtrar(texto_busqueda)
+
+    def podar_catalogo(self):
+        """Quita en segundo plano los reportes cuyo archivo ya no existe"""
+        if self.tarea_barrido is not None:
+            return  # El barrido anterior sigue en curso
+        self.tarea_barrido = TareaConsulta(self.db, 0, catalogo_reportes.podar_inexistentes)
+        self.tarea_barrido.senales.terminada.connect(self._barrido_terminado)
+        self.tarea_barrido.senales.fallida.connect(self._barrido_fallido)
+        QThreadPool.globalInstance().start(self.tarea_barrido)
+
+    def _barrido_terminado(self, _, ids):
+        self.tarea_barrido = None
+        if ids:
+            print(f"Reportes sin archivo quitados del catálogo: {len(ids)}")
+            self.modelo.quitar_ids(ids)
+
+    def _barrido_fallido(self, _, mensaje):
+        self.tarea_barrido = None
+        print(f"Error al revisar el catálogo de reportes: {mensaje}")
 
     def mostrar_menu_contextual(self, posicion):
         """Muestra un menú contextual para eliminar una fila"""
-        indices = self.reportes_table.selectedIndexes()
+        indices = self.reportes_table.selectionModel().selectedIndexes()
         if indices:
             menu = QMenu()
             eliminar_action = menu.addAction("Eliminar fila")
+            pdf_action = menu.addAction("Exportar a PDF")
             action = menu.exec(self.reportes_table.viewport().mapToGlobal(posicion))
-            if action == eliminar_action:
+            # El barrido del catálogo puede haber quitado filas mientras el menú estaba abierto
+            indices = self.reportes_table.selectionModel().selectedIndexes()
+            if action == pdf_action:
+                filas = sorted({indice.row() for indice in indices})
+                registros = [self.modelo.registro(fila) for fila in filas]
+                self.exportar_pdf([registro[4] for registro in registros if registro is not None])
+            elif action == eliminar_action and indices:
                 fila = indices[0].row()
-                descripcion = self.reportes_table.item(fila, 1).text()
-                self.reportes_table.removeRow(fila)
-                self.eliminar_reporte_db(descripcion)
+                registro = self.modelo.registro(fila)
+                if registro is None:
+                    return
+                self.modelo.eliminar_fila(fila)
+                self.eliminar_reporte_db(registro[0])
+
+    def exportar_pdf(self, rutas):
+        """Convierte a PDF los reportes seleccionados en un solo lote en segundo plano"""
+        archivos = [ruta for ruta in rutas if os.path.isfile(ruta)]
+        if not archivos:
+            self.mostrar_mensaje("Error", "Los archivos seleccionados no existen", "error")
+            return
+
+        if self.convertidor is None:
+            from utils.libreoffice_converter import LibreOfficeConverter
+            self.convertidor = LibreOfficeConverter(persistente=True)
+            QCoreApplication.instance().aboutToQuit.connect(self.convertidor.cerrar)
+
+        convertidor = self.convertidor
+        id_trabajo = self.cola.encolar(
+            f"PDF de {len(archivos)} reporte(s)",
+            lambda conn, progreso, cancelado: convertidor.convert_batch(
+                archivos, 'pdf', progreso=lambda n: progreso("PDF", n))
+        )
+        self.exportaciones_pdf.add(id_trabajo)
 
-    def eliminar_reporte_db(self, descripcion):
-        """Elimina un reporte de la base de datos"""
+    def eliminar_reporte_db(self, id_reporte):
+        """Elimina un reporte del catálogo (el archivo se conserva)"""
         with self.db.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM historial_reportes WHERE descripcion = ?", (descripcion,))
-            conn.commit()
+            catalogo_reportes.eliminar(conn.cursor(), id_reporte)
@@ -0,0 +1,45 @@
+"""Tiempos de arranque: importaciones, creación de ventana y de cada vista.
+
+Se activa con `python main.py --tiempos` o con la variable de entorno
+INVENTARIO_TIEMPOS=1; las vistas que se crean después (al abrir su pestaña)
+se informan en el momento.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+INICIO = time.perf_counter()  # main.py importa este módulo antes que nada
+ACTIVO = "--tiempos" in sys.argv or bool(os.environ.get("INVENTARIO_TIEMPOS"))
+
+_etapas = []
+_informado = False
+
+
+@contextmanager
+def medir(etapa):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(etapa, time.perf_counter() - inicio)
+
+
+def registrar(etapa, segundos):
+    _etapas.append((etapa, segundos))
+    if ACTIVO and _informado:
+        print(f"[arranque] {etapa}: {segundos * 1000:.1f} ms")
+
+
+def informe():
+    lineas = [f"  {etapa:<32} {segundos * 1000:8.1f} ms" for etapa, segundos in _etapas]
+    lineas.append(f"  {'total hasta la ventana visible':<32} {(time.perf_counter() - INICIO) * 1000:8.1f} ms")
+    return "Tiempos de arranque:\n" + "\n".join(lineas)
+
+
+def informar():
+    """Imprime el informe una vez; se llama cuando la ventana ya está en pantalla"""
+    global _informado
+    if ACTIVO and not _informado:
+        print(informe())
+    _informado = True
@@ -0,0 +1,77 @@
+"""Caché en disco de reportes ya generados.
+
+La clave combina el período, el tipo de reporte, el formato, la base (su
+id_base) y la versión de los datos (database/version_datos.py): si nada se
+escribió desde la última vez, el mismo reporte se copia desde la caché sin
+consultar la base. La
+carpeta se limita a max_bytes desalojando los archivos usados hace más tiempo
+(se toma la fecha de modificación, que se renueva en cada acierto).
+"""
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+VERSION_FORMATO = 2  # Subir si cambia el contenido de los reportes para invalidar la caché
+
+
+class CacheReportes:
+    def __init__(self, carpeta=None, max_bytes=200 * 2 ** 20):
+        self.carpeta = Path(carpeta) if carpeta else Path("src/cache/reportes")
+        self.carpeta.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = threading.Lock()
+
+    def clave(self, fecha_inicio, fecha_fin, report_type, formato, base, version):
+        texto = f"{VERSION_FORMATO}|{fecha_inicio}|{fecha_fin}|{report_type}|{formato}|{base}|{version}"
+        return hashlib.sha1(texto.encode()).hexdigest()
+
+    def _ruta(self, clave, formato):
+        return self.carpeta / f"{clave}.{formato}"
+
+    def obtener(self, clave, formato, destino):
+        """Copia el reporte en caché a destino; devuelve False si no está"""
+        origen = self._ruta(clave, formato)
+        with self._lock:
+            try:
+                os.utime(origen)  # Marca de uso para el LRU
+            except FileNotFoundError:
+                self.fallos += 1
+                return False
+            self.aciertos += 1
+        shutil.copyfile(origen, destino)
+        return True
+
+    def guardar(self, clave, formato, generado):
+        """Guarda una copia de un reporte recién generado y aplica el límite de tamaño"""
+        ruta = self._ruta(clave, formato)
+        temporal = ruta.with_suffix(ruta.suffix + ".tmp")
+        shutil.copyfile(generado, temporal)
+        os.replace(temporal, ruta)  # Nunca queda a la vista un archivo a medio copiar
+        self._desalojar()
+
+    def _desalojar(self):
+        with self._lock:
+            archivos = []
+            for ruta in self.carpeta.iterdir():
+                if ruta.suffix == ".tmp":
+                    continue
+                try:
+                    estado = ruta.stat()
+                except FileNotFoundError:
+                    continue
+                archivos.append((estado.st_mtime, estado.st_size, ruta))
+            total = sum(tamano for _, tamano, _ in archivos)
+            for _, tamano, ruta in sorted(archivos):
+                if total <= self.max_bytes:
+                    break
+                ruta.unlink(missing_ok=True)
+                total -= tamano
+
+    def vaciar(self):
+        with self._lock:
+            for ruta in self.carpeta.iterdir():
+                ruta.unlink(missing_ok=True)
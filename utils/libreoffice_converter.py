@@ -1,18 +1,324 @@
+import logging
 import subprocess
 import os
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:  # Python sin el puente UNO de LibreOffice: solo conversión por línea de comandos
+    uno = None
+
+logger = logging.getLogger(__name__)
+
+# Filtro de exportación según el tipo de documento abierto
+FILTROS = {
+    'pdf': {
+        'com.sun.star.sheet.SpreadsheetDocument': 'calc_pdf_Export',
+        'com.sun.star.text.TextDocument': 'writer_pdf_Export',
+    },
+    'xlsx': {
+        'com.sun.star.sheet.SpreadsheetDocument': 'Calc MS Excel 2007 XML',
+    },
+}
+
+
+def _propiedades(**valores):
+    propiedades = []
+    for nombre, valor in valores.items():
+        propiedad = PropertyValue()
+        propiedad.Name = nombre
+        propiedad.Value = valor
+        propiedades.append(propiedad)
+    return tuple(propiedades)
+
+
+class ConversionIncompleta(RuntimeError):
+    """Algunos archivos del lote no se convirtieron.
+
+    salidas tiene las rutas en el orden de entrada, con None en las que no se
+    generaron; errores, las causas conocidas.
+    """
+
+    def __init__(self, salidas, errores):
+        self.salidas = salidas
+        self.errores = errores
+        faltantes = sum(salida is None for salida in salidas)
+        detalle = f": {errores[0]}" if errores else ""
+        super().__init__(f"No se convirtieron {faltantes} de {len(salidas)} archivos{detalle}")
+
+
+def _mtime(ruta):
+    try:
+        return os.stat(ruta).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _puerto_libre():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class InstanciaLibreOffice:
+    """Un soffice headless que escucha en un socket UNO y se reinicia si se cae.
+
+    Cada instancia usa su propio perfil temporal, así que pueden convivir varias
+    (y con un LibreOffice abierto por el usuario).
+    """
+
+    TIEMPO_ARRANQUE = 30  # Segundos máximos esperando a que acepte conexiones
 
-class LibreOfficeConverter:
     def __init__(self, libreoffice_path='libreoffice'):
         self.libreoffice_path = libreoffice_path
+        self.proceso = None
+        self.desktop = None
+        self.perfil = None
+
+    @property
+    def viva(self):
+        if self.proceso is None or self.proceso.poll() is not None:
+            return False
+        try:
+            self.desktop.getCurrentComponent()  # Ida y vuelta por el socket
+            return True
+        except Exception:
+            return False
+
+    def iniciar(self):
+        puerto = _puerto_libre()
+        self.perfil = tempfile.mkdtemp(prefix='lo_perfil_')
+        self.proceso = subprocess.Popen(
+            [self.libreoffice_path, '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+             f'-env:UserInstallation={uno.systemPathToFileUrl(self.perfil)}',
+             f'--accept=socket,host=127.0.0.1,port={puerto};urp;StarOffice.ComponentContext'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext('com.sun.star.bridge.UnoUrlResolver', local)
+        url = f'uno:socket,host=127.0.0.1,port={puerto};urp;StarOffice.ComponentContext'
+        limite = time.monotonic() + self.TIEMPO_ARRANQUE
+        while True:
+            try:
+                contexto = resolver.resolve(url)
+                break
+            except NoConnectException:
+                if self.proceso.poll() is not None or time.monotonic() > limite:
+                    self.detener()
+                    raise RuntimeError('No se pudo iniciar LibreOffice en modo servidor')
+                time.sleep(0.2)
+        self.desktop = contexto.ServiceManager.createInstanceWithContext('com.sun.star.frame.Desktop', contexto)
+
+    def detener(self):
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass  # El proceso ya no responde
+            self.desktop = None
+        if self.proceso is not None:
+            try:
+                self.proceso.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proceso.kill()
+                self.proceso.wait()
+            self.proceso = None
+        if self.perfil is not None:
+            shutil.rmtree(self.perfil, ignore_errors=True)
+            self.perfil = None
+
+    def reiniciar(self):
+        self.detener()
+        self.iniciar()
+
+    def convertir(self, input_file, output_file, formato):
+        documento = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(input_file)), '_blank', 0, _propiedades(Hidden=True)
+        )
+        if documento is None:
+            raise RuntimeError(f'LibreOffice no pudo abrir {input_file}')
+        try:
+            filtro = next((f for servicio, f in FILTROS[formato].items() if documento.supportsService(servicio)),
+                          None)
+            if filtro is None:
+                raise ValueError(f'No se puede exportar {input_file} a {formato}')
+            documento.storeToURL(uno.systemPathToFileUrl(os.path.abspath(output_file)),
+                                 _propiedades(FilterName=filtro, Overwrite=True))
+        finally:
+            documento.close(True)
+        return output_file
+
+
+class LibreOfficeConverter:
+    """Convierte archivos con LibreOffice.
+
+    Con persistente=True mantiene hasta max_concurrentes instancias headless
+    abiertas y les envía los archivos por UNO, evitando el arranque en frío de
+    cada conversión. Si el puente UNO no está disponible se usa la línea de
+    comandos, agrupando los lotes en un solo proceso por carpeta de destino.
+    """
+
+    def __init__(self, libreoffice_path='libreoffice', persistente=False, max_concurrentes=2):
+        self.libreoffice_path = libreoffice_path
+        self.persistente = persistente and uno is not None
+        if persistente and uno is None:
+            # Sin uno cada lote arranca un soffice en frío: se avisa por stderr, no en silencio
+            logger.warning("Módulo uno no disponible en este Python; se usará LibreOffice por línea de "
+                           "comandos, un arranque por carpeta de destino")
+        self.max_concurrentes = max(1, max_concurrentes)
+        self._libres = queue.Queue()  # Instancias disponibles
+        self._instancias = []
+        self._lock = threading.Lock()
+        self._executor = None
 
     def convert_to_pdf(self, input_file, output_file=None):
         if output_file is None:
             output_file = os.path.splitext(input_file)[0] + '.pdf'
+        if self.persistente:
+            return self._convertir(input_file, output_file, 'pdf')
         subprocess.run([self.libreoffice_path, '--headless', '--convert-to', 'pdf', '--outdir', os.path.dirname(output_file), input_file])
         return output_file
 
     def convert_to_excel(self, input_file, output_file=None):
         if output_file is None:
             output_file = os.path.splitext(input_file)[0] + '.xlsx'
+        if self.persistente:
+            return self._convertir(input_file, output_file, 'xlsx')
         subprocess.run([self.libreoffice_path, '--headless', '--convert-to', 'xlsx', '--outdir', os.path.dirname(output_file), input_file])
-        return output_file
\ No newline at end of file
+        return output_file
+
+    def convert_batch(self, input_files, formato='pdf', outdir=None, progreso=None):
+        """Convierte un lote de archivos y devuelve las rutas de salida en el mismo orden.
+
+        En modo persistente las conversiones corren en paralelo hasta
+        max_concurrentes. Un error en un archivo no detiene el resto: al final
+        se lanza ConversionIncompleta con las salidas que sí se generaron.
+        progreso(convertidos) se llama al terminar cada archivo.
+        """
+        if formato not in FILTROS:
+            raise ValueError(f'Formato no soportado: {formato}')
+        salidas = [
+            os.path.join(outdir or os.path.dirname(f), os.path.splitext(os.path.basename(f))[0] + f'.{formato}')
+            for f in input_files
+        ]
+
+        if not self.persistente:
+            # Un solo proceso por carpeta de destino para todo el lote
+            por_carpeta = {}
+            for entrada, salida in zip(input_files, salidas):
+                por_carpeta.setdefault(os.path.dirname(salida), []).append(entrada)
+            # soffice puede terminar con 0 sin escribir nada: cuenta la fecha de cada salida
+            antes = [_mtime(salida) for salida in salidas]
+            errores = []
+            convertidos = 0
+            for carpeta, entradas in por_carpeta.items():
+                try:
+                    resultado = subprocess.run([self.libreoffice_path, '--headless', '--convert-to', formato,
+                                                '--outdir', carpeta or '.', *entradas])
+                except OSError as e:  # LibreOffice no instalado o no ejecutable
+                    errores.append(e)
+                    break
+                if resultado.returncode != 0:
+                    errores.append(RuntimeError(
+                        f'LibreOffice terminó con código {resultado.returncode} en {carpeta or "."}'))
+                convertidos += len(entradas)
+                if progreso:
+                    progreso(convertidos)
+            escritas = [salida if _mtime(salida) not in (None, mtime) else None
+                        for salida, mtime in zip(salidas, antes)]
+            if None in escritas:
+                raise ConversionIncompleta(escritas, errores)
+            return salidas
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrentes)
+        futuros = [self._executor.submit(self._convertir, entrada, salida, formato)
+                   for entrada, salida in zip(input_files, salidas)]
+        errores = []
+        escritas = list(salidas)
+        for i, futuro in enumerate(futuros):
+            try:
+                futuro.result()
+            except Exception as e:
+                errores.append(e)
+                escritas[i] = None
+            if progreso:
+                progreso(i + 1)
+        if errores:
+            raise ConversionIncompleta(escritas, errores) from errores[0]
+        return salidas
+
+    def _tomar_instancia(self):
+        while True:
+            try:
+                instancia = self._libres.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    crear = len(self._instancias) < self.max_concurrentes
+                    if crear:
+                        instancia = InstanciaLibreOffice(self.libreoffice_path)
+                        self._instancias.append(instancia)
+                if crear:
+                    try:
+                        instancia.iniciar()
+                    except Exception:
+                        self._descartar(instancia)
+                        raise
+                    return instancia
+                instancia = self._libres.get()  # Esperar a que otra conversión termine
+            if instancia is not None:
+                return instancia
+            # None: se descartó una instancia y hay lugar para crear otra
+
+    def _descartar(self, instancia):
+        with self._lock:
+            self._instancias.remove(instancia)
+        self._libres.put(None)  # Despierta a quien espera una instancia libre
+
+    def _convertir(self, input_file, output_file, formato):
+        instancia = self._tomar_instancia()
+        try:
+            salida = instancia.convertir(input_file, output_file, formato)
+        except Exception:
+            if instancia.viva:
+                self._libres.put(instancia)
+                raise  # Error del documento, no del servidor
+        else:
+            self._libres.put(instancia)
+            return salida
+        # El soffice se cayó: se reinicia y se reintenta una vez
+        try:
+            instancia.reiniciar()
+        except Exception:
+            self._descartar(instancia)  # No volvió a arrancar: no se devuelve a las libres
+            raise
+        try:
+            return instancia.convertir(input_file, output_file, formato)
+        finally:
+            self._libres.put(instancia)
+
+    def cerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            for instancia in self._instancias:
+                instancia.detener()
+            self._instancias.clear()
+        self._libres = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
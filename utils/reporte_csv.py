@@ -0,0 +1,32 @@
+import csv
+from database.consultas import (consultar_inventario_periodo, consultar_entradas_periodo,
+                                consultar_salidas_periodo)
+from utils.reporte_excel_generator import ReporteExcelStreaming
+
+HOJAS = (
+    ("inventario", ReporteExcelStreaming.ENCABEZADOS_INVENTARIO, consultar_inventario_periodo),
+    ("entradas", ReporteExcelStreaming.ENCABEZADOS_MOVIMIENTOS, consultar_entradas_periodo),
+    ("salidas", ReporteExcelStreaming.ENCABEZADOS_MOVIMIENTOS, consultar_salidas_periodo),
+)
+
+
+def exportar_reporte_csv(conn, fecha_inicio, fecha_fin, ruta_base, progreso=None):
+    """Escribe el reporte del período como tres CSV (<ruta_base>_inventario.csv, ...).
+
+    Las filas pasan del cursor al archivo sin acumularse en memoria. Devuelve
+    las rutas generadas.
+    """
+    rutas = []
+    for nombre, encabezados, consultar in HOJAS:
+        ruta = f"{ruta_base}_{nombre}.csv"
+        with open(ruta, "w", newline="", encoding="utf-8-sig") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(encabezados)
+            filas = 0
+            for fila in consultar(conn.cursor(), fecha_inicio, fecha_fin):
+                escritor.writerow(fila)
+                filas += 1
+        if progreso:
+            progreso(nombre, filas)
+        rutas.append(ruta)
+    return rutas
@@ -1,15 +1,15 @@
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.drawing.image import Image
 from openpyxl.utils import get_column_letter
 from datetime import datetime, timedelta
 import os
 from database.connection import DatabaseConnection
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QLineEdit, QComboBox, QDateEdit,
-                            QGroupBox, QFormLayout, QTableWidget, QTableWidgetItem, QFileDialog, QCalendarWidget, QSpacerItem, QSizePolicy)
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtWidgets import QApplication
+from database.consultas import (consultar_inventario_periodo, consultar_entradas_periodo,
+                                consultar_salidas_periodo, consultar_longitudes)
+from database.version_datos import version_actual, id_base
+from database.repositorio import iterar_productos
 
 
 class ReporteExcelGenerator:
@@ -210,24 +210,122 @@ class ReporteExcelGenerator:
             for cell in row:
                 cell.border = self.data_style.border
 
+class ReporteCancelado(Exception):
+    pass
+
+
+class ReporteExcelStreaming(ReporteExcelGenerator):
+    """Genera el mismo reporte con hojas write_only.
+
+    Las filas se escriben a medida que llegan del cursor, reutilizando una celda
+    con estilo por columna, así que la memoria no crece con el número de filas.
+    Los anchos de columna se fijan antes de escribir (en write_only no se
+    pueden ajustar después) a partir de las longitudes máximas conocidas.
+    """
+
+    ENCABEZADOS_INVENTARIO = ["Código", "Descripción", "Entradas", "Salidas", "Stock",
+                              "Precio Compra", "Precio Venta", "Valor Compra Total",
+                              "Valor Venta Total", "Utilidad"]
+    ENCABEZADOS_MOVIMIENTOS = ["Fecha", "Código", "Descripción", "Cantidad", "Precio", "Valor Total"]
+    ANCHO_NUMERICO = 14   # Caracteres previstos para cantidades y montos
+    LONGITUD_FECHA = 19   # yyyy-MM-dd HH:mm:ss
+    FILAS_POR_AVISO = 1000
+
+    def __init__(self):
+        self.wb = Workbook(write_only=True)
+        self.setup_styles()
+
+    def generate_report(self, data_inventario, data_entradas=None, data_salidas=None, start_date=None,
+                        end_date=None, report_type="Mensual", longitudes=None, progreso=None, cancelado=None):
+        """Escribe las tres hojas; los datos pueden ser cursores o cualquier iterable de filas.
+
+        longitudes: dict opcional {'codigo': n, 'descripcion': n} con las longitudes máximas.
+        progreso: función opcional progreso(hoja, filas_escritas).
+        cancelado: función opcional que devuelve True para abortar (lanza ReporteCancelado).
+        """
+        longitudes = longitudes or {}
+        codigo = longitudes.get('codigo', 10)
+        descripcion = longitudes.get('descripcion', 30)
+        numerico = self.ANCHO_NUMERICO
+
+        self._escribir_hoja(
+            "Inventario", self._get_report_period(report_type, start_date, end_date),
+            self.ENCABEZADOS_INVENTARIO, [codigo, descripcion] + [numerico] * 8,
+            {6, 7, 8, 9, 10}, data_inventario or [], progreso, cancelado)
+
+        anchos_movimientos = [self.LONGITUD_FECHA, codigo, descripcion] + [numerico] * 3
+        if data_entradas is not None:
+            self._escribir_hoja("Entradas", "ENTRADAS", self.ENCABEZADOS_MOVIMIENTOS, anchos_movimientos,
+                                {5, 6}, data_entradas, progreso, cancelado)
+        if data_salidas is not None:
+            self._escribir_hoja("Salidas", "SALIDAS", self.ENCABEZADOS_MOVIMIENTOS, anchos_movimientos,
+                                {5, 6}, data_salidas, progreso, cancelado)
+
+        return self.wb
+
+    def descartar(self):
+        """Cierra las hojas a medio escribir y borra sus archivos temporales"""
+        for ws in self.wb.worksheets:
+            if not ws.closed:
+                ws.close()
+            if ws._writer is not None and os.path.exists(ws._writer.out):
+                ws._writer.cleanup()
+
+    def _celda(self, ws, estilo, value=None):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = estilo.font
+        cell.fill = estilo.fill
+        cell.border = estilo.border
+        cell.alignment = estilo.alignment
+        cell.number_format = estilo.number_format
+        return cell
+
+    def _escribir_hoja(self, titulo, subtitulo, encabezados, longitudes, columnas_moneda, filas,
+                       progreso, cancelado):
+        ws = self.wb.create_sheet(title=titulo)
+        ultima_columna = get_column_letter(len(encabezados))
+
+        # Anchos calculados de antemano con la misma fórmula que autoajustar_columnas
+        for col, (encabezado, longitud) in enumerate(zip(encabezados, longitudes), 1):
+            ancho = (max(len(encabezado), longitud) + 2) * 1.2
+            ws.column_dimensions[get_column_letter(col)].width = ancho
+
+        start_row = self.add_logo(ws)
+        for _ in range(start_row - 1):
+            ws.append([])
+
+        ws.merged_cells.add(f'A{start_row}:{ultima_columna}{start_row}')
+        ws.append([self._celda(ws, self.title_style, "MULTIMUEBLES LA PLATA")])
+        ws.merged_cells.add(f'A{start_row + 1}:{ultima_columna}{start_row + 1}')
+        ws.append([self._celda(ws, self.header_style, subtitulo)])
+        ws.append([])
+        ws.append([self._celda(ws, self.header_style, encabezado) for encabezado in encabezados])
+
+        # Una celda con estilo por columna; solo cambia el valor en cada fila
+        celdas = [self._celda(ws, self.currency_style if col in columnas_moneda else self.data_style)
+                  for col in range(1, len(encabezados) + 1)]
+        escritas = 0
+        for fila in filas:
+            for cell, value in zip(celdas, fila):
+                cell.value = value
+            ws.append(celdas)
+            escritas += 1
+            if escritas % self.FILAS_POR_AVISO == 0:
+                if cancelado and cancelado():
+                    raise ReporteCancelado(titulo)
+                if progreso:
+                    progreso(titulo, escritas)
+
+        if progreso and escritas % self.FILAS_POR_AVISO:
+            progreso(titulo, escritas)
+        return escritas
+
+
 def fetch_inventory_data(db_connection):
-    cursor = db_connection.cursor()
-    cursor.execute("""
-        SELECT codigo, descripcion, entradas_totales, salidas_totales, 
-                stock, precio_compra, precio_venta 
-        FROM productos
-    """)
     data = []
-    for row in cursor.fetchall():
-        codigo, descripcion, entradas, salidas, stock, precio_compra, precio_venta = row
-        precio_compra_total = entradas * precio_compra
-        precio_venta_total = salidas * precio_venta
-        valor_total = precio_compra_total + precio_venta_total
-        data.append([
-            codigo, descripcion, entradas, salidas, stock, 
-            precio_compra, precio_venta, precio_compra_total, 
-            precio_venta_total, valor_total
-        ])
+    for p in iterar_productos(db_connection.cursor()):
+        data.append(list(p) + [p.valor_compra_total, p.valor_venta_total,
+                               p.valor_compra_total + p.valor_venta_total])
     return data
 
 def generate_inventory_report(db_connection, report_type="Mensual"):
@@ -238,251 +336,53 @@ def generate_inventory_report(db_connection, report_type="Mensual"):
     wb.save(report_filename)
     return report_filename
 
+def exportar_reporte_periodo(conn, fecha_inicio, fecha_fin, file_path, progreso=None, cancelado=None,
+                             cache=None, report_type="Mensual"):
+    """Genera el reporte del período directamente desde la base y lo guarda en file_path.
+
+    Con cache (utils.cache_reportes.CacheReportes) un período ya generado sin
+    cambios posteriores en los datos se copia desde la caché. Si se cancela o
+    falla, no deja un archivo a medias.
+    """
+    clave = None
+    if cache is not None:
+        base = id_base(conn)
+        version = version_actual(conn)
+        if base is not None and version is not None:
+            clave = cache.clave(fecha_inicio, fecha_fin, report_type, "xlsx", base, version)
+            if cache.obtener(clave, "xlsx", file_path):
+                return file_path
+
+    generator = ReporteExcelStreaming()
+    try:
+        wb = generator.generate_report(
+            data_inventario=consultar_inventario_periodo(conn.cursor(), fecha_inicio, fecha_fin),
+            data_entradas=consultar_entradas_periodo(conn.cursor(), fecha_inicio, fecha_fin),
+            data_salidas=consultar_salidas_periodo(conn.cursor(), fecha_inicio, fecha_fin),
+            start_date=fecha_inicio,
+            end_date=fecha_fin,
+            report_type=report_type,
+            longitudes=consultar_longitudes(conn.cursor()),
+            progreso=progreso,
+            cancelado=cancelado
+        )
+        wb.save(file_path)
+    except BaseException:
+        generator.descartar()
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+    # Solo se guarda si nadie escribió mientras se generaba
+    if clave is not None and version_actual(conn) == version:
+        cache.guardar(clave, "xlsx", file_path)
+    return file_path
+
 if __name__ == "__main__":
     db = DatabaseConnection()
     db.create_tables()  # Asegúrate de que las tablas se crean
 
 
-class DatabaseConnection:
-    def create_tables(self):
-        sql_productos = '''
-        CREATE TABLE IF NOT EXISTS productos (
-            codigo TEXT PRIMARY KEY,
-            descripcion TEXT,
-            entradas_totales INTEGER DEFAULT 0,
-            salidas_totales INTEGER DEFAULT 0,
-            stock INTEGER DEFAULT 0,
-            precio_compra REAL,
-            precio_venta REAL,
-            valor_total REAL
-        )'''
-
-        sql_entradas = '''
-        CREATE TABLE IF NOT EXISTS entradas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            codigo TEXT,
-            descripcion TEXT,
-            cantidad INTEGER,
-            fecha TEXT,
-            FOREIGN KEY (codigo) REFERENCES productos(codigo)
-        )'''
-
-        sql_salidas = '''
-        CREATE TABLE IF NOT EXISTS salidas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            codigo TEXT,
-            descripcion TEXT,
-            cantidad INTEGER,
-            fecha TEXT,
-            FOREIGN KEY (codigo) REFERENCES productos(codigo)
-        )'''
-
-        with self.connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql_productos)
-            cursor.execute(sql_entradas)
-            cursor.execute(sql_salidas)
-            conn.commit()
-
-class ReporteView(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.init_ui()
-        self.db = DatabaseConnection()
-
-    def init_ui(self):
-        main_layout = QVBoxLayout()
-        self.setLayout(main_layout)
-
-        # Título y botones
-        header_layout = QHBoxLayout()
-        title_label = QLabel("Generación de Reportes")
-        title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
-        header_layout.addWidget(title_label)
-        header_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum))
-        main_layout.addLayout(header_layout)
-
-        # Filtros en línea horizontal
-        filters_layout = QHBoxLayout()
-        
-        # Fecha inicio
-        filters_layout.addWidget(QLabel("Fecha inicio:"))
-        self.fecha_inicio = QDateEdit()
-        self.fecha_inicio.setCalendarPopup(True)
-        self.fecha_inicio.setDate(QDate.currentDate())
-        filters_layout.addWidget(self.fecha_inicio)
-        
-        # Fecha fin
-        filters_layout.addWidget(QLabel("Fecha fin:"))
-        self.fecha_fin = QDateEdit()
-        self.fecha_fin.setCalendarPopup(True)
-        self.fecha_fin.setDate(QDate.currentDate())
-        filters_layout.addWidget(self.fecha_fin)
-        
-        # Botón generar
-        self.btn_generar_reporte = QPushButton("Generar Reporte Excel")
-        self.btn_generar_reporte.clicked.connect(self.generar_reporte)
-        filters_layout.addWidget(self.btn_generar_reporte)
-        
-        main_layout.addLayout(filters_layout)
-
-        # Búsqueda de producto para historial
-        search_group = QGroupBox("Historial de Productos")
-        search_layout = QVBoxLayout()
-        
-        self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Buscar por código o descripción")
-        self.search_input.textChanged.connect(self.buscar_historial)
-        search_layout.addWidget(self.search_input)
-
-        # Tabla de historial
-        self.historial_table = QTableWidget()
-        self.historial_table.setColumnCount(10)
-        self.historial_table.setHorizontalHeaderLabels([
-            "Fecha", "Código", "Descripción", "Tipo Mov.", 
-            "Cantidad", "Stock", "Precio Compra", "Precio Venta",
-            "Variación Precio", "Valor Total"
-        ])
-        search_layout.addWidget(self.historial_table)
-        
-        search_group.setLayout(search_layout)
-        main_layout.addWidget(search_group)
-
-    def buscar_historial(self, texto_busqueda):
-        if len(texto_busqueda) >= 3:  # Búsqueda después de 3 caracteres
-            with self.db.connect() as conn:
-                cursor = conn.cursor()
-                query = """
-                SELECT p.codigo, p.descripcion, 
-                        COALESCE(e.fecha, s.fecha) as fecha,
-                        CASE
-                            WHEN e.cantidad IS NOT NULL THEN 'Entrada'
-                            WHEN s.cantidad IS NOT NULL THEN 'Salida'
-                        END as tipo_movimiento,
-                        COALESCE(e.cantidad, s.cantidad) as cantidad,
-                        p.stock,
-                        p.precio_compra,
-                        p.precio_venta,
-                        '' as variacion_precio,
-                        COALESCE(e.cantidad, s.cantidad) * 
-                        CASE
-                            WHEN e.cantidad IS NOT NULL THEN p.precio_compra
-                            WHEN s.cantidad IS NOT NULL THEN p.precio_venta
-                        END as valor_total
-                FROM productos p
-                LEFT JOIN entradas e ON p.codigo = e.codigo
-                LEFT JOIN salidas s ON p.codigo = s.codigo
-                WHERE p.codigo LIKE ? OR p.descripcion LIKE ?
-                ORDER BY fecha DESC
-                LIMIT 100
-                """
-                cursor.execute(query, (f'%{texto_busqueda}%', f'%{texto_busqueda}%'))
-                resultados = cursor.fetchall()
-
-                self.historial_table.setRowCount(len(resultados))
-                for row, dato in enumerate(resultados):
-                    for col, value in enumerate(dato):
-                        item = QTableWidgetItem(str(value))
-                        self.historial_table.setItem(row, col, item)
-
-    def generar_reporte(self):
-        try:
-            fecha_inicio = self.fecha_inicio.date().toPyDate()
-            fecha_fin = self.fecha_fin.date().toPyDate()
-            
-            # Obtener datos de la base de datos
-            with self.db.connect() as conn:
-                cursor = conn.cursor()
-                
-                # Consulta para inventario con cálculos
-                cursor.execute("""
-                    SELECT 
-                        p.codigo,
-                        p.descripcion,
-                        COALESCE(SUM(e.cantidad), 0) as entradas,
-                        COALESCE(SUM(s.cantidad), 0) as salidas,
-                        p.stock,
-                        p.precio_compra,
-                        p.precio_venta,
-                        COALESCE(SUM(e.cantidad), 0) * p.precio_compra as valor_compra_total,
-                        COALESCE(SUM(s.cantidad), 0) * p.precio_venta as valor_venta_total,
-                        (COALESCE(SUM(s.cantidad), 0) * p.precio_venta) - 
-                        (COALESCE(SUM(e.cantidad), 0) * p.precio_compra) as utilidad
-                    FROM productos p
-                    LEFT JOIN entradas e ON p.codigo = e.codigo
-                    LEFT JOIN salidas s ON p.codigo = s.codigo
-                    GROUP BY p.codigo, p.descripcion, p.stock, p.precio_compra, p.precio_venta
-                """)
-                data_inventario = [list(row) for row in cursor.fetchall()]
-                
-                # Consulta para entradas
-                cursor.execute("""
-                    SELECT 
-                        e.fecha,
-                        e.codigo,
-                        p.descripcion,
-                        e.cantidad,
-                        p.precio_compra,
-                        e.cantidad * p.precio_compra as valor_total
-                    FROM entradas e
-                    JOIN productos p ON e.codigo = p.codigo
-                    WHERE e.fecha BETWEEN ? AND ?
-                    ORDER BY e.fecha
-                """, (fecha_inicio, fecha_fin))
-                data_entradas = [list(row) for row in cursor.fetchall()]
-                
-                # Consulta para salidas
-                cursor.execute("""
-                    SELECT 
-                        s.fecha,
-                        s.codigo,
-                        p.descripcion,
-                        s.cantidad,
-                        p.precio_venta,
-                        s.cantidad * p.precio_venta as valor_total
-                    FROM salidas s
-                    JOIN productos p ON s.codigo = p.codigo
-                    WHERE s.fecha BETWEEN ? AND ?
-                    ORDER BY s.fecha
-                """, (fecha_inicio, fecha_fin))
-                data_salidas = [list(row) for row in cursor.fetchall()]
-            
-            # Verificar que los datos no estén vacíos
-            if not data_inventario:
-                data_inventario = []
-            if not data_entradas:
-                data_entradas = []
-            if not data_salidas:
-                data_salidas = []
-
-            # Generar el reporte
-            generator = ReporteExcelGenerator()
-            wb = generator.generate_report(
-                data_inventario=data_inventario,
-                data_entradas=data_entradas,
-                data_salidas=data_salidas,
-                start_date=fecha_inicio,
-                end_date=fecha_fin
-            )
-            
-            # Guardar el archivo
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Guardar Reporte Excel",
-                "",
-                "Excel Files (*.xlsx);;All Files (*)"
-            )
-            
-            if file_path:
-                if not file_path.endswith('.xlsx'):
-                    file_path += '.xlsx'
-                wb.save(file_path)
-                print(f"Reporte guardado en: {file_path}")
-                
-        except Exception as e:
-            print(f"Error al generar el reporte: {str(e)}")
-            # Aquí podrías mostrar un mensaje de error al usuario usando QMessageBox
-
 from openpyxl import Workbook
 from openpyxl.drawing.image import Image
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side